@@ -0,0 +1,164 @@
+"""
+記事同期の状態ストア
+
+処理済みのノートキー、HTTPレスポンスの ETag / Last-Modified、記事本文のハッシュを
+SQLiteに保存する。条件付きGET（304 Not Modified）と処理済み記事のスキップに使用する。
+"""
+
+import hashlib
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    body TEXT NOT NULL,
+    fetched_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS processed_articles (
+    note_key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT,
+    content_hash TEXT NOT NULL,
+    published_at TEXT,
+    output_dir TEXT,
+    processed_at TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'posted'
+);
+'''
+
+# 処理済み記事の状態
+# drafted: 下書きのみ保存（SNS投稿なしで実行） / post_failed: SNS投稿に失敗 / posted: 全段階完了
+DRAFTED = "drafted"
+POST_FAILED = "post_failed"
+POSTED = "posted"
+
+
+def content_hash(text: str) -> str:
+    """記事本文のハッシュ（SHA-256）"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ArticleStateStore:
+    """記事同期の状態を保持するSQLiteストア
+
+    Args:
+        path: データベースファイルのパス
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path))
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._conn.commit()
+
+    def _migrate(self) -> None:
+        # status 列がない古いデータベースは、記録済みの記事を全段階完了として扱う
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(processed_articles)')}
+        if 'status' not in columns:
+            self._conn.execute(f"ALTER TABLE processed_articles ADD COLUMN status TEXT NOT NULL DEFAULT '{POSTED}'")
+
+    def close(self) -> None:
+        """データベースを閉じる"""
+        self._conn.close()
+
+    # --- 条件付きGET --- #
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """前回のレスポンスに基づく If-None-Match / If-Modified-Since ヘッダー"""
+        row = self._conn.execute(
+            'SELECT etag, last_modified FROM http_cache WHERE url = ?', (url,)
+        ).fetchone()
+        if not row:
+            return {}
+
+        headers = {}
+        etag, last_modified = row
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def cached_body(self, url: str) -> Optional[str]:
+        """304 Not Modified のときに使う前回のレスポンス本文"""
+        row = self._conn.execute(
+            'SELECT body FROM http_cache WHERE url = ?', (url,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def store_response(self, url: str, body: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        """レスポンスを記録（検証用ヘッダーがない場合は記録しない）"""
+        if not etag and not last_modified:
+            return
+        self._conn.execute(
+            'INSERT OR REPLACE INTO http_cache (url, etag, last_modified, body, fetched_at) VALUES (?, ?, ?, ?, ?)',
+            (url, etag, last_modified, body, datetime.now().isoformat(timespec='seconds'))
+        )
+        self._conn.commit()
+
+    # --- 処理済み記事 --- #
+
+    def is_processed(self, note_key: str, text_hash: Optional[str] = None, post_to_sns: bool = False) -> bool:
+        """記事が処理済みかどうか
+
+        text_hash を指定した場合は、本文が前回処理時から変わっていないことも確認する。
+        SNS投稿に失敗した記事は未処理、下書きのみの記事は post_to_sns の場合に未処理として扱う。
+        """
+        row = self._conn.execute(
+            'SELECT content_hash, status FROM processed_articles WHERE note_key = ?', (note_key,)
+        ).fetchone()
+        if not row:
+            return False
+        stored_hash, status = row
+        if text_hash is not None and stored_hash != text_hash:
+            return False
+        if status == POST_FAILED:
+            return False
+        return status == POSTED or not post_to_sns
+
+    def retry_output_dir(self, note_key: str, text_hash: str) -> Optional[Path]:
+        """前回完了しなかった記事の出力ディレクトリ（本文が同じで、ディレクトリが残っている場合のみ）
+
+        再処理時はこのディレクトリのチェックポイントから再開し、投稿済みのSNS下書きを作り直さない。
+        """
+        row = self._conn.execute(
+            'SELECT content_hash, status, output_dir FROM processed_articles WHERE note_key = ?', (note_key,)
+        ).fetchone()
+        if not row:
+            return None
+        stored_hash, status, output_dir = row
+        if stored_hash != text_hash or status == POSTED or not output_dir or not Path(output_dir).is_dir():
+            return None
+        return Path(output_dir)
+
+    def mark_processed(
+        self,
+        note_key: str,
+        url: str,
+        title: str,
+        text_hash: str,
+        published_at: Optional[str] = None,
+        output_dir: Optional[Path] = None,
+        status: str = POSTED
+    ) -> None:
+        """記事の処理結果を記録（status は DRAFTED / POST_FAILED / POSTED）"""
+        self._conn.execute(
+            'INSERT OR REPLACE INTO processed_articles '
+            '(note_key, url, title, content_hash, published_at, output_dir, processed_at, status) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                note_key, url, title, text_hash, published_at,
+                str(output_dir) if output_dir else None,
+                datetime.now().isoformat(timespec='seconds'),
+                status
+            )
+        )
+        self._conn.commit()
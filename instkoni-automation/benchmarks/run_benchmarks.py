@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+オフラインベンチマーク
+
+Genspark・LinkedIn・X の画面を模したローカルHTML（benchmarks/fixtures）を
+ローカルHTTPサーバーで配信し、Config のURLをそこへ向けて
+GensparkRewriter / SNSPoster / linkedin_poster.post_to_linkedin の
+レイテンシとスループットを計測する。
+待機方法や並列数を変更したときに、結果のJSONを前回と比較できる。
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --target genspark --iterations 5 --concurrency 2
+    python benchmarks/run_benchmarks.py --baseline benchmarks/results/benchmark_20260101_120000.json
+
+--headful の場合、linkedin_poster はクリップボード経由で入力するため macOS でのみ完走する。
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from dataclasses import replace
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+from urllib.parse import urlsplit
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+sys.path.insert(0, str(SCRIPT_DIR.parent))
+
+from playwright.async_api import async_playwright
+
+import linkedin_poster
+from response_parser import RewriteResult
+from sns_content_generator import Article, Config, GensparkRewriter, SNSPoster
+from tracing import Tracer
+
+
+FIXTURES_DIR = SCRIPT_DIR / "fixtures"
+RESULTS_DIR = SCRIPT_DIR / "results"
+CONFIG_FILE = SCRIPT_DIR.parent / "config.ini"
+
+TARGETS = ("genspark", "sns", "linkedin_poster")
+
+# URLパス → 配信するフィクスチャ
+ROUTES = {
+    "/genspark/": "genspark.html",
+    "/genspark/response.txt": "genspark_response.txt",
+    "/linkedin/feed/": "linkedin.html",
+    "/x/home": "x.html",
+    "/compose/post": "x.html",
+}
+
+_CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".txt": "text/plain; charset=utf-8",
+}
+
+
+# --- フィクスチャサーバー --- #
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """ROUTES に登録したフィクスチャだけを返すハンドラ"""
+
+    def do_GET(self) -> None:
+        name = ROUTES.get(urlsplit(self.path).path)
+        if not name:
+            self.send_error(404)
+            return
+
+        body = (FIXTURES_DIR / name).read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", _CONTENT_TYPES[Path(name).suffix])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def start_server() -> tuple[ThreadingHTTPServer, str]:
+    """空いているポートでフィクスチャサーバーを起動"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def write_fixture_image(path: Path, width: int = 2400, height: int = 1350) -> Path:
+    """アップロード用のPNG画像（グラデーション）を生成"""
+    row = bytearray(width * 3)
+    row[0::3] = bytes(x * 255 // width for x in range(width))
+    row[2::3] = bytes([160]) * width
+    rows = bytearray()
+    for y in range(height):
+        row[1::3] = bytes([y * 255 // height]) * width
+        rows += b'\x00' + row
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    path.write_bytes(
+        b'\x89PNG\r\n\x1a\n'
+        + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+        + chunk(b'IDAT', zlib.compress(bytes(rows), 6))
+        + chunk(b'IEND', b'')
+    )
+    return path
+
+
+# --- 計測 --- #
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))]
+
+
+async def measure(
+    run_once: Callable[[int], Awaitable[bool]],
+    iterations: int,
+    concurrency: int
+) -> dict:
+    """run_once を iterations 回（最大 concurrency 並列）実行して集計
+
+    各回はトレーサーを有効にして実行し、スパンごとの所要時間の中央値も記録する。
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    span_totals: dict[str, list[float]] = {}
+    successes = 0
+
+    async def one(i: int) -> None:
+        nonlocal successes
+        async with semaphore:
+            tracer = Tracer()
+            start = time.perf_counter()
+            with tracer.activate():
+                try:
+                    ok = await run_once(i)
+                except Exception as e:
+                    print(f"❌ {i + 1}回目: {e}")
+                    ok = False
+            latencies.append(time.perf_counter() - start)
+            successes += 1 if ok else 0
+            for name, entry in tracer.summary().items():
+                span_totals.setdefault(name, []).append(entry['total_ms'])
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(iterations)))
+    wall_s = time.perf_counter() - wall_start
+
+    return {
+        'iterations': iterations,
+        'concurrency': concurrency,
+        'success': successes,
+        'wall_s': round(wall_s, 2),
+        'throughput_per_min': round(successes / wall_s * 60, 2) if wall_s else 0.0,
+        'latency_s': {
+            'min': round(min(latencies), 2),
+            'median': round(statistics.median(latencies), 2),
+            'p95': round(_percentile(latencies, 95), 2),
+            'max': round(max(latencies), 2),
+        },
+        'span_median_ms': {
+            name: round(statistics.median(values), 1)
+            for name, values in sorted(span_totals.items())
+        },
+    }
+
+
+# --- 対象 --- #
+
+def make_config(base_url: str, work_dir: Path, args: argparse.Namespace) -> Config:
+    """URLをフィクスチャサーバーへ、保存先を作業ディレクトリへ向けた設定"""
+    config = Config.load(CONFIG_FILE)
+    stream = f"first_token_ms={args.first_token_ms}&chunk={args.chunk}&interval_ms={args.interval_ms}"
+    upload = f"upload_ms={args.upload_ms}"
+    return replace(
+        config,
+        genspark_chat_url=f"{base_url}/genspark/?{stream}",
+        linkedin_url=f"{base_url}/linkedin/feed/?{upload}",
+        x_url=f"{base_url}/x/home?{upload}",
+        response_cache_enabled=False,
+        browser_data_dir=work_dir / "browser-data",
+        output_dir=work_dir / "outputs",
+        selector_cache_file=work_dir / "selector_cache.json",
+        infographic_index_file=work_dir / "infographic_index.json",
+        state_db_file=work_dir / "sync_state.db",
+        response_cache_dir=work_dir / "cache" / "genspark",
+        image_cache_dir=work_dir / "cache" / "images",
+        debug_mode=False,
+    )
+
+
+def make_article(chars: int) -> Article:
+    """プロンプトに埋め込むダミー記事"""
+    paragraph = "生成AIの業務活用について、導入の手順と効果、注意点をまとめた段落です。\n"
+    return Article(
+        title="ベンチマーク用の記事",
+        url="https://note.com/instkoni/n/benchmark",
+        content=(paragraph * (chars // len(paragraph) + 1))[:chars],
+    )
+
+
+async def run_targets(args: argparse.Namespace, base_url: str, work_dir: Path) -> dict:
+    config = make_config(base_url, work_dir, args)
+    article = make_article(args.article_chars)
+    image = write_fixture_image(work_dir / "infographic.png")
+    canned = RewriteResult.from_response((FIXTURES_DIR / "genspark_response.txt").read_text(encoding='utf-8'))
+    results = {}
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=not args.headful)
+        context = await browser.new_context(viewport={"width": 1280, "height": 900})
+        try:
+            if "genspark" in args.target:
+                rewriter = GensparkRewriter(config)
+
+                async def genspark_once(i: int) -> bool:
+                    output_dir = config.output_dir / f"genspark_{i + 1}"
+                    output_dir.mkdir(parents=True, exist_ok=True)
+                    response = await rewriter.rewrite(context, article, [image], output_dir)
+                    return bool(response and RewriteResult.from_response(response).linkedin_content)
+
+                print(f"⏱️ GensparkRewriter（{args.iterations}回, 並列{args.concurrency}）...", file=sys.__stdout__)
+                results["genspark"] = await measure(genspark_once, args.iterations, args.concurrency)
+
+            if "sns" in args.target:
+                poster = SNSPoster(config)
+
+                async def sns_once(i: int) -> bool:
+                    result = await poster.post_to_sns(
+                        context, canned.linkedin_content, canned.x_posts, article.url, [image]
+                    )
+                    return result["linkedin"]["success"] and result["x"]["success"]
+
+                print(f"⏱️ SNSPoster（{args.iterations}回, 並列{args.concurrency}）...", file=sys.__stdout__)
+                results["sns"] = await measure(sns_once, args.iterations, args.concurrency)
+        finally:
+            await context.close()
+            await browser.close()
+
+    if "linkedin_poster" in args.target:
+        # 毎回ブラウザを起動し、画面表示時はクリップボードも共有するため直列に実行する
+        async def linkedin_poster_once(i: int) -> bool:
+            output_dir = config.output_dir / f"linkedin_poster_{i + 1}"
+            output_dir.mkdir(parents=True, exist_ok=True)
+            return await linkedin_poster.post_to_linkedin(
+                canned.linkedin_content,
+                f"\n\n🔗 {article.url}",
+                [str(image)],
+                linkedin_url=config.linkedin_url,
+                browser_data_dir=work_dir / f"linkedin-profile-{i + 1}",
+                output_dir=output_dir,
+                wait_for_close=False,
+                headless=not args.headful,
+                use_daemon=False,
+            )
+
+        print(f"⏱️ linkedin_poster.post_to_linkedin（{args.iterations}回）...", file=sys.__stdout__)
+        results["linkedin_poster"] = await measure(linkedin_poster_once, args.iterations, 1)
+
+    return results
+
+
+# --- レポート --- #
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=SCRIPT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _delta(current: float, previous: Optional[float]) -> str:
+    if previous is None:
+        return ""
+    diff = current - previous
+    return f" ({'+' if diff >= 0 else ''}{diff:.2f})"
+
+
+def print_report(report: dict, baseline: Optional[dict]) -> None:
+    """結果を表示（baseline を指定した場合は差分も表示）"""
+    previous_targets = (baseline or {}).get('targets', {})
+    print("\n" + "=" * 60)
+    print(f"📊 ベンチマーク結果（{report['revision'] or 'unknown'}）")
+    if baseline:
+        print(f"   比較対象: {baseline.get('revision') or 'unknown'}（{baseline.get('started_at', '')}）")
+    print("=" * 60)
+
+    for name, result in report['targets'].items():
+        previous = previous_targets.get(name, {})
+        latency = result['latency_s']
+        prev_latency = previous.get('latency_s', {})
+        print(f"\n▶ {name}: 成功 {result['success']}/{result['iterations']}（並列{result['concurrency']}）")
+        print(
+            f"   レイテンシ: 中央値 {latency['median']:.2f}秒{_delta(latency['median'], prev_latency.get('median'))}"
+            f" / p95 {latency['p95']:.2f}秒{_delta(latency['p95'], prev_latency.get('p95'))}"
+            f" / 最小 {latency['min']:.2f}秒 / 最大 {latency['max']:.2f}秒"
+        )
+        print(
+            f"   スループット: {result['throughput_per_min']:.2f}件/分"
+            f"{_delta(result['throughput_per_min'], previous.get('throughput_per_min'))}"
+        )
+        prev_spans = previous.get('span_median_ms', {})
+        for span_name, ms in result['span_median_ms'].items():
+            prev_ms = prev_spans.get(span_name)
+            diff = f"（{'+' if ms - prev_ms >= 0 else ''}{ms - prev_ms:.0f}ms）" if prev_ms is not None else ""
+            print(f"     {span_name:<28} {ms:>10.1f}ms{diff}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ローカルのスタンドインページでブラウザ処理を計測")
+    parser.add_argument("--target", nargs="+", choices=TARGETS, default=list(TARGETS), help="計測対象")
+    parser.add_argument("--iterations", "-n", type=int, default=3, help="各対象の実行回数（デフォルト: 3）")
+    parser.add_argument("--concurrency", "-c", type=int, default=1, help="同時実行数（linkedin_poster は常に1）")
+    parser.add_argument("--article-chars", type=int, default=8000, help="ダミー記事の文字数")
+    parser.add_argument("--first-token-ms", type=int, default=1500, help="Genspark: 送信から最初の文字までの時間")
+    parser.add_argument("--chunk", type=int, default=40, help="Genspark: 1回に追加する文字数")
+    parser.add_argument("--interval-ms", type=int, default=50, help="Genspark: 文字を追加する間隔")
+    parser.add_argument("--upload-ms", type=int, default=300, help="LinkedIn / X: 画像アップロードにかかる時間")
+    parser.add_argument("--headful", action="store_true", help="ブラウザを表示して実行")
+    parser.add_argument("--verbose", "-v", action="store_true", help="計測対象のログを表示")
+    parser.add_argument("--baseline", type=Path, default=None, help="比較する過去の結果JSON")
+    parser.add_argument("--output", type=Path, default=None, help="結果JSONの保存先")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    started_at = datetime.now()
+    server, base_url = start_server()
+    print(f"🌐 フィクスチャサーバー: {base_url}")
+    try:
+        with tempfile.TemporaryDirectory(prefix="sns-bench-") as tmp:
+            log = sys.stdout if args.verbose else io.StringIO()
+            with contextlib.redirect_stdout(log):
+                targets = asyncio.run(run_targets(args, base_url, Path(tmp)))
+    finally:
+        server.shutdown()
+
+    report = {
+        'started_at': started_at.isoformat(timespec='seconds'),
+        'revision': _git_revision(),
+        'params': {
+            'article_chars': args.article_chars,
+            'first_token_ms': args.first_token_ms,
+            'chunk': args.chunk,
+            'interval_ms': args.interval_ms,
+            'upload_ms': args.upload_ms,
+            'headful': args.headful,
+        },
+        'targets': targets,
+    }
+    print_report(report, baseline)
+
+    output = args.output or RESULTS_DIR / f"benchmark_{started_at.strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 結果を保存: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+ブラウザデーモン
+
+永続プロファイルのブラウザを起動したままにし、CDP（リモートデバッグポート、127.0.0.1のみ）で公開する。
+sns_content_generator.py / linkedin_poster.py / manus_automation.py / login_sns.py は
+起動時にこのブラウザへ接続し、Chromiumの起動とキャッシュの温め直しを省く。
+デーモンが起動していなければ、各スクリプトは従来どおりローカルでブラウザを起動する。
+
+    python browser_daemon.py                  # SNS用プロファイル（browser-data-sns）
+    python browser_daemon.py --profile manus  # Manus用プロファイル（browser-data-manus）
+    python browser_daemon.py --headless       # 画面を表示せずに起動（サーバー向け）
+
+Ctrl+C で終了。login_sns.py で手動ログインする場合は --headless を付けずに起動すること。
+"""
+
+import argparse
+import asyncio
+import signal
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+from browser_session import DEVTOOLS_PORT_FILE, daemon_endpoint, launch_persistent_context
+
+
+SCRIPT_DIR = Path(__file__).parent.resolve()
+
+PROFILES = {
+    "sns": SCRIPT_DIR / "browser-data-sns",
+    "manus": SCRIPT_DIR / "browser-data-manus",
+}
+
+
+async def wait_for_endpoint(user_data_dir: Path, timeout: float = 30.0) -> str:
+    """起動したブラウザがポート番号を書き出すまで待機"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        endpoint = daemon_endpoint(user_data_dir)
+        if endpoint:
+            return endpoint
+        await asyncio.sleep(0.2)
+    raise TimeoutError(f"{DEVTOOLS_PORT_FILE} が作成されませんでした")
+
+
+async def run_daemon(user_data_dir: Path, port: int, headless: bool, channel: str) -> None:
+    """ブラウザを起動し、終了シグナルまたはブラウザが閉じられるまで待機"""
+    port_file = user_data_dir / DEVTOOLS_PORT_FILE
+    # 前回のデーモンが異常終了した場合の古いファイルを消してから起動する
+    port_file.unlink(missing_ok=True)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass
+
+    async with async_playwright() as p:
+        context = await launch_persistent_context(
+            p,
+            user_data_dir,
+            headless=headless,
+            channel=channel,
+            extra_args=[f"--remote-debugging-port={port}"]
+        )
+        context.on("close", lambda _: stop.set())
+
+        try:
+            endpoint = await wait_for_endpoint(user_data_dir)
+            print(f"✅ ブラウザデーモン起動: {endpoint}")
+            print(f"   📁 プロファイル: {user_data_dir}")
+            print("   Ctrl+C で終了")
+            await stop.wait()
+        finally:
+            print("\n🔒 ブラウザを閉じます...")
+            try:
+                await context.close()
+            except:
+                pass
+            port_file.unlink(missing_ok=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="永続プロファイルのブラウザを起動したままCDPで公開")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="sns", help="使用するプロファイル（デフォルト: sns）")
+    parser.add_argument("--port", type=int, default=0, help="リモートデバッグポート（デフォルト: 0 = 空いているポート）")
+    parser.add_argument("--headless", action="store_true", help="ブラウザを表示せずに起動")
+    parser.add_argument("--channel", default="", help="ブラウザのチャンネル（chromium / chrome など）")
+    args = parser.parse_args()
+
+    user_data_dir = PROFILES[args.profile]
+    print("=" * 50)
+    print("🌐 ブラウザデーモン")
+    print("=" * 50)
+    asyncio.run(run_daemon(user_data_dir, args.port, args.headless, args.channel))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+ブラウザ起動設定
+
+SNS投稿・Genspark・Manus の各スクリプトで共通の永続プロファイル起動処理。
+ヘッドレスで起動した場合も同じプロファイル（ログイン状態）を使い、
+User-Agent の HeadlessChrome 表記と navigator.webdriver を通常のChromeと同じに見せる。
+login_sns.py は手動ログインのため常に画面を表示して起動する。
+
+browser_daemon.py が同じプロファイルでブラウザを起動済みの場合、open_session() は
+新たに起動せずCDPで接続する（起動時間とキャッシュの温め直しを省く）。
+接続した場合は自分で開いたタブだけを閉じ、ブラウザ本体は閉じない。
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Optional
+
+from playwright.async_api import Browser, BrowserContext, Page, Playwright
+
+
+# 自動操作の検出を避けるための起動フラグ
+STEALTH_ARGS = ['--disable-blink-features=AutomationControlled']
+
+DEFAULT_VIEWPORT = {"width": 1280, "height": 900}
+
+# リモートデバッグポートを指定して起動したChromiumが、プロファイル内に書き出すポート番号のファイル
+DEVTOOLS_PORT_FILE = "DevToolsActivePort"
+
+# デーモンへの接続を諦めてローカル起動に切り替えるまでの時間
+CONNECT_TIMEOUT_MS = 5000
+
+# ページのスクリプトより先に実行し、自動操作・ヘッドレスの痕跡を隠す
+_STEALTH_INIT_SCRIPT = '''
+(() => {
+    Object.defineProperty(Navigator.prototype, 'webdriver', { get: () => undefined });
+    const userAgent = %s;
+    if (userAgent) {
+        Object.defineProperty(Navigator.prototype, 'userAgent', { get: () => userAgent });
+        Object.defineProperty(Navigator.prototype, 'appVersion', { get: () => userAgent.replace(/^Mozilla\\//, '') });
+    }
+})();
+'''
+
+
+async def launch_persistent_context(
+    playwright: Playwright,
+    user_data_dir: Path,
+    headless: bool = False,
+    viewport: Optional[dict] = None,
+    channel: str = "",
+    user_agent: str = "",
+    extra_args: Optional[list[str]] = None
+) -> BrowserContext:
+    """永続プロファイルでChromiumを起動
+
+    Args:
+        headless: True の場合、画面を表示せずに起動（ステルス設定を適用）
+        viewport: 画面サイズ（省略時は 1280×900）
+        channel: ブラウザのチャンネル（例: "chromium" で新しいヘッドレスモード、"chrome" でインストール済みのChrome）
+        user_agent: User-Agent を固定する場合に指定（省略時はヘッドレスでも通常のChromeの表記にする）
+        extra_args: 追加の起動フラグ（デーモンのリモートデバッグポートなど）
+    """
+    options = {
+        "headless": headless,
+        "viewport": viewport or DEFAULT_VIEWPORT,
+        "args": list(STEALTH_ARGS) + list(extra_args or []),
+    }
+    if channel:
+        options["channel"] = channel
+    if user_agent:
+        options["user_agent"] = user_agent
+
+    context = await playwright.chromium.launch_persistent_context(str(user_data_dir), **options)
+    if headless:
+        await apply_stealth(context, user_agent)
+    return context
+
+
+async def apply_stealth(context: BrowserContext, user_agent: str = "") -> None:
+    """ヘッドレス起動時の痕跡を隠す"""
+    if not user_agent:
+        # 起動したブラウザのUser-Agentから HeadlessChrome の表記を除く
+        page = context.pages[0] if context.pages else await context.new_page()
+        current = await page.evaluate("navigator.userAgent")
+        if "HeadlessChrome" in current:
+            user_agent = current.replace("HeadlessChrome", "Chrome")
+            await context.set_extra_http_headers({"User-Agent": user_agent})
+
+    await context.add_init_script(_STEALTH_INIT_SCRIPT % json.dumps(user_agent or None))
+
+
+def daemon_endpoint(user_data_dir: Path) -> Optional[str]:
+    """プロファイルを使用中のブラウザデーモンのCDPエンドポイント（起動していなければ None）
+
+    終了時に削除されなかった古いファイルが残っている場合もあるため、接続できるかは呼び出し側で確認する。
+    """
+    try:
+        port = (user_data_dir / DEVTOOLS_PORT_FILE).read_text(encoding='utf-8').splitlines()[0].strip()
+    except (OSError, IndexError):
+        return None
+    return f"http://127.0.0.1:{port}" if port.isdigit() else None
+
+
+class BrowserSession:
+    """起動した、またはデーモンに接続したブラウザコンテキスト
+
+    Args:
+        context: 操作に使うコンテキスト
+        browser: デーモンに接続した場合の接続先ブラウザ
+    """
+
+    def __init__(self, context: BrowserContext, browser: Optional[Browser] = None):
+        self.context = context
+        self._browser = browser
+        # 接続時点で開いていたタブ（デーモンや他のスクリプトのタブは閉じない）
+        self._foreign_pages = set(context.pages) if browser else set()
+
+    @property
+    def attached(self) -> bool:
+        """デーモンに接続しているか"""
+        return self._browser is not None
+
+    async def wait_until_closed(self, page: Page) -> None:
+        """ユーザーが確認を終えるまで待機
+
+        ローカル起動の場合はブラウザ（全タブ）が閉じられるまで、
+        デーモン接続時は指定したタブが閉じられるまで待つ。
+        """
+        try:
+            if self.attached:
+                while not page.is_closed():
+                    await asyncio.sleep(1)
+            else:
+                while len(self.context.pages) > 0:
+                    await asyncio.sleep(1)
+        except:
+            pass
+
+    async def close(self) -> None:
+        """ローカル起動ならブラウザを閉じ、デーモン接続なら自分のタブを閉じて切断"""
+        if not self.attached:
+            await self.context.close()
+            return
+
+        for page in list(self.context.pages):
+            if page not in self._foreign_pages:
+                try:
+                    await page.close()
+                except:
+                    pass
+        # connect_over_cdp で得たブラウザの close() は接続を切るだけで、デーモンは動き続ける
+        await self._browser.close()
+
+
+async def open_session(
+    playwright: Playwright,
+    user_data_dir: Path,
+    use_daemon: bool = True,
+    **launch_options
+) -> BrowserSession:
+    """ブラウザデーモンに接続し、起動していなければローカルで起動
+
+    Args:
+        use_daemon: False の場合はデーモンを探さずにローカルで起動
+        launch_options: ローカル起動時に launch_persistent_context() へ渡す設定
+    """
+    endpoint = daemon_endpoint(user_data_dir) if use_daemon else None
+    if endpoint:
+        try:
+            browser = await playwright.chromium.connect_over_cdp(endpoint, timeout=CONNECT_TIMEOUT_MS)
+            if browser.contexts:
+                print(f"🔌 ブラウザデーモンに接続: {endpoint}")
+                return BrowserSession(browser.contexts[0], browser)
+            await browser.close()
+        except Exception as e:
+            print(f"   ⚠️ ブラウザデーモンに接続できません、ローカルで起動します: {e}")
+
+    context = await launch_persistent_context(playwright, user_data_dir, **launch_options)
+    return BrowserSession(context)
@@ -0,0 +1,94 @@
+"""
+処理のチェックポイント
+
+出力ディレクトリごとに checkpoint.json を置き、完了した段階とその成果物を記録する。
+sns_content_generator.py --resume <output_dir> は記録を読み込み、
+最初の未完了の段階から再開する（Gensparkへの再送信や投稿済みのSNS下書きの再作成はしない）。
+
+段階:
+    article   記事本文の取得（Article のフィールド）
+    images    インフォグラフィック画像の選択（画像パスのリスト）
+    response  Gensparkのレスポンス（raw_response.txt）
+    drafts    下書きの保存（rewrite_result.json）
+    linkedin  LinkedInへの予約下書き投稿（投稿結果）
+    x         Xへの全ツイートの予約下書き投稿（ツイートごとの結果は x_posts に記録）
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+
+class Checkpoint:
+    """出力ディレクトリの checkpoint.json
+
+    Args:
+        output_dir: 記事の出力ディレクトリ
+    """
+
+    FILENAME = "checkpoint.json"
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        self.path = output_dir / self.FILENAME
+        self._data: dict[str, Any] = self._load()
+
+    def done(self, stage: str) -> bool:
+        """段階が完了しているか"""
+        return stage in self._data.get("stages", {})
+
+    def remaining(self, stages: list[str]) -> list[str]:
+        """未完了の段階（stages の順序を維持）"""
+        return [stage for stage in stages if not self.done(stage)]
+
+    def artifact(self, stage: str) -> Any:
+        """完了した段階の成果物（未完了の場合は None）"""
+        return self._data.get("stages", {}).get(stage, {}).get("artifact")
+
+    def complete(self, stage: str, artifact: Any = None) -> None:
+        """段階の完了を記録"""
+        self._data.setdefault("stages", {})[stage] = {
+            "artifact": artifact,
+            "completed_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._save()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """段階以外の記録（実行オプションなど）"""
+        return self._data.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        """段階以外の値を記録"""
+        self._data[key] = value
+        self._save()
+
+    # --- Xのツイート単位の記録 --- #
+
+    def x_post(self, index: int) -> Optional[dict]:
+        """投稿済みツイートの結果（未投稿の場合は None）"""
+        return self._data.get("x_posts", {}).get(str(index))
+
+    def complete_x_post(self, index: int, result: dict) -> None:
+        """ツイートの投稿完了を記録"""
+        self._data.setdefault("x_posts", {})[str(index)] = result
+        self._save()
+
+    def _load(self) -> dict[str, Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        # 書き込み途中で中断されても前回の記録が壊れないよう、一時ファイルから置き換える
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"   ⚠️ チェックポイント保存エラー: {e}")
@@ -0,0 +1,164 @@
+"""
+DOM変化ウォッチャー
+
+ページ内にMutationObserverを注入し、DOMが変化したときだけ
+状態スナップショットをPython側へ通知する。
+ポーリングでセレクタを何度も問い合わせる代わりに使用する。
+"""
+
+import asyncio
+import itertools
+import json
+import weakref
+from typing import Any, Optional
+
+from playwright.async_api import Page
+
+
+# ページに公開する通知用バインディング（ページごとに1つだけ公開し、ウォッチャーIDで振り分ける）
+_BINDING = "__domWatchNotify"
+
+# 同じページで複数のウォッチャーを区別するための連番
+_watcher_ids = itertools.count(1)
+
+# ページ → バインディング公開済みのページで動作中のウォッチャー
+# タブプールで同じタブを使い回しても、バインディングを追加し続けないようにする
+_page_watchers: "weakref.WeakKeyDictionary[Page, dict[str, DomChangeWatcher]]" = weakref.WeakKeyDictionary()
+
+# MutationObserverを設置するスクリプト（__PROBE__ にprobe関数を埋め込む）
+# CSPでevalが禁止されているページでも動くよう、文字列結合で関数を組み立てる
+# probe() の戻り値が前回と変わったときだけバインディングを呼び出す
+_INSTALL_JS_TEMPLATE = '''
+([binding, watcherId, throttleMs]) => {
+    const key = '__domWatch_' + watcherId;
+    if (window[key]) {
+        window[key].disconnect();
+    }
+    const probe = __PROBE__;
+    let last = null;
+    let timer = null;
+    const report = () => {
+        timer = null;
+        let state;
+        try {
+            state = JSON.stringify(probe());
+        } catch (e) {
+            return;
+        }
+        if (state !== last) {
+            last = state;
+            window[binding](watcherId, state);
+        }
+    };
+    const observer = new MutationObserver(() => {
+        if (timer === null) {
+            timer = setTimeout(report, throttleMs);
+        }
+    });
+    observer.observe(document.documentElement, {
+        childList: true,
+        subtree: true,
+        characterData: true,
+        attributes: true,
+    });
+    window[key] = observer;
+    report();
+    return true;
+}
+'''
+
+_UNINSTALL_JS = '''
+(watcherId) => {
+    const key = '__domWatch_' + watcherId;
+    if (window[key]) {
+        window[key].disconnect();
+        delete window[key];
+    }
+}
+'''
+
+
+class DomChangeWatcher:
+    """MutationObserverによるDOM状態の変化通知
+
+    Args:
+        page: 監視対象のページ
+        probe_js: 状態スナップショットを返すJavaScript関数（JSONシリアライズ可能な値を返すこと）
+        throttle_ms: 変化を集約する間隔（ミリ秒）
+    """
+
+    def __init__(self, page: Page, probe_js: str, throttle_ms: int = 250):
+        self.page = page
+        self.install_js = _INSTALL_JS_TEMPLATE.replace("__PROBE__", probe_js)
+        self.throttle_ms = throttle_ms
+        self.watcher_id = f"w{next(_watcher_ids)}"
+        self.state: Optional[Any] = None
+        self._changed = asyncio.Event()
+        self._installed = False
+        self._reinstall_tasks: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Observerを設置（通知用バインディングはページごとに1回だけ公開）"""
+        watchers = _page_watchers.get(self.page)
+        if watchers is None:
+            watchers = {}
+            _page_watchers[self.page] = watchers
+            await self.page.expose_function(_BINDING, lambda watcher_id, state: _dispatch(watchers, watcher_id, state))
+        watchers[self.watcher_id] = self
+        self.page.on("domcontentloaded", self._on_navigation)
+        await self._install()
+        self._installed = True
+
+    async def stop(self) -> None:
+        """Observerを解除"""
+        if not self._installed:
+            return
+        self._installed = False
+        self.page.remove_listener("domcontentloaded", self._on_navigation)
+        _page_watchers.get(self.page, {}).pop(self.watcher_id, None)
+        try:
+            await self.page.evaluate(_UNINSTALL_JS, self.watcher_id)
+        except Exception:
+            pass
+
+    async def wait_for_change(self, timeout: float) -> bool:
+        """次の状態変化を待機
+
+        前回の呼び出し以降に届いた変化があれば、待たずに True を返す。
+
+        Returns:
+            bool: timeout 秒以内に変化があれば True
+        """
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        self._changed.clear()
+        return True
+
+    async def _install(self) -> None:
+        await self.page.evaluate(self.install_js, [_BINDING, self.watcher_id, self.throttle_ms])
+
+    def _on_change(self, state_json: str) -> None:
+        self.state = json.loads(state_json)
+        self._changed.set()
+
+    def _on_navigation(self, _page: Page) -> None:
+        # フルページ遷移でObserverが消えるため再設置する
+        if self._installed:
+            task = asyncio.ensure_future(self._reinstall())
+            self._reinstall_tasks.add(task)
+            task.add_done_callback(self._reinstall_tasks.discard)
+
+    async def _reinstall(self) -> None:
+        try:
+            await self._install()
+        except Exception as e:
+            print(f"   ⚠️ DOM監視の再設置に失敗: {e}")
+
+
+def _dispatch(watchers: dict[str, DomChangeWatcher], watcher_id: str, state_json: str) -> None:
+    """ページからの通知を該当するウォッチャーに渡す（停止済みのウォッチャーへの通知は捨てる）"""
+    watcher = watchers.get(watcher_id)
+    if watcher:
+        watcher._on_change(state_json)
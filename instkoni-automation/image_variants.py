@@ -0,0 +1,149 @@
+"""
+アップロード用画像の前処理
+
+インフォグラフィック（PNG）をプラットフォームごとの上限サイズに縮小し、
+JPEG / WebP に再圧縮してからアップロードする。
+変換結果は元画像の内容ハッシュをキーにキャッシュし、変換はプロセスプールで並列に行う。
+Pillow がインストールされていない場合は元画像をそのまま使う。
+"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from infographic_index import file_sha256
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+# プラットフォームごとの長辺の上限（ピクセル）
+DEFAULT_MAX_EDGES = {
+    "x": 1600,
+    "linkedin": 1920,
+}
+
+_EXTENSIONS = {
+    "jpeg": ".jpg",
+    "webp": ".webp",
+}
+
+
+def render_variant(src: str, dest: str, max_edge: int, image_format: str, quality: int) -> str:
+    """画像を長辺 max_edge 以下に縮小して保存（プロセスプールから呼ばれる）"""
+    with Image.open(src) as img:
+        img.load()
+        if max(img.size) > max_edge:
+            img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+        if image_format == "jpeg":
+            # JPEGは透過を扱えないため白背景に合成
+            if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+                rgba = img.convert("RGBA")
+                background = Image.new("RGB", rgba.size, (255, 255, 255))
+                background.paste(rgba, mask=rgba.getchannel("A"))
+                img = background
+            elif img.mode != "RGB":
+                img = img.convert("RGB")
+            save_kwargs = {"quality": quality, "optimize": True, "progressive": True}
+        else:
+            save_kwargs = {"quality": quality, "method": 6}
+
+        tmp_path = dest + ".tmp"
+        img.save(tmp_path, format=image_format.upper(), **save_kwargs)
+        os.replace(tmp_path, dest)
+    return dest
+
+
+class ImageVariantCache:
+    """プラットフォーム別の縮小画像キャッシュ
+
+    Args:
+        cache_dir: 変換後の画像の保存先
+        image_format: "jpeg" または "webp"
+        quality: 圧縮品質（1-100）
+        max_edges: プラットフォームごとの長辺の上限
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        image_format: str = "jpeg",
+        quality: int = 85,
+        max_edges: Optional[dict[str, int]] = None
+    ):
+        self.cache_dir = cache_dir
+        self.image_format = image_format.lower() if image_format.lower() in _EXTENSIONS else "jpeg"
+        self.quality = quality
+        self.max_edges = max_edges or DEFAULT_MAX_EDGES
+
+    @property
+    def available(self) -> bool:
+        """Pillowが利用できるか"""
+        return Image is not None
+
+    async def prepare(self, images: list[Path], platforms: list[str]) -> dict[str, list[Path]]:
+        """各プラットフォーム向けの画像を用意
+
+        変換に失敗した画像、変換しても小さくならない画像は元画像を使う。
+
+        Returns:
+            dict: プラットフォーム名 → アップロードする画像パスのリスト（元の順序を維持）
+        """
+        prepared = {platform: list(images) for platform in platforms}
+        if not images or not self.available:
+            if images and not self.available:
+                print("   ⚠️ Pillowが未インストールのため、画像は元のサイズでアップロードします")
+            return prepared
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        loop = asyncio.get_running_loop()
+
+        # 元画像の内容ハッシュ（ファイル読み込みはスレッドで行う）
+        hashes = await asyncio.gather(
+            *(loop.run_in_executor(None, file_sha256, image) for image in images),
+            return_exceptions=True
+        )
+
+        jobs = {}
+        for i, (image, digest) in enumerate(zip(images, hashes)):
+            if isinstance(digest, Exception):
+                continue
+            for platform in platforms:
+                max_edge = self.max_edges.get(platform)
+                if not max_edge:
+                    continue
+                dest = self.cache_dir / f"{digest[:32]}_{platform}_{max_edge}_q{self.quality}{_EXTENSIONS[self.image_format]}"
+                jobs[(platform, i)] = (image, dest, max_edge)
+
+        # 同じ画像が重複して渡された場合も1回だけ変換する
+        pending = {dest: (image, dest, max_edge) for image, dest, max_edge in jobs.values() if not dest.exists()}
+        if pending:
+            print(f"   🖼️ アップロード用画像を変換中（{len(pending)}枚）...")
+            with ProcessPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1)) as pool:
+                results = await asyncio.gather(
+                    *(
+                        loop.run_in_executor(
+                            pool, render_variant,
+                            str(image), str(dest), max_edge, self.image_format, self.quality
+                        )
+                        for image, dest, max_edge in pending.values()
+                    ),
+                    return_exceptions=True
+                )
+            for (image, _dest, _max_edge), result in zip(pending.values(), results):
+                if isinstance(result, Exception):
+                    print(f"   ⚠️ 画像変換エラー（元画像を使用）: {image.name}: {result}")
+
+        for (platform, i), (image, dest, _max_edge) in jobs.items():
+            try:
+                if dest.stat().st_size < image.stat().st_size:
+                    prepared[platform][i] = dest
+            except OSError:
+                pass
+
+        return prepared
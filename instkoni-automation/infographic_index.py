@@ -0,0 +1,257 @@
+"""
+インフォグラフィック索引
+
+articles/infographic 以下のタイムスタンプ付きフォルダ（YYYYMMDDHHMMSS_記事名）と
+画像のメタ情報（更新日時・サイズ・縦横ピクセル数・SHA-256）をJSONマニフェストに保存する。
+フォルダの追加・削除はルートの更新日時が変わった場合だけ確認し、画像は毎回ファイルごとの
+更新日時・サイズを確認して、変わった画像（同名で上書きされた画像を含む）だけを読み直す。
+記事タイトル・公開日からフォルダを辞書引きする。
+"""
+
+import hashlib
+import json
+import os
+import re
+import struct
+import unicodedata
+from pathlib import Path
+from typing import Optional
+
+
+# マニフェストの形式が変わったら上げる
+INDEX_VERSION = 1
+
+IMAGE_SUFFIXES = ('.png', '.jpg', '.jpeg')
+
+# YYYYMMDDHHMMSS_記事名（記事名は YYYYMMDD_タイトル の場合もある）
+_FOLDER_RE = re.compile(r'^(\d{14})_(.*)$')
+_ARTICLE_DATE_RE = re.compile(r'^(\d{8})_(.*)$')
+
+# JPEGのSOFマーカー（DHT / JPG / DAC を除く）
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def title_key(title: str) -> str:
+    """タイトル照合用のキー（記号・空白・区切りの _ を除き、全角英数を半角に揃える）"""
+    normalized = unicodedata.normalize('NFKC', title).lower()
+    return ''.join(ch for ch in normalized if ch.isalnum())
+
+
+def read_image_size(path: Path) -> Optional[tuple[int, int]]:
+    """PNG / JPEG のヘッダーから (幅, 高さ) を読み取る"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(26)
+            if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+                width, height = struct.unpack('>II', head[16:24])
+                return width, height
+
+            if head[:2] != b'\xff\xd8':
+                return None
+
+            # JPEG: セグメントを順にたどってSOFを探す
+            f.seek(2)
+            while True:
+                byte = f.read(1)
+                while byte and byte != b'\xff':
+                    byte = f.read(1)
+                while byte == b'\xff':
+                    byte = f.read(1)
+                if not byte:
+                    return None
+                marker = byte[0]
+                if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                    continue
+                length_bytes = f.read(2)
+                if len(length_bytes) < 2:
+                    return None
+                length = struct.unpack('>H', length_bytes)[0]
+                if marker in _JPEG_SOF_MARKERS:
+                    data = f.read(5)
+                    if len(data) < 5:
+                        return None
+                    height, width = struct.unpack('>HH', data[1:5])
+                    return width, height
+                f.seek(length - 2, os.SEEK_CUR)
+    except OSError:
+        return None
+
+
+def file_sha256(path: Path) -> str:
+    """ファイル内容のSHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class InfographicIndex:
+    """インフォグラフィックフォルダの索引
+
+    Args:
+        root: インフォグラフィックのルートディレクトリ
+        index_file: マニフェスト（JSON）のパス
+    """
+
+    def __init__(self, root: Path, index_file: Path):
+        self.root = root
+        self.index_file = index_file
+        self._data = self._load()
+        self._by_title: dict[str, str] = {}
+        self._by_date: dict[str, list[str]] = {}
+        self._dirty = False
+
+    # --- 更新 --- #
+
+    def refresh(self) -> None:
+        """フォルダ・画像の変更を確認してマニフェストを更新
+
+        同名で上書きされた画像ではフォルダの更新日時が変わらないため、画像は各フォルダで
+        ファイルごとの更新日時・サイズを確認する（変わっていない画像はハッシュを計算し直さない）。
+        """
+        if not self.root.exists():
+            return
+
+        root_mtime = self.root.stat().st_mtime
+        folders: dict = self._data['folders']
+
+        # ルートが変わった場合のみフォルダの追加・削除と直接配置の画像を確認
+        if root_mtime != self._data.get('root_mtime'):
+            names = set()
+            for item in self.root.iterdir():
+                if item.is_dir() and _FOLDER_RE.match(item.name):
+                    names.add(item.name)
+            for removed in set(folders) - names:
+                del folders[removed]
+            for added in names - set(folders):
+                folders[added] = {'mtime': None, 'images': []}
+            self._data['root_mtime'] = root_mtime
+            self._dirty = True
+
+        loose = self._scan_images(self.root, self._data.get('loose', []))
+        if loose != self._data.get('loose'):
+            self._data['loose'] = loose
+            self._dirty = True
+
+        for name, entry in folders.items():
+            folder = self.root / name
+            try:
+                mtime = folder.stat().st_mtime
+                images = self._scan_images(folder, entry.get('images', []))
+            except OSError:
+                continue
+            if mtime != entry.get('mtime') or images != entry.get('images'):
+                entry['images'] = images
+                entry['mtime'] = mtime
+                self._dirty = True
+
+        self._build_lookup()
+        if self._dirty:
+            self._save()
+            self._dirty = False
+
+    def _scan_images(self, folder: Path, previous: list[dict]) -> list[dict]:
+        """フォルダ内の画像メタ情報を取得（更新日時・サイズが同じ画像は前回の値を再利用）"""
+        known = {image['name']: image for image in previous}
+        images = []
+        for entry in os.scandir(folder):
+            if not entry.is_file() or not entry.name.lower().endswith(IMAGE_SUFFIXES):
+                continue
+            stat = entry.stat()
+            cached = known.get(entry.name)
+            if cached and cached['mtime'] == stat.st_mtime and cached['size'] == stat.st_size:
+                images.append(cached)
+                continue
+
+            path = Path(entry.path)
+            size = read_image_size(path)
+            images.append({
+                'name': entry.name,
+                'mtime': stat.st_mtime,
+                'size': stat.st_size,
+                'width': size[0] if size else None,
+                'height': size[1] if size else None,
+                'sha256': file_sha256(path),
+            })
+        images.sort(key=lambda image: image['name'])
+        return images
+
+    def _build_lookup(self) -> None:
+        self._by_title = {}
+        self._by_date = {}
+        # 新しいフォルダを優先するため、古い順に登録して上書きする
+        for name in sorted(self._data['folders']):
+            article_name = _FOLDER_RE.match(name).group(2)
+            date_match = _ARTICLE_DATE_RE.match(article_name)
+            if date_match:
+                article_date, article_title = date_match.groups()
+            else:
+                article_date, article_title = name[:8], article_name
+            self._by_title[title_key(article_title)] = name
+            self._by_date.setdefault(article_date, []).append(name)
+
+    # --- 検索 --- #
+
+    def latest_folder(self) -> Optional[str]:
+        """最新のタイムスタンプ付きフォルダ名"""
+        folders = self._data['folders']
+        return max(folders) if folders else None
+
+    def find_folder(self, title: str = "", published_at: Optional[str] = None) -> Optional[str]:
+        """記事タイトル（優先）または公開日に対応するフォルダ名"""
+        if title:
+            name = self._by_title.get(title_key(title))
+            if name:
+                return name
+
+        if published_at:
+            article_date = re.sub(r'\D', '', published_at[:10])
+            candidates = self._by_date.get(article_date)
+            if candidates:
+                return candidates[-1]
+
+        return None
+
+    def folder_images(self, name: str) -> list[Path]:
+        """フォルダ内の画像パス（ファイル名順）"""
+        entry = self._data['folders'].get(name, {})
+        return [self.root / name / image['name'] for image in entry.get('images', [])]
+
+    def loose_images(self) -> list[Path]:
+        """ルート直下に配置された画像（更新日時の新しい順）"""
+        images = sorted(self._data.get('loose', []), key=lambda image: image['mtime'], reverse=True)
+        return [self.root / image['name'] for image in images]
+
+    def image_info(self, path: Path) -> Optional[dict]:
+        """画像のメタ情報（幅・高さ・SHA-256など）"""
+        if path.parent == self.root:
+            images = self._data.get('loose', [])
+        else:
+            images = self._data['folders'].get(path.parent.name, {}).get('images', [])
+        for image in images:
+            if image['name'] == path.name:
+                return image
+        return None
+
+    # --- 保存 --- #
+
+    def _load(self) -> dict:
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION and str(self.root) == data.get('root'):
+                return data
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {'version': INDEX_VERSION, 'root': str(self.root), 'root_mtime': None, 'folders': {}, 'loose': []}
+
+    def _save(self) -> None:
+        tmp_path = self.index_file.with_name(self.index_file.name + ".tmp")
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.index_file)
+        except OSError as e:
+            print(f"   ⚠️ インフォグラフィック索引の保存エラー: {e}")
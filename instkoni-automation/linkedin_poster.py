@@ -8,18 +8,90 @@ LinkedIn自動投稿スクリプト v4
 """
 
 import asyncio
+import configparser
 import sys
 import subprocess
 import pyperclip
 import re
 from pathlib import Path
 from datetime import datetime, timedelta
+from typing import Optional
 from playwright.async_api import async_playwright
 
+from browser_session import open_session
+from image_variants import ImageVariantCache
+from response_parser import RewriteResult
+from wait_strategies import (
+    wait_for_button_enabled,
+    wait_for_hidden,
+    wait_for_modal_closed,
+    wait_for_modal_open,
+    wait_for_text_growth,
+    wait_for_upload_thumbnails,
+    wait_for_visible,
+)
+
 # パス設定
 SCRIPT_DIR = Path(__file__).parent.resolve()
 BROWSER_DATA_DIR = SCRIPT_DIR / "browser-data-sns"
 OUTPUT_DIR = SCRIPT_DIR / "outputs"
+CONFIG_PATH = SCRIPT_DIR / "config.ini"
+LINKEDIN_URL = "https://www.linkedin.com/feed/"
+
+# ショートカットの修飾キー（macOSは Meta、それ以外は Control）
+MODIFIER = "Meta" if sys.platform == "darwin" else "Control"
+
+
+def load_image_variants(config_path: Path = CONFIG_PATH) -> Optional[ImageVariantCache]:
+    """config.ini の [IMAGES] 設定で変換キャッシュを作成（preprocess = false の場合は None）"""
+    parser = configparser.ConfigParser()
+    parser.read(config_path, encoding='utf-8')
+    if not parser.getboolean('IMAGES', 'preprocess', fallback=True):
+        return None
+    return ImageVariantCache(
+        SCRIPT_DIR / parser.get('IMAGES', 'cache_dir', fallback='cache/images'),
+        image_format=parser.get('IMAGES', 'format', fallback='jpeg'),
+        quality=parser.getint('IMAGES', 'quality', fallback=85),
+        max_edges={"linkedin": parser.getint('IMAGES', 'linkedin_max_edge', fallback=1920)}
+    )
+
+
+def load_linkedin_draft(folder: Path) -> tuple[str, str, list[str]]:
+    """
+    出力フォルダから本文・URL・画像パスを取得する
+
+    rewrite_result.json があればそれを使い、ない場合（古い出力フォルダ）は
+    linkedin_draft.md を解析する。
+
+    Returns:
+        tuple[str, str, list[str]]: (本文, URL, 画像パスリスト)
+    """
+    result = RewriteResult.load(folder)
+    if result is None:
+        return parse_linkedin_draft(folder / "linkedin_draft.md")
+
+    url_text = f"\n{result.source_url}" if result.source_url else ""
+    images = [str(img) for img in result.image_paths if img.exists()]
+    return result.linkedin_content, url_text, images
+
+
+def draft_preview_title(folder: Path) -> str:
+    """フォルダ一覧に表示する投稿冒頭の1行"""
+    result = RewriteResult.load(folder)
+    if result is not None:
+        body_lines = result.linkedin_content.strip().split('\n')
+        return body_lines[0][:60] if body_lines else folder.name
+
+    try:
+        content = (folder / "linkedin_draft.md").read_text(encoding='utf-8')
+        # 本文の最初の行を取得（---の後の最初の行）
+        parts = content.split('---')
+        if len(parts) >= 2:
+            body_lines = parts[1].strip().split('\n')
+            return body_lines[0][:60] if body_lines else folder.name
+        return folder.name
+    except:
+        return folder.name
 
 
 def parse_linkedin_draft(draft_path: Path) -> tuple[str, str, list[str]]:
@@ -98,19 +170,7 @@ def select_draft_folder() -> tuple[str, str, list[str], str]:
     # 一覧表示
     print("\n利用可能なフォルダ:")
     for i, folder in enumerate(folders[:10]):
-        draft_file = folder / "linkedin_draft.md"
-        # draft_fileから最初の行（タイトル相当）を取得
-        try:
-            content = draft_file.read_text(encoding='utf-8')
-            # 本文の最初の行を取得（---の後の最初の行）
-            parts = content.split('---')
-            if len(parts) >= 2:
-                body_lines = parts[1].strip().split('\n')
-                title = body_lines[0][:60] if body_lines else folder.name
-            else:
-                title = folder.name
-        except:
-            title = folder.name
+        title = draft_preview_title(folder)
         print(f"  [{i+1}] {folder.name}")
         print(f"       {title}...")
 
@@ -133,9 +193,8 @@ def select_draft_folder() -> tuple[str, str, list[str], str]:
         except ValueError:
             print("⚠️ 数字を入力してください")
 
-    # linkedin_draft.mdを解析
-    draft_file = selected / "linkedin_draft.md"
-    content_no_url, url_text, images = parse_linkedin_draft(draft_file)
+    # 投稿内容を読み込み
+    content_no_url, url_text, images = load_linkedin_draft(selected)
 
     # 内容を表示
     print(f"\n✅ 選択フォルダ: {selected.name}")
@@ -194,9 +253,8 @@ def select_draft_folder_auto(folder_num: int) -> tuple[str, str, list[str], str]
 
     selected = folders[idx]
 
-    # linkedin_draft.mdを解析
-    draft_file = selected / "linkedin_draft.md"
-    content_no_url, url_text, images = parse_linkedin_draft(draft_file)
+    # 投稿内容を読み込み
+    content_no_url, url_text, images = load_linkedin_draft(selected)
 
     # 内容を表示
     print(f"\n✅ 選択フォルダ: {selected.name}")
@@ -229,8 +287,44 @@ def get_schedule_settings() -> int:
             print("⚠️ 数字を入力してください")
 
 
-async def post_to_linkedin(content_no_url: str, url_text: str, images: list[str], schedule_days: int = 7):
-    """LinkedInに投稿"""
+async def paste_text(page, text: str, headless: bool) -> None:
+    """エディタにテキストを入力
+
+    通常はクリップボード経由で貼り付ける（改行・絵文字を崩さないため）。
+    ヘッドレスではOSのクリップボードを使えないため、入力イベントとして直接挿入する。
+    """
+    if headless:
+        await page.keyboard.insert_text(text)
+    else:
+        pyperclip.copy(text)
+        await page.keyboard.press(f"{MODIFIER}+v")
+
+
+async def post_to_linkedin(
+    content_no_url: str,
+    url_text: str,
+    images: list[str],
+    schedule_days: int = 7,
+    linkedin_url: str = LINKEDIN_URL,
+    browser_data_dir: Path = BROWSER_DATA_DIR,
+    output_dir: Path = OUTPUT_DIR,
+    wait_for_close: bool = True,
+    headless: bool = False,
+    use_daemon: bool = True
+) -> bool:
+    """LinkedInに投稿
+
+    Args:
+        linkedin_url: フィードのURL（ベンチマークではローカルのスタンドインページを指定）
+        browser_data_dir: ブラウザプロファイルの保存先
+        output_dir: スクリーンショットの保存先
+        wait_for_close: True の場合、ブラウザが閉じられるまで待機
+        headless: True の場合、画面を表示せずに実行（クリップボードを使わずに直接入力する）
+        use_daemon: True の場合、browser_daemon.py が起動していれば接続して使う
+
+    Returns:
+        bool: スケジュール予約まで完了したか
+    """
     schedule_time = datetime.now() + timedelta(days=schedule_days)
 
     print("\n" + "=" * 60)
@@ -240,102 +334,106 @@ async def post_to_linkedin(content_no_url: str, url_text: str, images: list[str]
     print(f"📷 画像数: {len(images)}枚")
     print("=" * 60)
 
+    # アップロード前にLinkedIn向けのサイズへ縮小・再圧縮（config.ini の [IMAGES] 設定に従う）
+    image_variants = load_image_variants()
+    if image_variants:
+        prepared = await image_variants.prepare([Path(img) for img in images], ["linkedin"])
+        images = [str(img) for img in prepared["linkedin"]]
+
     async with async_playwright() as p:
-        context = await p.chromium.launch_persistent_context(
-            str(BROWSER_DATA_DIR),
-            headless=False,
-            viewport={"width": 1280, "height": 900}
-        )
+        session = await open_session(p, browser_data_dir, use_daemon=use_daemon, headless=headless)
 
-        page = await context.new_page()
+        page = await session.context.new_page()
+        success = False
 
         try:
             print("\n🌐 LinkedInにアクセス中...", flush=True)
-            await page.goto("https://www.linkedin.com/feed/", wait_until="domcontentloaded", timeout=60000)
-            await page.wait_for_timeout(4000)
+            await page.goto(linkedin_url, wait_until="domcontentloaded", timeout=60000)
+            start_post_btn = page.locator('button:has-text("投稿を開始")').first
+            await wait_for_visible(start_post_btn, 30000)
 
             # Step 1: 投稿モーダルを開く
             print("\n📝 Step 1/11: 投稿モーダルを開く...", flush=True)
-            await page.locator('button:has-text("投稿を開始")').first.click()
-            await page.wait_for_timeout(3000)
+            await start_post_btn.click()
+            await wait_for_modal_open(page)
             print("   ✅ 完了", flush=True)
 
             # Step 2: メディア追加ボタンをクリック
             print("📷 Step 2/11: メディア追加画面を開く...", flush=True)
             await page.locator('button[aria-label="メディアを追加"]').first.click()
-            await page.wait_for_timeout(3000)
+            # file inputを探す（複数の可能なセレクタを試す）
+            file_input = page.locator('input[type="file"]').first
+            await file_input.wait_for(state="attached", timeout=10000)
             print("   ✅ 完了", flush=True)
 
             # Step 3: 画像をアップロード（ファイルダイアログが開いた状態で）
             print(f"📷 Step 3/11: 画像をアップロード（{len(images)}枚）...", flush=True)
-            # file inputを探す（複数の可能なセレクタを試す）
-            file_input = page.locator('input[type="file"]').first
             await file_input.set_input_files(images)
-            print("   ⏳ アップロード待機中（25秒）...", flush=True)
-            await page.wait_for_timeout(25000)
+            print("   ⏳ アップロード待機中（プレビュー表示まで）...", flush=True)
+            if not await wait_for_upload_thumbnails(page, len(images), timeout_ms=60000):
+                print("   ⚠️ プレビューを確認できませんでした（続行）", flush=True)
             print("   ✅ 完了", flush=True)
 
             # Step 3.5: macOSネイティブファイルダイアログを閉じる
+            # （OS側のダイアログはページから状態を観測できないため、ここだけは固定待機を残す）
             print("🔄 Step 3.5/11: ネイティブダイアログを閉じる...", flush=True)
-            await page.wait_for_timeout(2000)
-            # Cmd+. (macOS標準のキャンセルショートカット) を送信
-            subprocess.run([
-                'osascript', '-e',
-                'tell application "System Events" to keystroke "." using command down'
-            ], capture_output=True)
-            await page.wait_for_timeout(1500)
-            # Escapeも送信
-            subprocess.run([
-                'osascript', '-e',
-                'tell application "System Events" to key code 53'
-            ], capture_output=True)
-            await page.wait_for_timeout(1000)
-            print("   ✅ 完了", flush=True)
+            if sys.platform == "darwin" and not headless:
+                await page.wait_for_timeout(1000)
+                # Cmd+. (macOS標準のキャンセルショートカット) を送信
+                subprocess.run([
+                    'osascript', '-e',
+                    'tell application "System Events" to keystroke "." using command down'
+                ], capture_output=True)
+                await page.wait_for_timeout(1500)
+                # Escapeも送信
+                subprocess.run([
+                    'osascript', '-e',
+                    'tell application "System Events" to key code 53'
+                ], capture_output=True)
+                await page.wait_for_timeout(1000)
+                print("   ✅ 完了", flush=True)
+            else:
+                print("   ⚠️ ネイティブダイアログなし（スキップ）", flush=True)
 
             # Step 3.6: 「変更を破棄」確認メッセージが出たらキャンセルをクリック
             print("🔄 Step 3.6/11: 確認メッセージを閉じる...", flush=True)
-            await page.wait_for_timeout(1000)
             try:
                 # 「変更を破棄」テキストが表示されているか確認
                 discard_text = page.locator('text=変更を破棄してもよろしいですか')
-                if await discard_text.is_visible(timeout=3000):
+                if await wait_for_visible(discard_text, 3000):
                     # キャンセルボタンをクリック
                     cancel_btn = page.locator('button:has-text("キャンセル")').first
                     await cancel_btn.click()
-                    await page.wait_for_timeout(1000)
+                    await wait_for_hidden(discard_text, 5000)
                     print("   ✅ キャンセルをクリック", flush=True)
                 else:
                     print("   ⚠️ 確認メッセージなし（スキップ）", flush=True)
             except:
                 print("   ⚠️ 確認メッセージなし（スキップ）", flush=True)
-            await page.wait_for_timeout(500)
 
             # Step 4: 「次へ」をクリック（画像選択完了）
             print("➡️ Step 4/11: 画像選択完了「次へ」...", flush=True)
             next_btn = page.locator('button:has-text("次へ")').first
+            await wait_for_button_enabled(next_btn)
             await next_btn.click()
-            await page.wait_for_timeout(3000)
+            editor = page.locator('.ql-editor').first
+            await wait_for_visible(editor)
             print("   ✅ 完了", flush=True)
 
             # Step 5: コンテンツ入力（クリップボード経由）
             print("📝 Step 5/11: コンテンツ入力...", flush=True)
-            editor = page.locator('.ql-editor').first
             await editor.click()
-            await page.wait_for_timeout(500)
-            # クリップボード経由で貼り付け
-            pyperclip.copy(content_no_url)
-            await page.keyboard.press("Meta+v")  # macOSはMeta+v
-            await page.wait_for_timeout(2000)
+            await paste_text(page, content_no_url, headless)
+            await wait_for_text_growth(editor, 0, 5000)
             print("   ✅ 完了", flush=True)
 
             # Step 6: URL追記
             print("🔗 Step 6/11: URL追記...", flush=True)
             # 末尾に移動
-            await page.keyboard.press("Meta+End")
-            await page.wait_for_timeout(300)
-            pyperclip.copy(url_text)
-            await page.keyboard.press("Meta+v")
-            await page.wait_for_timeout(2000)
+            await page.keyboard.press(f"{MODIFIER}+End")
+            text_length = len(await editor.inner_text())
+            await paste_text(page, url_text, headless)
+            await wait_for_text_growth(editor, text_length, 5000)
             print("   ✅ 完了", flush=True)
 
             # Step 7: スケジュール設定画面を開く（時計アイコン）
@@ -343,29 +441,22 @@ async def post_to_linkedin(content_no_url: str, url_text: str, images: list[str]
             # 時計アイコンボタンを探す
             schedule_btn = page.locator('button[aria-label="投稿のスケジュールを設定"]').first
             await schedule_btn.click()
-            await page.wait_for_timeout(2000)
+            date_input = page.locator('input[type="text"]').first
+            await wait_for_visible(date_input)
             print("   ✅ 完了", flush=True)
 
             # Step 8: 日付を設定（入力フィールドに直接入力）
             print(f"📅 Step 8/11: 日付を設定 ({schedule_time.strftime('%Y/%m/%d')})...", flush=True)
 
-            # 日付入力フィールドをクリックして選択
-            date_input = page.locator('input[type="text"]').first
-            await date_input.click()
-            await page.wait_for_timeout(500)
-
             # トリプルクリックで全選択
             await date_input.click(click_count=3)
-            await page.wait_for_timeout(300)
 
             # 日付を入力 (YYYY/M/D形式)
             date_str = f"{schedule_time.year}/{schedule_time.month}/{schedule_time.day}"
             await page.keyboard.type(date_str)
-            await page.wait_for_timeout(500)
 
             # Tabキーで時間フィールドへ移動
             await page.keyboard.press("Tab")
-            await page.wait_for_timeout(1000)
             print("   ✅ 完了", flush=True)
 
             # Step 9: 時間を設定
@@ -376,31 +467,32 @@ async def post_to_linkedin(content_no_url: str, url_text: str, images: list[str]
             time_str = schedule_time.strftime("%H:%M")
 
             # 全選択して上書き
-            await page.keyboard.press("Meta+a")
+            await page.keyboard.press(f"{MODIFIER}+a")
             await page.keyboard.type(time_str)
-            await page.wait_for_timeout(500)
             print("   ✅ 完了", flush=True)
 
             # Step 10: スケジュールダイアログの「次へ」をクリック
             print("✅ Step 10/12: スケジュールを確定...", flush=True)
             next_btn_schedule = page.locator('button:has-text("次へ")').last
+            await wait_for_button_enabled(next_btn_schedule)
             await next_btn_schedule.click()
-            await page.wait_for_timeout(3000)
             print("   ✅ 完了", flush=True)
 
             # Step 11: 「スケジュール」ボタンをクリック（最終確定）
             print("✅ Step 11/12: 「スケジュール」ボタンをクリック...", flush=True)
             schedule_final_btn = page.locator('button:has-text("スケジュール")').first
+            await wait_for_button_enabled(schedule_final_btn)
             await schedule_final_btn.click()
-            await page.wait_for_timeout(3000)
+            await wait_for_modal_closed(page, 15000)
             print("   ✅ 完了", flush=True)
 
             # Step 12: 最終確認のスクリーンショット
             print("📷 Step 12/12: スクリーンショット保存...", flush=True)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            screenshot_path = OUTPUT_DIR / f"linkedin_scheduled_{timestamp}.png"
+            screenshot_path = output_dir / f"linkedin_scheduled_{timestamp}.png"
             await page.screenshot(path=str(screenshot_path))
             print("   ✅ 完了", flush=True)
+            success = True
 
             print("\n" + "=" * 60)
             print("🎉 投稿予約完了！")
@@ -408,30 +500,27 @@ async def post_to_linkedin(content_no_url: str, url_text: str, images: list[str]
             print(f"📅 予約日時: {schedule_time.strftime('%Y年%m月%d日 %H:%M')}")
             print(f"📷 スクリーンショット: {screenshot_path.name}")
             print("=" * 60)
-            print("\n✅ 内容を確認してください")
-            print("   確認後、ブラウザを閉じてください...")
 
-            # ブラウザが閉じられるまで待機
-            try:
-                while len(context.pages) > 0:
-                    await asyncio.sleep(1)
-            except:
-                pass
+            if wait_for_close:
+                print("\n✅ 内容を確認してください")
+                print(f"   確認後、{'タブ' if session.attached else 'ブラウザ'}を閉じてください...")
+
+                # ブラウザ（デーモン接続時はタブ）が閉じられるまで待機
+                await session.wait_until_closed(page)
 
         except Exception as e:
             print(f"\n❌ エラー発生: {e}", flush=True)
-            error_screenshot = OUTPUT_DIR / f"linkedin_error_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+            error_screenshot = output_dir / f"linkedin_error_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
             await page.screenshot(path=str(error_screenshot))
             print(f"📷 エラースクリーンショット: {error_screenshot.name}", flush=True)
-            print("\n手動で操作を続けてください...")
-            print("完了後、ブラウザを閉じてください...")
-            try:
-                while len(context.pages) > 0:
-                    await asyncio.sleep(1)
-            except:
-                pass
+            if wait_for_close:
+                print("\n手動で操作を続けてください...")
+                print(f"完了後、{'タブ' if session.attached else 'ブラウザ'}を閉じてください...")
+                await session.wait_until_closed(page)
         finally:
-            await context.close()
+            await session.close()
+
+    return success
 
 
 def main():
@@ -440,6 +529,8 @@ def main():
     parser.add_argument("--folder", "-f", type=int, default=None, help="フォルダ番号（1から始まる）")
     parser.add_argument("--days", "-d", type=int, default=7, help="何日後に投稿予約（デフォルト: 7）")
     parser.add_argument("--auto", "-a", action="store_true", help="確認なしで自動実行")
+    parser.add_argument("--headless", action="store_true", help="ブラウザを表示せずに実行")
+    parser.add_argument("--no-daemon", action="store_true", help="ブラウザデーモンに接続せず、ブラウザを起動")
     args = parser.parse_args()
 
     print("=" * 60)
@@ -489,7 +580,12 @@ def main():
             return
 
     # 実行
-    asyncio.run(post_to_linkedin(content_no_url, url_text, images, schedule_days))
+    asyncio.run(post_to_linkedin(
+        content_no_url, url_text, images, schedule_days,
+        wait_for_close=not args.headless,
+        headless=args.headless,
+        use_daemon=not args.no_daemon
+    ))
 
 
 if __name__ == "__main__":
@@ -9,6 +9,8 @@ LinkedInとXにログインしてセッションを保存します。
 from playwright.sync_api import sync_playwright
 from pathlib import Path
 
+from browser_session import DEFAULT_VIEWPORT, STEALTH_ARGS, daemon_endpoint
+
 SCRIPT_DIR = Path(__file__).parent.resolve()
 BROWSER_DATA_DIR = SCRIPT_DIR / "browser-data-sns"
 
@@ -25,11 +27,26 @@ def main():
     print("=" * 50)
 
     with sync_playwright() as p:
-        ctx = p.chromium.launch_persistent_context(
-            str(BROWSER_DATA_DIR),
-            headless=False,
-            viewport={"width": 1280, "height": 900}
-        )
+        # browser_daemon.py が起動していれば、そのブラウザでログインする
+        browser = None
+        endpoint = daemon_endpoint(BROWSER_DATA_DIR)
+        if endpoint:
+            try:
+                browser = p.chromium.connect_over_cdp(endpoint, timeout=5000)
+                ctx = browser.contexts[0]
+                print(f"🔌 ブラウザデーモンに接続: {endpoint}")
+            except Exception as e:
+                print(f"⚠️ ブラウザデーモンに接続できません、ブラウザを起動します: {e}")
+                browser = None
+
+        if browser is None:
+            # 手動ログインのため常に画面を表示する（起動フラグはヘッドレス実行時と揃える）
+            ctx = p.chromium.launch_persistent_context(
+                str(BROWSER_DATA_DIR),
+                headless=False,
+                viewport=DEFAULT_VIEWPORT,
+                args=STEALTH_ARGS
+            )
 
         # LinkedInタブ
         page1 = ctx.new_page()
@@ -43,17 +60,32 @@ def main():
 
         print()
         print("✅ 両方のタブでログインしてください")
-        print("✅ 完了したらブラウザを閉じてください")
-        print()
+        if browser:
+            print("✅ 完了したら2つのタブを閉じてください（デーモンのブラウザは起動したままになります）")
+            print()
+
+            # 2つのタブが閉じられるまで待機
+            for page in (page1, page2):
+                try:
+                    if not page.is_closed():
+                        page.wait_for_event("close", timeout=0)
+                except:
+                    pass
+
+            # 接続を切るだけで、デーモンのブラウザは閉じない
+            browser.close()
+        else:
+            print("✅ 完了したらブラウザを閉じてください")
+            print()
 
-        # ブラウザが閉じられるまで待機
-        try:
-            while len(ctx.pages) > 0:
-                ctx.pages[0].wait_for_timeout(1000)
-        except:
-            pass
+            # ブラウザが閉じられるまで待機
+            try:
+                while len(ctx.pages) > 0:
+                    ctx.pages[0].wait_for_timeout(1000)
+            except:
+                pass
 
-        ctx.close()
+            ctx.close()
 
     print("=" * 50)
     print("✅ セッション保存完了！")
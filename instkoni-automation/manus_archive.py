@@ -0,0 +1,68 @@
+"""
+Manus 成果物ZIPの展開
+
+ダウンロードした成果物ZIPの各ファイルを出力フォルダへ直接書き出す（サブフォルダは展開しない）。
+絶対パスや .. を含むエントリ（zip-slip）は出力フォルダの外を指すため、展開せずに飛ばす。
+"""
+
+import io
+import shutil
+import zipfile
+from pathlib import Path, PurePosixPath, PureWindowsPath
+from typing import Optional
+
+
+# このサイズ以下の成果物ZIPはメモリ上で展開する
+ZIP_IN_MEMORY_MAX_BYTES = 16 * 1024 * 1024
+
+
+def _decode_name(info: zipfile.ZipInfo) -> str:
+    """ZIPエントリのパス（UTF-8フラグのない日本語名を復元）"""
+    name = info.filename
+    if not info.flag_bits & 0x800:
+        try:
+            name = name.encode("cp437").decode("utf-8")
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            pass
+    return name
+
+
+def _is_unsafe(name: str) -> bool:
+    """絶対パス・ドライブ指定・.. を含むエントリか（/ と \\ の両方を区切りとして扱う）"""
+    windows = PureWindowsPath(name)
+    if PurePosixPath(name).is_absolute() or windows.drive or windows.root:
+        return True
+    return ".." in windows.parts
+
+
+def _member_name(info: zipfile.ZipInfo) -> Optional[str]:
+    """書き出すファイル名（安全でないエントリは None）"""
+    name = _decode_name(info)
+    if _is_unsafe(name):
+        return None
+    return PureWindowsPath(name).name
+
+
+def extract_zip(zip_path: Path, output_folder: Path) -> list[Path]:
+    """ZIPの各ファイルを出力フォルダへ直接書き出す
+
+    小さいアーカイブはメモリに読み込んでから展開する。
+    """
+    source = io.BytesIO(zip_path.read_bytes()) if zip_path.stat().st_size <= ZIP_IN_MEMORY_MAX_BYTES else zip_path
+
+    extracted = []
+    with zipfile.ZipFile(source) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            name = _member_name(info)
+            if name is None:
+                print(f"   ⚠️ 出力フォルダ外を指すZIPエントリを無視: {_decode_name(info)}")
+                continue
+            if not name:
+                continue
+            dest = output_folder / name
+            with archive.open(info) as src, open(dest, "wb") as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            extracted.append(dest)
+    return extracted
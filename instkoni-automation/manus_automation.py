@@ -7,17 +7,32 @@ Antigravityで生成されたNote記事の下書きを、ManusAIを活用して
 """
 
 import asyncio
+import functools
 import os
 import sys
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from dotenv import load_dotenv
-from playwright.async_api import async_playwright, Page, BrowserContext
+from playwright.async_api import async_playwright, Page, BrowserContext, Download
 import aiofiles
 
+from browser_session import open_session
+from manus_archive import extract_zip
+from manus_queue import DONE, RUNNING, ManusQueueState, submission_hash
+from resource_blocker import DEFAULT_RULES, ResourceBlocker, rules_from_section
+from dom_watch import DomChangeWatcher
+from screenshots import ScreenshotRecorder
+from wait_strategies import (
+    wait_for_any_visible,
+    wait_for_button_enabled,
+    wait_for_hidden,
+    wait_for_network_idle,
+    wait_for_visible,
+)
+
 # 環境変数の読み込み
 load_dotenv()
 
@@ -37,6 +52,34 @@ MANUS_URL = "https://manus.im/app"
 # デバッグモード
 DEBUG_MODE = "--debug" in sys.argv
 
+# ヘッドレス実行（デバッグモードは手動操作のため常に画面を表示）
+HEADLESS = os.getenv("HEADLESS", "false").lower() in ("1", "true", "yes") and not DEBUG_MODE
+BROWSER_CHANNEL = os.getenv("BROWSER_CHANNEL", "")
+
+# browser_daemon.py --profile manus が起動していれば接続して使う
+USE_BROWSER_DAEMON = os.getenv("USE_BROWSER_DAEMON", "true").lower() in ("1", "true", "yes") and not DEBUG_MODE
+
+# キュー処理（--queue）: 同時に処理するタスク数と状態ファイル
+QUEUE_PARALLEL = int(os.getenv("QUEUE_PARALLEL", "2"))
+QUEUE_STATE_FILE = Path(os.getenv("QUEUE_STATE_FILE", SCRIPT_DIR / "manus_queue_state.json"))
+
+# スクリーンショット（撮影方針: off / on-error / all、形式: png / jpeg）
+SCREENSHOTS = ScreenshotRecorder(
+    os.getenv("SCREENSHOT_POLICY", "on-error"),
+    os.getenv("SCREENSHOT_FORMAT", "jpeg"),
+    int(os.getenv("SCREENSHOT_QUALITY", "70"))
+)
+
+# 動画・フォント・広告・解析の読み込みを中止（BLOCK_TYPES / BLOCK_DENY / BLOCK_ALLOW はカンマ区切り）
+BLOCKER = ResourceBlocker(
+    rules_from_section({
+        "manus_types": os.getenv("BLOCK_TYPES", ",".join(sorted(DEFAULT_RULES["manus"].resource_types))),
+        "manus_deny": os.getenv("BLOCK_DENY", ""),
+        "manus_allow": os.getenv("BLOCK_ALLOW", ""),
+    }),
+    enabled=os.getenv("BLOCK_RESOURCES", "true").lower() in ("1", "true", "yes")
+)
+
 # --- マスタープロンプト（ファイルアップロード後のダイアログ用） --- #
 MASTER_PROMPT_TEMPLATE = """上記のMarkdownファイルを以下の指示に従って処理してください。
 
@@ -58,6 +101,40 @@ MASTER_PROMPT_TEMPLATE = """上記のMarkdownファイルを以下の指示に
 # 一時ファイル保存用ディレクトリ
 TEMP_DIR = SCRIPT_DIR / "temp"
 
+# 処理完了待ちの確認間隔（秒）。DOMに変化がない間は POLL_BACKOFF 倍ずつ延ばす
+POLL_MIN_SECONDS = 10
+POLL_MAX_SECONDS = 120
+POLL_BACKOFF = 2
+
+# タスク完了・ダイアログ・返信待ちの表示状態を返すスクリプト
+TASK_PROBE_JS = '''
+() => {
+    const text = document.body ? document.body.innerText : '';
+    const visible = (el) => el.offsetParent !== null;
+    const declineTexts = ['いいえ', 'デフォルトのブラウザを使用する', 'No', 'Cancel'];
+    const dialog = Array.from(
+        document.querySelectorAll('[role="dialog"], [class*="dialog"], [class*="modal"]')
+    ).some(visible);
+    const decline = Array.from(document.querySelectorAll('button')).some(
+        (btn) => visible(btn) && declineTexts.includes(btn.innerText.trim())
+    );
+    return {
+        completed: text.includes('タスクが完了しました'),
+        dialog: dialog || decline,
+        waitingCount: (text.match(/返信後に作業を続けます|ユーザーを待っています/g) || []).length,
+    };
+}
+'''
+
+# 成果物のファイル一覧パネルを開くボタン（優先順）とパネルの見出し
+SHOW_FILES_SELECTORS = ['text="このタスク内のすべてのファイルを表示"', 'button:has-text("ファイルを表示")']
+FILE_PANEL_HEADER_SELECTOR = 'text="このタスク内のすべてのファイル"'
+
+
+def screenshot_path(draft_file: Path, name: str) -> Path:
+    """下書きごとのスクリーンショットのパス（並列処理で他の下書きの撮影を上書きしないよう、下書き名を付ける）"""
+    return OUTPUT_DIR / f"{name}_{draft_file.stem}.png"
+
 
 def get_timestamp() -> str:
     """YYYYMMDD形式のタイムスタンプを生成"""
@@ -154,15 +231,25 @@ async def get_selected_draft() -> Optional[tuple[Path, str]]:
     return (selected, content)
 
 
+# 記事分析ファイルの内容（(更新日時, サイズ) が変わるまで再読み込みしない）
+_analysis_cache: dict[tuple[int, int], str] = {}
+
+
 async def get_article_analysis() -> str:
-    """記事分析ファイルを読み込む"""
+    """記事分析ファイルを読み込む（内容はファイルが更新されるまでキャッシュ）"""
     if not ANALYSIS_FILE.exists():
         print(f"⚠️ 分析ファイルが存在しません: {ANALYSIS_FILE}")
         return "(分析ファイルなし)"
 
-    return await read_file_async(ANALYSIS_FILE)
+    stat = ANALYSIS_FILE.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    if key not in _analysis_cache:
+        _analysis_cache.clear()
+        _analysis_cache[key] = await read_file_async(ANALYSIS_FILE)
+    return _analysis_cache[key]
 
 
+@functools.lru_cache(maxsize=8)
 def generate_prompt(article_analysis: str) -> str:
     """マスタープロンプトに動的情報を挿入する（記事本文は添付ファイルで送信）"""
     return MASTER_PROMPT_TEMPLATE.format(
@@ -171,97 +258,138 @@ def generate_prompt(article_analysis: str) -> str:
 
 
 async def prepare_draft_file(draft_path: Path, draft_content: str) -> Path:
-    """下書きを一時ファイルとして保存（アップロード用）"""
+    """下書きを一時ファイルとして保存（アップロード用。同じ内容が保存済みなら書き込まない）"""
     TEMP_DIR.mkdir(parents=True, exist_ok=True)
     temp_file = TEMP_DIR / draft_path.name
+    if temp_file.exists() and temp_file.stat().st_size == len(draft_content.encode('utf-8')):
+        if await read_file_async(temp_file) == draft_content:
+            return temp_file
     await write_file_async(temp_file, draft_content)
     return temp_file
 
 
-async def wait_for_processing_complete(page: Page, timeout_minutes: int = 30) -> bool:
-    """ManusAIの処理完了を待機"""
-    print(f"⏳ ManusAIの処理を待機中（最大{timeout_minutes}分）...")
+async def build_submission(draft_path: Path, draft_content: str) -> tuple[str, Path, str]:
+    """送信内容を準備
 
-    timeout_ms = timeout_minutes * 60 * 1000
-    check_interval = 10000  # 10秒ごとにチェック
-    min_wait_time = 60  # 最低60秒は待機（早期完了判定を防ぐ）
-    start_time = asyncio.get_event_loop().time()
+    Returns:
+        (プロンプト, アップロード用ファイル, 送信内容のハッシュ)
+    """
+    prompt = generate_prompt(await get_article_analysis())
+    draft_file = await prepare_draft_file(draft_path, draft_content)
+    return prompt, draft_file, submission_hash(prompt, draft_content)
 
-    while (asyncio.get_event_loop().time() - start_time) * 1000 < timeout_ms:
-        elapsed = int(asyncio.get_event_loop().time() - start_time)
 
-        # ========== ブラウザコネクタ等のダイアログに自動応答 ==========
-        try:
-            # 「いいえ、デフォルトのブラウザを使用する」ボタンを探す
-            decline_selectors = [
-                'button:has-text("いいえ")',
-                'button:has-text("デフォルトのブラウザを使用する")',
-                'button:has-text("No")',
-                'button:has-text("Cancel")',
-            ]
-            for selector in decline_selectors:
-                btn = page.locator(selector).first
-                if await btn.is_visible():
-                    await btn.click()
-                    print(f"   🔘 ダイアログ応答: {selector}")
-                    await page.wait_for_timeout(1000)
-                    break
-        except:
-            pass
+async def dismiss_dialogs(page: Page) -> None:
+    """ブラウザコネクタ等のダイアログに「いいえ」で応答し、残ったダイアログを閉じる"""
+    try:
+        # 「いいえ、デフォルトのブラウザを使用する」ボタンを探す
+        decline_selectors = [
+            'button:has-text("いいえ")',
+            'button:has-text("デフォルトのブラウザを使用する")',
+            'button:has-text("No")',
+            'button:has-text("Cancel")',
+        ]
+        for selector in decline_selectors:
+            btn = page.locator(selector).first
+            if await btn.is_visible():
+                await btn.click()
+                print(f"   🔘 ダイアログ応答: {selector}")
+                await wait_for_hidden(btn, 3000)
+                break
+    except:
+        pass
 
-        # ========== コネクタダイアログを閉じる ==========
-        try:
-            # コネクタダイアログの×ボタンを探して閉じる
-            close_btn = page.locator('[class*="dialog"] button:has-text("×"), [class*="modal"] button[aria-label*="close"], button[aria-label*="閉じる"]').first
-            if await close_btn.is_visible():
-                await close_btn.click()
-                print("   ❌ ダイアログを閉じました")
-                await page.wait_for_timeout(1000)
-        except:
-            pass
+    try:
+        # コネクタダイアログの×ボタンを探して閉じる
+        close_btn = page.locator('[class*="dialog"] button:has-text("×"), [class*="modal"] button[aria-label*="close"], button[aria-label*="閉じる"]').first
+        if await close_btn.is_visible():
+            await close_btn.click()
+            print("   ❌ ダイアログを閉じました")
+            await wait_for_hidden(close_btn, 3000)
+    except:
+        pass
+
+
+async def reply_to_manus(page: Page) -> bool:
+    """ManusAIがユーザーの返信を待っている場合に自動返信"""
+    try:
+        # 入力欄を探して返信を送信
+        textarea = page.locator('textarea[placeholder*="メッセージ"], textarea').first
+        if not await wait_for_visible(textarea, 5000):
+            return False
+        await textarea.fill("はい、添付ファイルを確認して処理を続けてください。")
+
+        # 入力を受けて送信ボタンが有効になるまで待ってからクリック
+        send_btn = page.locator('button[type="submit"], button:has(svg)').last
+        if await wait_for_button_enabled(send_btn, 5000):
+            await send_btn.click()
+            print("   ✅ 自動返信を送信しました")
+            return True
+    except Exception as e:
+        print(f"   ⚠️ 自動返信エラー: {e}")
+    return False
 
-        # ========== 「ユーザーを待っています」状態を検出して自動返信 ==========
-        try:
-            # ManusAIがユーザーの返信を待っている場合
-            waiting_for_user = page.locator('text=/返信後に作業を続けます|ユーザーを待っています/')
-            if await waiting_for_user.count() > 0:
-                print("   🔔 ManusAIがユーザーの返信を待っています")
 
-                # 入力欄を探して返信を送信
-                textarea = page.locator('textarea[placeholder*="メッセージ"], textarea').first
-                if await textarea.is_visible():
-                    await textarea.fill("はい、添付ファイルを確認して処理を続けてください。")
-                    await page.wait_for_timeout(500)
-
-                    # 送信ボタンをクリック
-                    send_btn = page.locator('button[type="submit"], button:has(svg)').last
-                    if await send_btn.is_visible():
-                        await send_btn.click()
-                        print("   ✅ 自動返信を送信しました")
-                        await page.wait_for_timeout(3000)
-        except Exception as e:
-            print(f"   ⚠️ 自動返信エラー: {e}")
+async def wait_for_processing_complete(page: Page, draft_file: Path, timeout_minutes: int = 30) -> bool:
+    """ManusAIの処理完了を待機
 
-        # ========== タスク完了の検出 ==========
-        try:
-            # 「タスクが完了しました」を検出
-            completed = await page.locator('text="タスクが完了しました"').count()
-            if completed > 0:
+    タスク完了・ダイアログ・返信待ちの表示をページ内のMutationObserverで監視し、
+    表示された時点で対応する。変化がない間は確認間隔を
+    POLL_MIN_SECONDS から POLL_MAX_SECONDS まで倍々に延ばし、その都度1回だけ状態を問い合わせる。
+    """
+    print(f"⏳ ManusAIの処理を待機中（最大{timeout_minutes}分）...")
+
+    loop = asyncio.get_running_loop()
+    timeout = timeout_minutes * 60
+    start_time = loop.time()
+    interval = POLL_MIN_SECONDS
+    # 自動返信済みの「返信待ち」表示の数（チャット履歴に残った表示に再返信しない）
+    replied_count = 0
+
+    watcher = DomChangeWatcher(page, TASK_PROBE_JS, throttle_ms=1000)
+    await watcher.start()
+
+    try:
+        while loop.time() - start_time < timeout:
+            remaining = timeout - (loop.time() - start_time)
+            changed = await watcher.wait_for_change(timeout=min(interval, remaining))
+            elapsed = int(loop.time() - start_time)
+
+            if changed:
+                interval = POLL_MIN_SECONDS
+                state = watcher.state or {}
+            else:
+                # 変化がない間は間隔を延ばし、Observerが外れた場合に備えて状態を直接確認する
+                interval = min(interval * POLL_BACKOFF, POLL_MAX_SECONDS)
+                try:
+                    state = await page.evaluate(TASK_PROBE_JS)
+                except Exception as e:
+                    print(f"   ⚠️ 検出エラー: {e}")
+                    continue
+                print(f"⏳ {elapsed}秒経過...（次の確認まで最大{interval}秒）")
+
+            # ========== タスク完了の検出 ==========
+            if state.get("completed"):
                 print(f"✅ タスク完了を検出（{elapsed}秒）")
-                await page.screenshot(path=str(OUTPUT_DIR / "debug_task_completed.png"))
+                SCREENSHOTS.capture(page, screenshot_path(draft_file, "debug_task_completed"))
                 return True
 
-            if elapsed % 30 == 0:  # 30秒ごとに状況を表示
-                print(f"   ⏳ タスク完了待機中...（{elapsed}秒経過）")
-        except Exception as e:
-            if elapsed % 60 == 0:
-                print(f"   ⚠️ 検出エラー: {e}")
+            # ========== ブラウザコネクタ等のダイアログに自動応答 ==========
+            if state.get("dialog"):
+                await dismiss_dialogs(page)
+
+            # ========== 「ユーザーを待っています」状態を検出して自動返信 ==========
+            waiting_count = state.get("waitingCount", 0)
+            if waiting_count > replied_count:
+                print("   🔔 ManusAIがユーザーの返信を待っています")
+                if await reply_to_manus(page):
+                    replied_count = waiting_count
 
-        print(f"⏳ {elapsed}秒経過...")
-        await page.wait_for_timeout(check_interval)
+        print("⚠️ タイムアウト")
+        return False
 
-    print("⚠️ タイムアウト")
-    return False
+    finally:
+        await watcher.stop()
 
 
 async def extract_outputs(page: Page, original_path: Path) -> dict[str, str]:
@@ -275,7 +403,7 @@ async def extract_outputs(page: Page, original_path: Path) -> dict[str, str]:
     }
 
     # スクリーンショットを保存
-    await page.screenshot(path=str(OUTPUT_DIR / "debug_05_before_download.png"))
+    SCREENSHOTS.capture(page, screenshot_path(original_path, "debug_05_before_download"))
 
     timestamp = get_timestamp()
     title = extract_title_from_filename(original_path.name)
@@ -289,42 +417,35 @@ async def extract_outputs(page: Page, original_path: Path) -> dict[str, str]:
 
     try:
         # ========== 一括ダウンロード方式 ==========
-        import zipfile
-        import shutil
-
         print("   🔍 「このタスク内のすべてのファイルを表示」を探しています...")
-        await page.wait_for_timeout(2000)
+        await wait_for_any_visible(page, SHOW_FILES_SELECTORS, 10000)
 
         # 「このタスク内のすべてのファイルを表示」ボタンを探してクリック
-        show_files_btn = page.locator('text="このタスク内のすべてのファイルを表示"')
+        show_files_btn = page.locator(SHOW_FILES_SELECTORS[0])
         if await show_files_btn.count() > 0 and await show_files_btn.first.is_visible():
             await show_files_btn.first.click()
             print("   ✅ ファイル一覧パネルを開きました")
-            await page.wait_for_timeout(2000)
+            await wait_for_visible(page.locator(FILE_PANEL_HEADER_SELECTOR).first, 10000)
         else:
             # 別のセレクタを試す
-            show_files_alt = page.locator('button:has-text("ファイルを表示")')
+            show_files_alt = page.locator(SHOW_FILES_SELECTORS[1])
             if await show_files_alt.count() > 0:
                 await show_files_alt.first.click()
                 print("   ✅ ファイル一覧パネルを開きました（代替セレクタ）")
-                await page.wait_for_timeout(2000)
+                await wait_for_visible(page.locator(FILE_PANEL_HEADER_SELECTOR).first, 10000)
             else:
                 print("   ⚠️ ファイル一覧ボタンが見つかりません")
 
-        await page.screenshot(path=str(output_folder / "debug_file_list_panel.png"))
+        SCREENSHOTS.capture(page, output_folder / "debug_file_list_panel.png")
 
         # 「一括ダウンロード」ボタンを探してクリック
         print("   🔍 「一括ダウンロード」ボタンを探しています...")
 
-        # ダウンロード前のZIPファイルを記録
-        downloads_dir = Path.home() / "Downloads"
-        before_download = set(downloads_dir.glob("*.zip"))
-
         download_btn = None
 
         try:
             # ヘッダーテキストの位置を取得
-            header_text = page.locator('text="このタスク内のすべてのファイル"')
+            header_text = page.locator(FILE_PANEL_HEADER_SELECTOR)
             if await header_text.count() > 0:
                 header_box = await header_text.first.bounding_box()
                 if header_box:
@@ -364,94 +485,44 @@ async def extract_outputs(page: Page, original_path: Path) -> dict[str, str]:
         except Exception as e:
             print(f"   ⚠️ ボタン検索エラー: {e}")
 
-        # ダウンロード実行
-        download_clicked = False
-        zip_path = None
-
+        # ダウンロード実行（Playwrightの一時ファイルから出力フォルダへ直接展開）
         if download_btn:
             try:
-                # ダウンロードイベントを待機してクリック
                 async with page.expect_download(timeout=120000) as download_info:
                     await download_btn.click()
                     print("   📥 一括ダウンロードをクリック")
 
                 download = await download_info.value
-                zip_filename = download.suggested_filename
-                zip_path = downloads_dir / zip_filename
-                await download.save_as(str(zip_path))
-                print(f"   ✅ ZIPダウンロード完了: {zip_filename}")
-                download_clicked = True
-            except Exception as e:
-                print(f"   ⚠️ ダウンロードイベントエラー: {e}")
-                # クリックはしたがイベントが取得できなかった場合
-                download_clicked = False
+                zip_path = await download_zip_path(download)
+                print(f"   ✅ ZIPダウンロード完了: {download.suggested_filename}")
 
-        # ダウンロードイベントで取得できなかった場合、ファイルシステムで検出
-        if not download_clicked and download_btn:
-            print("   🔄 ファイルシステムでZIPを検出中...")
-            try:
-                await download_btn.click()
-                print("   📥 一括ダウンロードを再クリック")
-            except:
-                pass
-
-            # ダウンロード完了を待つ（最大60秒）
-            print("   ⏳ ダウンロード完了を待機中...")
-            for wait_sec in range(60):
-                await page.wait_for_timeout(1000)
-                after_download = set(downloads_dir.glob("*.zip"))
-                new_zips = after_download - before_download
-                if new_zips:
-                    zip_path = list(new_zips)[0]
-                    print(f"   ✅ ZIPファイル検出: {zip_path.name}")
-                    download_clicked = True
-                    break
-                if wait_sec % 10 == 0:
-                    print(f"      {wait_sec}秒経過...")
-            else:
-                print("   ⚠️ ZIPファイルのダウンロードがタイムアウトしました")
-                zip_path = None
-
-        # ZIPファイルを解凍して出力フォルダに移動
-        if zip_path and zip_path.exists():
-            print(f"   📦 ZIPファイルを解凍中: {zip_path}")
-
-            # 一時解凍フォルダ
-            temp_extract_dir = downloads_dir / "manus_temp_extract"
-            if temp_extract_dir.exists():
-                shutil.rmtree(temp_extract_dir)
-            temp_extract_dir.mkdir()
-
-            # 解凍
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_extract_dir)
-
-            # 解凍されたファイルを出力フォルダに移動
-            for item in temp_extract_dir.rglob("*"):
-                if item.is_file():
-                    dest = output_folder / item.name
-                    shutil.move(str(item), str(dest))
+                print("   📦 ZIPファイルを展開中...")
+                loop = asyncio.get_running_loop()
+                extracted = await loop.run_in_executor(None, extract_zip, zip_path, output_folder)
+                for dest in extracted:
                     downloaded_files.append(dest)
-                    print(f"   ✅ 移動: {item.name}")
+                    print(f"   ✅ 保存: {dest.name}")
 
                     # ファイルの種類を判定してoutputsに登録
-                    if 'ファクトチェック' in item.name:
+                    if 'ファクトチェック' in dest.name:
                         outputs["fact_check"] = str(dest)
-                    elif '参考情報' in item.name or 'URL' in item.name:
+                    elif '参考情報' in dest.name or 'URL' in dest.name:
                         outputs["references"] = str(dest)
                     else:
                         outputs["revised_article"] = str(dest)
 
-            # クリーンアップ
-            shutil.rmtree(temp_extract_dir)
-            zip_path.unlink()  # ZIPファイルを削除
-            print(f"   🧹 一時ファイルをクリーンアップしました")
+                # Playwrightの一時ファイルを削除（デーモン接続時はブラウザ終了まで残るため）
+                await download.delete()
+                if zip_path.parent == TEMP_DIR:
+                    zip_path.unlink(missing_ok=True)
+            except Exception as e:
+                print(f"   ⚠️ ダウンロードエラー: {e}")
 
         print(f"   📊 ダウンロード完了: {len(downloaded_files)}ファイル")
 
     except Exception as e:
         print(f"⚠️ 出力抽出エラー: {e}")
-        await page.screenshot(path=str(OUTPUT_DIR / "error_extraction.png"))
+        await SCREENSHOTS.error(page, screenshot_path(original_path, "error_extraction"))
 
     # 出力フォルダとダウンロードファイル情報を記録
     outputs["output_folder"] = str(output_folder)
@@ -460,6 +531,23 @@ async def extract_outputs(page: Page, original_path: Path) -> dict[str, str]:
     return outputs
 
 
+async def download_zip_path(download: Download) -> Path:
+    """ダウンロード完了を待ち、ZIPファイルのパスを返す
+
+    通常はPlaywrightの一時ファイルをそのまま使う。一時ファイルを参照できない場合のみ TEMP_DIR に保存する。
+    """
+    try:
+        path = await download.path()
+        if path:
+            return Path(path)
+    except Exception:
+        pass
+    TEMP_DIR.mkdir(parents=True, exist_ok=True)
+    zip_path = TEMP_DIR / download.suggested_filename
+    await download.save_as(str(zip_path))
+    return zip_path
+
+
 async def save_outputs(original_path: Path, outputs: dict[str, str]) -> None:
     """成果物をファイルに保存"""
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -482,225 +570,408 @@ async def save_outputs(original_path: Path, outputs: dict[str, str]) -> None:
             print(f"   ⚠️ {filename} (内容なし)")
 
 
-async def process_with_manus(context: BrowserContext, prompt: str, draft_file: Path) -> dict[str, str]:
-    """ManusAIで記事を処理（ファイルアップロード対応）"""
+async def process_with_manus(
+    context: BrowserContext,
+    prompt: str,
+    draft_file: Path,
+    task_url: Optional[str] = None,
+    on_submitted: Optional[Callable[[str], None]] = None
+) -> dict[str, str]:
+    """ManusAIで記事を処理（ファイルアップロード対応）
+
+    Args:
+        task_url: 送信済みタスクのURL。指定した場合は送信せずにタスクを開いて完了を待つ
+        on_submitted: 送信後にタスクのURLを受け取るコールバック（キュー処理の状態記録用）
+    """
     page = await context.new_page()
+    await BLOCKER.attach(page, "manus")
+
+    try:
+        if task_url:
+            print(f"🔁 送信済みのタスクを再開: {task_url}")
+            await page.goto(task_url, wait_until="domcontentloaded", timeout=60000)
+        else:
+            if not await submit_to_manus(page, prompt, draft_file):
+                return {}
+            if on_submitted:
+                on_submitted(await wait_for_task_url(page))
+
+        # 処理完了を待機
+        success = await wait_for_processing_complete(page, draft_file)
+
+        if not success:
+            print("⚠️ 処理がタイムアウトしました")
+            await SCREENSHOTS.error(page, screenshot_path(draft_file, "error_timeout"))
+
+        # 成果物を抽出（ファイルをダウンロード）
+        SCREENSHOTS.capture(page, screenshot_path(draft_file, "debug_04_completed"))
+        outputs = await extract_outputs(page, draft_file)
+
+        return outputs
+
+    except Exception as e:
+        print(f"❌ エラー: {e}")
+        await SCREENSHOTS.error(page, screenshot_path(draft_file, "error_exception"))
+        return {}
+    finally:
+        # ページを閉じる前に撮影を終える
+        await SCREENSHOTS.flush(page)
+        await page.close()
+
 
+async def wait_for_task_url(page: Page, timeout_ms: int = 15000) -> str:
+    """送信後、タスク画面のURLに切り替わるのを待って返す（切り替わらない場合は現在のURL）"""
     try:
-        print("📍 ManusAIにアクセス中...")
-        await page.goto(MANUS_URL, wait_until="networkidle", timeout=60000)
-        await page.wait_for_timeout(3000)
+        await page.wait_for_url(lambda url: url.rstrip("/") != MANUS_URL, timeout=timeout_ms)
+    except:
+        pass
+    return page.url
+
 
-        # スクリーンショット保存（デバッグ用）
-        await page.screenshot(path=str(OUTPUT_DIR / "debug_01_initial.png"))
+async def submit_to_manus(page: Page, prompt: str, draft_file: Path) -> bool:
+    """新しいタスクを開き、下書きをアップロードしてプロンプトを送信"""
+    print("📍 ManusAIにアクセス中...")
+    await page.goto(MANUS_URL, wait_until="networkidle", timeout=60000)
 
-        # ログイン状態を確認（必要に応じてログインフローを追加）
-        # 注意: セッション永続化により、2回目以降はログイン不要の想定
+    # スクリーンショット保存（デバッグ用）
+    SCREENSHOTS.capture(page, screenshot_path(draft_file, "debug_01_initial"))
 
-        # ========== 新しいタスクを開始（前回の入力をクリア） ==========
-        print("🆕 新しいタスクを開始...")
+    # ログイン状態を確認（必要に応じてログインフローを追加）
+    # 注意: セッション永続化により、2回目以降はログイン不要の想定
 
-        # 左サイドバーの「新しいタスク」ボタンを正確に探す
-        # 注意: コネクタやその他の要素をクリックしないよう、セレクタを厳密にする
-        new_task_clicked = False
+    # ========== 新しいタスクを開始（前回の入力をクリア） ==========
+    print("🆕 新しいタスクを開始...")
+
+    # 左サイドバーの「新しいタスク」ボタンを正確に探す
+    # 注意: コネクタやその他の要素をクリックしないよう、セレクタを厳密にする
+    new_task_clicked = False
+    try:
+        # 左サイドバー内の「新しいタスク」を探す（アイコン付きのボタン）
+        sidebar = page.locator('nav, [class*="sidebar"], [class*="menu"]').first
+        new_task_btn = sidebar.locator('text="新しいタスク"').first
+        if await new_task_btn.is_visible():
+            await new_task_btn.click()
+            new_task_clicked = True
+            print("   ✅ サイドバーの「新しいタスク」をクリック")
+    except:
+        pass
+
+    # フォールバック: ページ上部の「新しいタスク」リンクを探す
+    if not new_task_clicked:
         try:
-            # 左サイドバー内の「新しいタスク」を探す（アイコン付きのボタン）
-            sidebar = page.locator('nav, [class*="sidebar"], [class*="menu"]').first
-            new_task_btn = sidebar.locator('text="新しいタスク"').first
-            if await new_task_btn.is_visible():
-                await new_task_btn.click()
-                new_task_clicked = True
-                print("   ✅ サイドバーの「新しいタスク」をクリック")
+            # より限定的なセレクタを使用（divは除外）
+            new_task_selectors = [
+                'a:has-text("新しいタスク")',
+                'button:has-text("新しいタスク")',
+            ]
+            for selector in new_task_selectors:
+                btn = page.locator(selector).first
+                if await btn.is_visible():
+                    # コネクタ関連でないことを確認
+                    parent_text = await btn.locator('..').inner_text()
+                    if 'コネクタ' not in parent_text and 'connector' not in parent_text.lower():
+                        await btn.click()
+                        new_task_clicked = True
+                        print(f"   ✅ 新しいタスクをクリック: {selector}")
+                        break
         except:
             pass
 
-        # フォールバック: ページ上部の「新しいタスク」リンクを探す
-        if not new_task_clicked:
-            try:
-                # より限定的なセレクタを使用（divは除外）
-                new_task_selectors = [
-                    'a:has-text("新しいタスク")',
-                    'button:has-text("新しいタスク")',
-                ]
-                for selector in new_task_selectors:
-                    btn = page.locator(selector).first
-                    if await btn.is_visible():
-                        # コネクタ関連でないことを確認
-                        parent_text = await btn.locator('..').inner_text()
-                        if 'コネクタ' not in parent_text and 'connector' not in parent_text.lower():
-                            await btn.click()
-                            new_task_clicked = True
-                            print(f"   ✅ 新しいタスクをクリック: {selector}")
-                            break
-            except:
-                pass
-
-        if not new_task_clicked:
-            print("   ⚠️ 新しいタスクボタンが見つかりません（続行）")
-
-        await page.wait_for_timeout(2000)
-        await page.screenshot(path=str(OUTPUT_DIR / "debug_01b_new_task.png"))
-
-        # ========== ファイルアップロード ==========
-        print("📎 ファイルをアップロード...")
-        print(f"   📄 アップロードするファイル: {draft_file}")
-
-        file_uploaded = False
-
-        if DEBUG_MODE:
-            # 手動アップロードモード（デバッグ時）
-            print("\n" + "=" * 50)
-            print("📎 手動でファイルをアップロードしてください")
-            print("=" * 50)
-            print(f"   1. 入力欄の左下にある「+」ボタンをクリック")
-            print(f"   2. ファイルを選択: {draft_file}")
-            print(f"   3. または、上記ファイルをドラッグ&ドロップ")
-            print("=" * 50)
-            print("   完了したら、Playwright Inspectorで Resume をクリック")
-            print("=" * 50 + "\n")
-
-            await page.pause()  # 手動操作のため一時停止
-
-            await page.wait_for_timeout(2000)
-            await page.screenshot(path=str(OUTPUT_DIR / "debug_02_file_uploaded.png"))
-            print("   ✅ 手動アップロード完了を確認")
-            file_uploaded = True
-        else:
-            # 自動アップロード試行
-            try:
-                # input[type="file"]を探して使用
-                file_inputs = page.locator('input[type="file"]')
-                input_count = await file_inputs.count()
-                if input_count > 0:
-                    await file_inputs.first.set_input_files(str(draft_file))
-                    await page.wait_for_timeout(2000)
-                    file_uploaded = True
-                    print(f"   ✅ ファイルアップロード成功: {draft_file.name}")
-            except Exception as e:
-                print(f"   ⚠️ 自動アップロードエラー: {e}")
-
-            if not file_uploaded:
-                print("   ⚠️ ファイルアップロードできませんでした（プロンプトのみで続行）")
-
-        # ========== プロンプト入力 ==========
-        print("✍️ プロンプトを入力中...")
-
-        # ダイアログが表示されている場合、ダイアログ内のtextareaを探す
-        await page.wait_for_timeout(2000)
-
-        # ダイアログ内またはメインページのtextareaを探す
-        input_selectors = [
-            'textarea[placeholder*="処理"]',  # ファイルアップロード後のダイアログ
-            'textarea[placeholder*="Manus"]',
-            '[class*="dialog"] textarea',
-            '[class*="modal"] textarea',
-            'textarea',
-            '[contenteditable="true"]',
-            'input[type="text"]',
-        ]
+    if not new_task_clicked:
+        print("   ⚠️ 新しいタスクボタンが見つかりません（続行）")
+
+    # 新しいタスク画面の入力欄が表示されるまで待機
+    await wait_for_any_visible(page, ['textarea', '[contenteditable="true"]'], 10000)
+    SCREENSHOTS.capture(page, screenshot_path(draft_file, "debug_01b_new_task"))
+
+    # ========== ファイルアップロード ==========
+    print("📎 ファイルをアップロード...")
+    print(f"   📄 アップロードするファイル: {draft_file}")
+
+    file_uploaded = False
+
+    if DEBUG_MODE:
+        # 手動アップロードモード（デバッグ時）
+        print("\n" + "=" * 50)
+        print("📎 手動でファイルをアップロードしてください")
+        print("=" * 50)
+        print(f"   1. 入力欄の左下にある「+」ボタンをクリック")
+        print(f"   2. ファイルを選択: {draft_file}")
+        print(f"   3. または、上記ファイルをドラッグ&ドロップ")
+        print("=" * 50)
+        print("   完了したら、Playwright Inspectorで Resume をクリック")
+        print("=" * 50 + "\n")
+
+        await page.pause()  # 手動操作のため一時停止
+
+        SCREENSHOTS.capture(page, screenshot_path(draft_file, "debug_02_file_uploaded"))
+        print("   ✅ 手動アップロード完了を確認")
+        file_uploaded = True
+    else:
+        # 自動アップロード試行
+        try:
+            # input[type="file"]を探して使用
+            file_inputs = page.locator('input[type="file"]')
+            input_count = await file_inputs.count()
+            if input_count > 0:
+                await file_inputs.first.set_input_files(str(draft_file))
+                # アップロード通信が落ち着くまで待機
+                await wait_for_network_idle(page, 10000)
+                file_uploaded = True
+                print(f"   ✅ ファイルアップロード成功: {draft_file.name}")
+        except Exception as e:
+            print(f"   ⚠️ 自動アップロードエラー: {e}")
+
+        if not file_uploaded:
+            print("   ⚠️ ファイルアップロードできませんでした（プロンプトのみで続行）")
+
+    # ========== プロンプト入力 ==========
+    print("✍️ プロンプトを入力中...")
+
+    # ダイアログ内またはメインページのtextareaを探す
+    input_selectors = [
+        'textarea[placeholder*="処理"]',  # ファイルアップロード後のダイアログ
+        'textarea[placeholder*="Manus"]',
+        '[class*="dialog"] textarea',
+        '[class*="modal"] textarea',
+        'textarea',
+        '[contenteditable="true"]',
+        'input[type="text"]',
+    ]
 
-        input_element = None
-        for selector in input_selectors:
-            try:
-                elements = page.locator(selector)
-                count = await elements.count()
-                for i in range(count):
-                    element = elements.nth(i)
-                    if await element.is_visible():
-                        input_element = element
-                        placeholder = await element.get_attribute('placeholder') or ''
-                        print(f"   📝 入力欄を発見: {selector} (placeholder: {placeholder[:30]}...)")
-                        break
-                if input_element:
+    # ダイアログが表示されている場合、ダイアログ内のtextareaを探す
+    await wait_for_any_visible(page, input_selectors[:4], 3000)
+
+    input_element = None
+    for selector in input_selectors:
+        try:
+            elements = page.locator(selector)
+            count = await elements.count()
+            for i in range(count):
+                element = elements.nth(i)
+                if await element.is_visible():
+                    input_element = element
+                    placeholder = await element.get_attribute('placeholder') or ''
+                    print(f"   📝 入力欄を発見: {selector} (placeholder: {placeholder[:30]}...)")
                     break
-            except:
-                continue
+            if input_element:
+                break
+        except:
+            continue
 
-        if not input_element:
-            print("❌ 入力欄が見つかりません")
-            await page.screenshot(path=str(OUTPUT_DIR / "error_no_input.png"))
-            return {}
+    if not input_element:
+        print("❌ 入力欄が見つかりません")
+        await SCREENSHOTS.error(page, screenshot_path(draft_file, "error_no_input"))
+        return False
 
-        # プロンプトを入力（force=Trueでダイアログ上の要素もクリック可能に）
-        try:
-            await input_element.click(force=True)
-            await input_element.fill(prompt)
-        except Exception as e:
-            print(f"   ⚠️ 通常入力失敗、JavaScript経由で入力: {e}")
-            # JavaScriptで直接入力
-            await page.evaluate('''
-                (text) => {
-                    const textareas = document.querySelectorAll('textarea');
-                    for (const ta of textareas) {
-                        if (ta.offsetParent !== null) {  // visible
-                            ta.value = text;
-                            ta.dispatchEvent(new Event('input', { bubbles: true }));
-                            return true;
-                        }
+    # プロンプトを入力（force=Trueでダイアログ上の要素もクリック可能に）
+    try:
+        await input_element.click(force=True)
+        await input_element.fill(prompt)
+    except Exception as e:
+        print(f"   ⚠️ 通常入力失敗、JavaScript経由で入力: {e}")
+        # JavaScriptで直接入力
+        await page.evaluate('''
+            (text) => {
+                const textareas = document.querySelectorAll('textarea');
+                for (const ta of textareas) {
+                    if (ta.offsetParent !== null) {  // visible
+                        ta.value = text;
+                        ta.dispatchEvent(new Event('input', { bubbles: true }));
+                        return true;
                     }
-                    return false;
                 }
-            ''', prompt)
-
-        await page.wait_for_timeout(1000)
-
-        print(f"   📝 プロンプト入力完了（{len(prompt)}文字）")
-        await page.screenshot(path=str(OUTPUT_DIR / "debug_03_prompt_entered.png"))
-
-        # 送信ボタンを探してクリック
-        print("🚀 送信中...")
-        submit_selectors = [
-            'button[type="submit"]',
-            'button:has-text("Send")',
-            'button:has-text("送信")',
-            'button:has-text("Submit")',
-            '[class*="send"]',
-            '[class*="submit"]'
+                return false;
+            }
+        ''', prompt)
+
+    print(f"   📝 プロンプト入力完了（{len(prompt)}文字）")
+    SCREENSHOTS.capture(page, screenshot_path(draft_file, "debug_03_prompt_entered"))
+
+    # 送信ボタンを探してクリック
+    print("🚀 送信中...")
+    submit_selectors = [
+        'button[type="submit"]',
+        'button:has-text("Send")',
+        'button:has-text("送信")',
+        'button:has-text("Submit")',
+        '[class*="send"]',
+        '[class*="submit"]'
+    ]
+
+    submitted = False
+    for selector in submit_selectors:
+        try:
+            btn = page.locator(selector).first
+            if await btn.is_visible():
+                await btn.click()
+                submitted = True
+                print(f"   ✅ 送信ボタンをクリック: {selector}")
+                break
+        except:
+            continue
+
+    if not submitted:
+        # Enterキーで送信を試みる
+        await page.keyboard.press("Enter")
+        print("   ⌨️ Enterキーで送信")
+
+    SCREENSHOTS.capture(page, screenshot_path(draft_file, "debug_04_submitted"))
+    return True
+
+
+def list_queue_drafts(
+    pattern: str = "*.md",
+    since: Optional[datetime] = None,
+    manifest: Optional[Path] = None
+) -> list[Path]:
+    """キュー処理の対象となる下書きを取得
+
+    manifest を指定した場合はそのファイルに1行ずつ書かれたファイル名の順、
+    それ以外は pattern に一致する（since 以降に更新された）下書きを古い順に返す。
+    """
+    if manifest:
+        names = [
+            line.strip() for line in manifest.read_text(encoding='utf-8').splitlines()
+            if line.strip() and not line.strip().startswith("#")
         ]
+        drafts = []
+        for name in names:
+            path = INPUT_DIR / name
+            if path.is_file():
+                drafts.append(path)
+            else:
+                print(f"   ⚠️ 下書きが見つかりません: {name}")
+        return drafts
 
-        submitted = False
-        for selector in submit_selectors:
-            try:
-                btn = page.locator(selector).first
-                if await btn.is_visible():
-                    await btn.click()
-                    submitted = True
-                    print(f"   ✅ 送信ボタンをクリック: {selector}")
-                    break
-            except:
-                continue
+    if not INPUT_DIR.exists():
+        return []
+    drafts = [f for f in INPUT_DIR.glob(pattern) if f.is_file()]
+    if since:
+        drafts = [f for f in drafts if f.stat().st_mtime >= since.timestamp()]
+    drafts.sort(key=lambda f: f.stat().st_mtime)
+    return drafts
+
+
+def _record_unfinished(state: ManusQueueState, draft_path: Path, digest: str, error: str) -> None:
+    """未完了の下書きを記録（送信済みのタスクは次回そのタスクから再開する）"""
+    if state.interrupt(draft_path, digest, error):
+        print(f"   🔁 {draft_path.name}: 次回の実行で送信済みのタスクから再開します")
+
+
+async def process_draft(
+    context: BrowserContext,
+    draft_path: Path,
+    draft_content: str,
+    state: ManusQueueState,
+    semaphore: asyncio.Semaphore,
+    reuse_task: bool = True
+) -> bool:
+    """下書き1件を処理し、状態ファイルに結果を記録
+
+    同じ内容（プロンプト＋下書き本文）を送信済みのタスクがあれば、アップロード・送信せずにそのタスクを開く。
+
+    Args:
+        reuse_task: False の場合は送信済みのタスクがあっても新しいタスクを作成
+    """
+    async with semaphore:
+        prompt, draft_file, digest = await build_submission(draft_path, draft_content)
+        task_url = state.task_url(digest) if reuse_task else None
+        if task_url:
+            state.update(draft_path, digest, RUNNING, task_url=task_url)
+        else:
+            state.start(draft_path, digest)
 
-        if not submitted:
-            # Enterキーで送信を試みる
-            await page.keyboard.press("Enter")
-            print("   ⌨️ Enterキーで送信")
+        print(f"--- {draft_path.name} の処理を開始 ---")
+        try:
+            outputs = await process_with_manus(
+                context,
+                prompt,
+                draft_file,
+                task_url=task_url,
+                on_submitted=lambda url: state.update(draft_path, digest, RUNNING, task_url=url)
+            )
+        except Exception as e:
+            print(f"❌ {draft_path.name}: {e}")
+            _record_unfinished(state, draft_path, digest, str(e))
+            return False
+
+        if not outputs.get("downloaded_files"):
+            print(f"⚠️ {draft_path.name}: 成果物を取得できませんでした")
+            _record_unfinished(state, draft_path, digest, "成果物を取得できませんでした")
+            return False
+
+        print("📥 成果物を保存中...")
+        await save_outputs(draft_path, outputs)
+        state.update(draft_path, digest, DONE, output_folder=outputs["output_folder"], error=None)
+        print(f"--- {draft_path.name} の処理が完了 ---")
+        return True
+
+
+async def run_queue(
+    context: BrowserContext,
+    drafts: list[Path],
+    parallel: int,
+    retry_failed: bool = False
+) -> None:
+    """未処理の下書きを複数のタブで並列に処理
+
+    完了済みの下書きは飛ばし、中断された下書きは記録したタスクURLから再開する。
+    """
+    state = ManusQueueState(QUEUE_STATE_FILE)
+
+    queued = []
+    for draft_path in drafts:
+        draft_content = await read_file_async(draft_path)
+        digest = submission_hash(generate_prompt(await get_article_analysis()), draft_content)
+        if state.is_pending(draft_path, digest, retry_failed):
+            queued.append((draft_path, draft_content))
+        else:
+            print(f"   ⏭️ 処理済み: {draft_path.name}（{state.entry(draft_path).get('status')}）")
 
-        await page.wait_for_timeout(3000)
-        await page.screenshot(path=str(OUTPUT_DIR / "debug_04_submitted.png"))
+    if not queued:
+        print("📭 未処理の下書きはありません")
+        return
 
-        # 処理完了を待機
-        success = await wait_for_processing_complete(page)
+    print(f"📋 キュー: {len(queued)}件（同時に{parallel}件まで処理）")
+    print(f"📒 状態ファイル: {QUEUE_STATE_FILE}\n")
 
-        if not success:
-            print("⚠️ 処理がタイムアウトしました")
-            await page.screenshot(path=str(OUTPUT_DIR / "error_timeout.png"))
+    semaphore = asyncio.Semaphore(parallel)
+    results = await asyncio.gather(*(
+        process_draft(context, draft_path, draft_content, state, semaphore)
+        for draft_path, draft_content in queued
+    ))
 
-        # 成果物を抽出（ファイルをダウンロード）
-        await page.screenshot(path=str(OUTPUT_DIR / "debug_04_completed.png"))
-        outputs = await extract_outputs(page, draft_file)
+    print(f"\n📊 キュー処理結果: 成功 {sum(results)}件 / 失敗 {len(results) - sum(results)}件")
+    print(f"   状態の内訳: {state.summary()}")
 
-        return outputs
 
-    except Exception as e:
-        print(f"❌ エラー: {e}")
-        await page.screenshot(path=str(OUTPUT_DIR / "error_exception.png"))
-        return {}
-    finally:
-        await page.close()
+def get_option_value(option: str) -> Optional[str]:
+    """コマンドライン引数から `--option VALUE` / `--option=VALUE` の値を取得"""
+    for i, arg in enumerate(sys.argv):
+        if arg == option and i + 1 < len(sys.argv):
+            return sys.argv[i + 1]
+        if arg.startswith(f"{option}="):
+            return arg.split("=", 1)[1]
+    return None
 
 
 async def main():
-    """メイン処理"""
+    """メイン処理
+
+    --queue を指定すると、下書きを選択せずに未処理の下書きをすべて並列に処理する:
+        --glob PATTERN    対象の下書き（デフォルト: *.md）
+        --since YYYY-MM-DD  この日以降に更新された下書きのみ
+        --manifest FILE   ファイル名を1行ずつ書いたリストの下書きのみ（記載順に処理）
+        --parallel N      同時に処理するタスク数（デフォルト: QUEUE_PARALLEL）
+        --retry-failed    失敗した下書きも再処理
+
+    同じ内容の下書きを送信済みの場合は、そのタスクを開いて成果物を取得する（--new-task で新しいタスクを作成）。
+    """
+    queue_mode = "--queue" in sys.argv
+    # デバッグモードは手動操作を挟むため1件ずつ処理する
+    parallel = 1 if DEBUG_MODE else max(1, int(get_option_value("--parallel") or QUEUE_PARALLEL))
+
     print("=" * 50)
     print("🤖 ManusAI 自動校正・リライトツール")
     print("=" * 50)
@@ -708,11 +979,43 @@ async def main():
     print(f"📁 出力ディレクトリ: {OUTPUT_DIR}")
     print(f"📄 分析ファイル: {ANALYSIS_FILE}")
     print(f"🔧 デバッグモード: {'ON' if DEBUG_MODE else 'OFF'}")
+    print(f"🖥️ ヘッドレス: {'ON' if HEADLESS else 'OFF'}")
+    print(f"📷 スクリーンショット: {SCREENSHOTS.policy}")
+    if queue_mode:
+        print(f"📋 キュー処理: ON（同時{parallel}件）")
     print("=" * 50 + "\n")
 
     # 出力ディレクトリを作成
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+    if queue_mode:
+        since = get_option_value("--since")
+        manifest = get_option_value("--manifest")
+        drafts = list_queue_drafts(
+            pattern=get_option_value("--glob") or "*.md",
+            since=datetime.strptime(since, "%Y-%m-%d") if since else None,
+            manifest=Path(manifest) if manifest else None
+        )
+        if not drafts:
+            print("📭 下書きファイルが見つかりません")
+            return
+
+        await write_file_async(OUTPUT_DIR / "last_prompt.txt", generate_prompt(await get_article_analysis()))
+
+        print("🌐 ブラウザを起動中...")
+        async with async_playwright() as p:
+            session = await open_session(
+                p, USER_DATA_DIR, use_daemon=USE_BROWSER_DAEMON, headless=HEADLESS, channel=BROWSER_CHANNEL
+            )
+            try:
+                await run_queue(session.context, drafts, parallel, retry_failed="--retry-failed" in sys.argv)
+            finally:
+                print("\n🔒 ブラウザを閉じます...")
+                await session.close()
+
+        print("\n✅ 処理完了")
+        return
+
     # ユーザーに下書きを選択させる
     draft = await get_selected_draft()
     if not draft:
@@ -721,14 +1024,8 @@ async def main():
 
     draft_path, draft_content = draft
 
-    # 記事分析を取得
-    article_analysis = await get_article_analysis()
-
-    # プロンプトを生成（記事本文は添付ファイルで送信するため含めない）
-    prompt = generate_prompt(article_analysis)
-
-    # 下書きを一時ファイルとして保存（アップロード用）
-    draft_file = await prepare_draft_file(draft_path, draft_content)
+    # プロンプトを生成（記事本文は添付ファイルで送信するため含めない）し、下書きを一時ファイルとして保存（アップロード用）
+    prompt, draft_file, _ = await build_submission(draft_path, draft_content)
     print(f"📎 アップロード用ファイル: {draft_file}")
 
     # プロンプトを保存（確認用）
@@ -740,30 +1037,21 @@ async def main():
     # ブラウザを起動（セッション永続化）
     print("🌐 ブラウザを起動中...")
     async with async_playwright() as p:
-        context = await p.chromium.launch_persistent_context(
-            str(USER_DATA_DIR),
-            headless=False,
-            viewport={"width": 1280, "height": 900},
-            args=['--disable-blink-features=AutomationControlled']
+        session = await open_session(
+            p, USER_DATA_DIR, use_daemon=USE_BROWSER_DAEMON, headless=HEADLESS, channel=BROWSER_CHANNEL
         )
+        state = ManusQueueState(QUEUE_STATE_FILE)
 
         try:
-            print(f"--- {draft_path.name} の処理を開始 ---\n")
-
-            outputs = await process_with_manus(context, prompt, draft_file)
-
-            if outputs:
-                print("\n📥 成果物を保存中...")
-                await save_outputs(draft_path, outputs)
-                print(f"\n--- {draft_path.name} の処理が完了 ---")
-            else:
-                print("⚠️ 成果物を取得できませんでした")
-
+            await process_draft(
+                session.context, draft_path, draft_content, state, asyncio.Semaphore(1),
+                reuse_task="--new-task" not in sys.argv
+            )
         except Exception as e:
             print(f"❌ エラーが発生しました: {e}")
         finally:
             print("\n🔒 ブラウザを閉じます...")
-            await context.close()
+            await session.close()
 
     print("\n✅ 処理完了")
 
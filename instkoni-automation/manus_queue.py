@@ -0,0 +1,122 @@
+"""
+Manus キュー処理の状態ファイル
+
+manus_automation.py で処理する下書きごとに、状態（pending / running / done / failed）、
+送信したタスクのURL、出力フォルダを JSON ファイルに記録する。
+記録は送信内容のハッシュ（プロンプト＋下書き本文）と対応付け、内容が変わった下書きは再処理する。
+
+--queue で中断後に再実行すると、完了済みの下書きは飛ばし、送信済み（running）の下書きは
+記録したタスクURLを開いて完了待ちから再開する。同じ内容を送信済みのタスクがあれば、
+ファイル名が違っても新しいタスクを作らず（アップロードせず）そのタスクを開く。
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from article_state import content_hash
+
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def submission_hash(prompt: str, draft_content: str) -> str:
+    """Manusに送信する内容（プロンプト＋下書き本文）のハッシュ"""
+    return content_hash(prompt + "\0" + draft_content)
+
+
+class ManusQueueState:
+    """下書きごとの処理状態
+
+    Args:
+        path: 状態ファイル（JSON）のパス
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._drafts: dict[str, dict] = self._load()
+
+    def entry(self, draft_path: Path) -> dict:
+        """下書きの記録（未記録の場合は空）"""
+        return self._drafts.get(draft_path.name, {})
+
+    def is_changed(self, draft_path: Path, digest: str) -> bool:
+        """記録時から送信内容が変わったか"""
+        return self.entry(draft_path).get("hash") != digest
+
+    def is_pending(self, draft_path: Path, digest: str, retry_failed: bool = False) -> bool:
+        """処理が必要か（未処理・内容が変更された・中断された下書き）"""
+        if self.is_changed(draft_path, digest):
+            return True
+        status = self.entry(draft_path).get("status")
+        if status == FAILED:
+            return retry_failed
+        return status != DONE
+
+    def task_url(self, digest: str) -> Optional[str]:
+        """同じ内容を送信済みのタスクのURL（失敗したタスクは除く）"""
+        for entry in self._drafts.values():
+            if entry.get("hash") == digest and entry.get("task_url") and entry.get("status") in (RUNNING, DONE):
+                return entry["task_url"]
+        return None
+
+    def start(self, draft_path: Path, digest: str) -> None:
+        """下書きの送信開始を記録（前回のタスクURLは破棄）"""
+        attempts = 0 if self.is_changed(draft_path, digest) else self.entry(draft_path).get("attempts", 0)
+        self.update(draft_path, digest, RUNNING, task_url=None, attempts=attempts + 1)
+
+    def update(self, draft_path: Path, digest: str, status: str, **fields) -> None:
+        """下書きの状態を更新してファイルに保存"""
+        # 内容が変わった下書きは前回のタスクURL・出力を引き継がない
+        entry = {} if self.is_changed(draft_path, digest) else dict(self.entry(draft_path))
+        entry.update(fields)
+        entry["hash"] = digest
+        entry["status"] = status
+        entry["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        self._drafts[draft_path.name] = entry
+        self._save()
+
+    def interrupt(self, draft_path: Path, digest: str, error: str) -> bool:
+        """完了待ちのタイムアウトや成果物の取得失敗を記録
+
+        タスクを送信済みの場合は Manus 側で処理が続いているため、RUNNING のままタスクURLを残し、
+        次回の実行でそのタスクを開いて再開する。送信前に失敗した場合は FAILED にする。
+
+        Returns:
+            bool: 次回の実行で送信済みのタスクから再開できる場合 True
+        """
+        resumable = not self.is_changed(draft_path, digest) and bool(self.entry(draft_path).get("task_url"))
+        self.update(draft_path, digest, RUNNING if resumable else FAILED, error=error)
+        return resumable
+
+    def summary(self) -> dict[str, int]:
+        """状態ごとの件数"""
+        counts: dict[str, int] = {}
+        for entry in self._drafts.values():
+            status = entry.get("status", PENDING)
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            drafts = data.get("drafts", {}) if isinstance(data, dict) else {}
+            return drafts if isinstance(drafts, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self) -> None:
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"drafts": self._drafts}, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"   ⚠️ キュー状態の保存エラー: {e}")
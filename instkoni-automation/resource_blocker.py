@@ -0,0 +1,118 @@
+"""
+リソースブロック
+
+自動操作するページ（Genspark / LinkedIn / X / Manus）で、操作に不要な画像・動画・フォントや
+広告・解析ビーコンの読み込みを page.route で中止する。
+サイトごとにブロックするリソースの種類と、拒否・許可するURL（部分一致）を設定できる。
+許可リストに一致したURLはブロックしない。
+
+LinkedIn / X では添付画像のアップロードとプレビュー表示を待つため、既定では画像・動画をブロックしない。
+page.route を設定したページではHTTPキャッシュが使われなくなるため、
+キャッシュの効くサイトで遅くなる場合は [BLOCKING] enabled = false で無効化できる。
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from playwright.async_api import Page, Route
+
+
+# 全サイト共通で拒否する広告・解析のURL
+COMMON_DENY = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "segment.io",
+    "cdn.mxpnl.com",
+)
+
+
+@dataclass(frozen=True)
+class BlockRule:
+    """1サイト分のブロック設定"""
+    resource_types: frozenset[str] = frozenset()
+    deny: tuple[str, ...] = ()
+    allow: tuple[str, ...] = ()
+
+    def blocks(self, url: str, resource_type: str) -> bool:
+        """このリクエストを中止するか"""
+        if any(pattern in url for pattern in self.allow):
+            return False
+        return resource_type in self.resource_types or any(pattern in url for pattern in self.deny)
+
+
+DEFAULT_RULES = {
+    "genspark": BlockRule(frozenset({"image", "media", "font"}), COMMON_DENY),
+    # 投稿サイトは添付画像のプレビュー表示を待つため、画像・動画は既定ではブロックしない
+    "linkedin": BlockRule(
+        frozenset({"font"}),
+        COMMON_DENY + ("px.ads.linkedin.com", "snap.licdn.com", "/li/track", "/tscp-serving/"),
+    ),
+    "x": BlockRule(
+        frozenset({"font"}),
+        COMMON_DENY + ("ads-api.x.com", "ads-twitter.com", "analytics.twitter.com", "/jot/"),
+    ),
+    "manus": BlockRule(frozenset({"media", "font"}), COMMON_DENY),
+}
+
+
+def _split(value: str) -> tuple[str, ...]:
+    return tuple(item.strip() for item in value.split(",") if item.strip())
+
+
+def rules_from_section(section: Mapping[str, str]) -> dict[str, BlockRule]:
+    """設定ファイルの [BLOCKING] セクションから各サイトの設定を作成
+
+    <site>_types は既定値を置き換え、deny / allow（全サイト共通）と
+    <site>_deny / <site>_allow は既定値に追加する。
+    """
+    common_deny = _split(section.get("deny", ""))
+    common_allow = _split(section.get("allow", ""))
+
+    rules = {}
+    for site, rule in DEFAULT_RULES.items():
+        types = section.get(f"{site}_types")
+        rules[site] = replace(
+            rule,
+            resource_types=frozenset(_split(types)) if types is not None else rule.resource_types,
+            deny=rule.deny + common_deny + _split(section.get(f"{site}_deny", "")),
+            allow=rule.allow + common_allow + _split(section.get(f"{site}_allow", "")),
+        )
+    return rules
+
+
+class ResourceBlocker:
+    """ページごとにリクエストを振り分ける
+
+    Args:
+        rules: サイト名 → ブロック設定（省略時は DEFAULT_RULES）
+        enabled: False の場合は何もしない
+    """
+
+    def __init__(self, rules: Optional[dict[str, BlockRule]] = None, enabled: bool = True):
+        self.rules = rules if rules is not None else dict(DEFAULT_RULES)
+        self.enabled = enabled
+        # サイトごとの中止したリクエスト数
+        self.blocked: dict[str, int] = {}
+
+    async def attach(self, page: Page, site: str) -> None:
+        """ページにサイトのブロック設定を適用"""
+        rule = self.rules.get(site)
+        if not self.enabled or rule is None:
+            return
+
+        async def handle(route: Route) -> None:
+            request = route.request
+            if rule.blocks(request.url, request.resource_type):
+                self.blocked[site] = self.blocked.get(site, 0) + 1
+                await route.abort("blockedbyclient")
+            else:
+                await route.fallback()
+
+        await page.route("**/*", handle)
@@ -0,0 +1,56 @@
+"""
+Gensparkレスポンスキャッシュ
+
+送信するプロンプト全体（テンプレート + 記事本文 + 画像リスト）のハッシュをキーに
+raw_response.txt を保存し、同じ記事を再実行したときはGensparkへの再送信を省略する。
+"""
+
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class ResponseCache:
+    """プロンプトのハッシュをキーにしたレスポンスキャッシュ
+
+    Args:
+        cache_dir: キャッシュの保存先ディレクトリ
+        ttl_hours: 有効期間（時間）。0 以下の場合は期限なし
+    """
+
+    RESPONSE_FILENAME = "raw_response.txt"
+
+    def __init__(self, cache_dir: Path, ttl_hours: int):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_hours * 3600
+
+    @staticmethod
+    def key(prompt: str) -> str:
+        """キャッシュキー（プロンプトのSHA-256）"""
+        return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+    def get(self, prompt: str) -> Optional[str]:
+        """有効期限内のキャッシュがあればレスポンスを返す"""
+        path = self._path(self.key(prompt))
+        try:
+            if self.ttl_seconds > 0 and time.time() - path.stat().st_mtime > self.ttl_seconds:
+                return None
+            return path.read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+    def put(self, prompt: str, response: str) -> None:
+        """レスポンスを保存"""
+        path = self._path(self.key(prompt))
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(response, encoding='utf-8')
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"   ⚠️ レスポンスキャッシュ保存エラー: {e}")
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key / self.RESPONSE_FILENAME
@@ -0,0 +1,383 @@
+"""
+Gensparkレスポンスパーサー
+
+レスポンス全体を1回だけ走査してマーカー（--LINKEDIN_START-- など）の位置を記録し、
+各セクションをマーカー間のスライスとして取り出す。
+ストリーミング中のレスポンスを feed() で少しずつ渡すこともできる。
+
+旧実装（正規表現を複数回適用する方式）と同じ (linkedin_content, x_format, x_posts) を返す。
+互換性は regression/parse_corpus.json で確認する:
+
+    python response_parser.py
+
+パース結果は RewriteResult として rewrite_result.json に保存し、
+SNS投稿や linkedin_poster.py はテキストを再解析せずにこれを読み込む。
+"""
+
+import json
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import ClassVar, Optional
+
+
+# --- マーカー --- #
+LINKEDIN_START = '--LINKEDIN_START--'
+LINKEDIN_END = '--LINKEDIN_END--'
+LINKEDIN_LEGACY = '=== LINKEDIN ==='
+X_THREAD_LEGACY = '=== X_THREAD ==='
+X_START = '--X_START--'
+X_END = '--X_END--'
+X_FORMAT_START = '--X_FORMAT--'
+X_FORMAT_END = '--X_FORMAT_END--'
+NOTION_TRAILER = 'Notionに保存'
+CLAUDE_TRAILER = 'Claude'
+
+_MARKERS = [
+    LINKEDIN_START, LINKEDIN_END, LINKEDIN_LEGACY, X_THREAD_LEGACY,
+    X_START, X_END, X_FORMAT_START, X_FORMAT_END, NOTION_TRAILER, CLAUDE_TRAILER,
+]
+_MAX_MARKER_LEN = max(len(m) for m in _MARKERS)
+
+# LinkedIn投稿の書き出しに使われる絵文字（マーカーがない場合のフォールバック用）
+_LEAD_EMOJI = '🚀📌✅🔗💡🎯'
+
+# 先読みで重なり合うマーカーも漏らさず検出する（どのマーカーも他のマーカーの接頭辞ではない）
+_TOKEN_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(m) for m in _MARKERS) + '|[' + _LEAD_EMOJI + ']))'
+)
+
+# テンプレートのプレースホルダー
+_LINKEDIN_PLACEHOLDER = '(ここにLinkedIn投稿文を生成)'
+_X_PLACEHOLDERS = ('(単一ポストの場合', '(ここにX投稿文を生成)')
+
+# 絵文字フォールバックで、見出し行の後に最低限必要な文字数
+_EMOJI_MIN_BODY = 200
+
+
+class _SectionScanner:
+    """開始マーカーから終了マーカーまでの区間を順に切り出す
+
+    re.finditer(r'OPEN\\s*(.*?)\\s*(?:CLOSE|$)', ..., re.DOTALL) と同じ区間になるよう、
+    終了マーカーまで消費した位置より前のマーカーは無視する。
+    """
+
+    def __init__(self, openers: tuple[str, ...], closers: tuple[str, ...], close_at_end: bool):
+        self.openers = openers
+        self.closers = closers
+        self.close_at_end = close_at_end
+        self.last: Optional[tuple[int, int]] = None
+        self._consumed = 0
+        self._open_at: Optional[int] = None
+
+    def on_token(self, marker: str, start: int, end: int) -> None:
+        if start < self._consumed:
+            return
+        if self._open_at is None:
+            if marker in self.openers:
+                self._open_at = end
+                self._consumed = end
+        elif marker in self.closers:
+            self.last = (self._open_at, start)
+            self._open_at = None
+            self._consumed = end
+
+    def result(self, text: str) -> Optional[str]:
+        """最後の区間の中身（前後の空白を除去）"""
+        span = self.last
+        if self._open_at is not None and self.close_at_end:
+            span = (self._open_at, len(text))
+        if span is None:
+            return None
+        return text[span[0]:span[1]].strip()
+
+
+class ResponseParser:
+    """マーカー駆動のレスポンスパーサー
+
+    Usage:
+        parser = ResponseParser()
+        parser.feed(chunk)      # ストリーミング中に繰り返し呼べる
+        linkedin_content, x_format, x_posts = parser.result()
+    """
+
+    def __init__(self):
+        self._chunks: list[str] = []
+        self._length = 0
+        self._scan_from = 0
+        self._tail = ""
+        self._first_emoji: Optional[int] = None
+        self._linkedin = _SectionScanner((LINKEDIN_START,), (LINKEDIN_END,), close_at_end=False)
+        self._linkedin_legacy = _SectionScanner((LINKEDIN_LEGACY,), (X_THREAD_LEGACY, X_START), close_at_end=True)
+        self._x_format = _SectionScanner((X_FORMAT_START,), (X_FORMAT_END,), close_at_end=False)
+        self._x = _SectionScanner((X_START,), (X_END,), close_at_end=False)
+        self._x_thread_legacy = _SectionScanner((X_THREAD_LEGACY,), (NOTION_TRAILER, CLAUDE_TRAILER), close_at_end=True)
+        self._scanners = (self._linkedin, self._linkedin_legacy, self._x_format, self._x, self._x_thread_legacy)
+
+    @property
+    def text(self) -> str:
+        """これまでに受け取ったレスポンス全体"""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    def feed(self, chunk: str) -> None:
+        """レスポンスの続きを追加し、新しく届いた範囲のマーカーを走査"""
+        if not chunk:
+            return
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+
+        # 未確定の末尾（前回の走査でマーカーが途中までしか届いていない可能性のある範囲）と合わせて走査
+        window = self._tail + chunk
+        offset = self._scan_from
+        last_start = offset - 1
+        for match in _TOKEN_RE.finditer(window):
+            marker = match.group(1)
+            start = offset + match.start()
+            last_start = start
+            if len(marker) == 1:
+                if self._first_emoji is None:
+                    self._first_emoji = start
+                continue
+            for scanner in self._scanners:
+                scanner.on_token(marker, start, start + len(marker))
+
+        # チャンク境界をまたぐマーカーを取りこぼさないよう、末尾は次回も走査する
+        self._scan_from = max(self._length - _MAX_MARKER_LEN + 1, last_start + 1, offset)
+        self._tail = window[self._scan_from - offset:]
+
+    def result(self) -> tuple[str, str, list[str]]:
+        """パース結果を返す
+
+        Returns:
+            tuple: (linkedin_content, x_format, x_posts)
+        """
+        text = self.text
+        linkedin_content = self._extract_linkedin(text)
+        x_format = "single"
+
+        format_str = self._x_format.result(text)
+        if format_str is not None:
+            x_format = "thread" if 'thread' in format_str.lower() else "single"
+
+        x_posts, x_format = self._extract_x_posts(text, x_format)
+        return linkedin_content, x_format, x_posts
+
+    def _extract_linkedin(self, text: str) -> str:
+        linkedin_content = self._linkedin.result(text) or ""
+        if _LINKEDIN_PLACEHOLDER in linkedin_content:
+            linkedin_content = ""
+
+        # フォールバック: 旧形式のマーカー
+        if not linkedin_content:
+            linkedin_content = self._linkedin_legacy.result(text) or ""
+
+        # フォールバック: 絵文字で始まる構造化コンテンツを探す
+        if not linkedin_content or len(linkedin_content) < 100:
+            emoji_content = self._extract_emoji_block(text)
+            if emoji_content is not None:
+                linkedin_content = emoji_content
+
+        return linkedin_content
+
+    def _extract_emoji_block(self, text: str) -> Optional[str]:
+        """絵文字で始まる行から、200文字以上先の最初の「--」「===」または末尾までを取り出す
+
+        後続の絵文字は改行位置も後ろになるため、最初の絵文字で見つからなければ該当なし。
+        """
+        start = self._first_emoji
+        if start is None:
+            return None
+        newline = text.find('\n', start + 1)
+        if newline < 0:
+            return None
+        body_end = newline + 1 + _EMOJI_MIN_BODY
+        if body_end > len(text):
+            return None
+
+        # 文字列末尾（末尾が改行ならその直前）
+        end = len(text) - 1 if text.endswith('\n') and len(text) - 1 >= body_end else len(text)
+        for terminator in ('--', '==='):
+            pos = text.find(terminator, body_end, end)
+            if pos >= 0:
+                end = pos
+        return text[start:end].strip()
+
+    def _extract_x_posts(self, text: str, x_format: str) -> tuple[list[str], str]:
+        x_posts = []
+
+        x_content = self._x.result(text)
+        if x_content is not None:
+            # テンプレートのプレースホルダーを除外
+            if any(placeholder in x_content for placeholder in _X_PLACEHOLDERS):
+                x_content = ""
+
+            if x_content:
+                x_posts, x_format = split_x_posts(x_content, x_format)
+
+                # 形式を自動判定（フォーマットマーカーがない場合）
+                if len(x_posts) > 1:
+                    x_format = "thread"
+
+        # フォールバック: 旧形式のマーカー（JSON形式）
+        if not x_posts:
+            x_json = self._x_thread_legacy.result(text)
+            if x_json is not None:
+                try:
+                    json_match = re.search(r'\{[\s\S]*?"thread"[\s\S]*?\}', x_json)
+                    if json_match:
+                        data = json.loads(json_match.group())
+                        threads = data.get('thread', [])
+                        x_posts = [t.get('text', '') for t in threads if t.get('text')]
+                        if len(x_posts) > 1:
+                            x_format = "thread"
+                except:
+                    pass
+
+        return x_posts, x_format
+
+
+def split_x_posts(x_content: str, x_format: str) -> tuple[list[str], str]:
+    """--X_START-- 〜 --X_END-- の中身を個々のポストに分割
+
+    Returns:
+        tuple: (x_posts, x_format)
+    """
+    # スレッド形式: --- で分割
+    if '---' in x_content:
+        posts = [p.strip() for p in x_content.split('---') if p.strip()]
+        # 例文や説明を除外
+        return [p for p in posts if not p.startswith('例（') and len(p) > 20], x_format
+
+    if x_format != "thread":
+        # 単一ポスト
+        return [x_content], x_format
+
+    # ---区切りがないが、thread形式が指定されている場合
+    # ハッシュタグで終わる行で分割（各ツイートはハッシュタグで終わる）
+    # パターン: テキスト + ハッシュタグ + 改行
+    hashtag_matches = re.findall(r'(.*?#\w+(?:\s+#\w+)*)\s*\n', x_content + '\n', re.DOTALL)
+    if hashtag_matches and len(hashtag_matches) > 1:
+        return [p.strip() for p in hashtag_matches if p.strip() and len(p.strip()) > 20], x_format
+
+    # ハッシュタグ分割できない場合、段落で分割
+    paragraphs = re.split(r'\n\s*\n', x_content)
+    paragraphs = [p.strip() for p in paragraphs if p.strip() and len(p.strip()) > 20]
+    if len(paragraphs) > 1:
+        return paragraphs, x_format
+    return [x_content], "single"
+
+
+def parse_response(response: str) -> tuple[str, str, list[str]]:
+    """レスポンス全体をLinkedInとXに分割
+
+    Returns:
+        tuple: (linkedin_content, x_format, x_posts)
+        - linkedin_content: LinkedIn投稿文
+        - x_format: "single" または "thread"
+        - x_posts: X投稿のリスト（単一の場合は1要素、スレッドの場合は複数）
+    """
+    parser = ResponseParser()
+    parser.feed(response)
+    return parser.result()
+
+
+@dataclass
+class RewriteResult:
+    """リライト結果（パース済みの投稿文と添付画像）"""
+    linkedin_content: str
+    x_format: str
+    x_posts: list[str]
+    images: list[str] = field(default_factory=list)
+    source_url: str = ""
+    title: str = ""
+
+    FILENAME: ClassVar[str] = "rewrite_result.json"
+
+    @classmethod
+    def from_response(
+        cls,
+        response: str,
+        source_url: str = "",
+        images: Optional[list[Path]] = None,
+        title: str = ""
+    ) -> 'RewriteResult':
+        """Gensparkのレスポンスをパースして生成"""
+        linkedin_content, x_format, x_posts = parse_response(response)
+        return cls(
+            linkedin_content=linkedin_content,
+            x_format=x_format,
+            x_posts=x_posts,
+            images=[str(Path(img).resolve()) for img in images or []],
+            source_url=source_url,
+            title=title
+        )
+
+    @property
+    def image_paths(self) -> list[Path]:
+        """添付画像のパス"""
+        return [Path(img) for img in self.images]
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False, indent=2)
+
+    @classmethod
+    def from_json(cls, text: str) -> 'RewriteResult':
+        data = json.loads(text)
+        return cls(
+            linkedin_content=data.get('linkedin_content', ''),
+            x_format=data.get('x_format', 'single'),
+            x_posts=data.get('x_posts', []),
+            images=data.get('images', []),
+            source_url=data.get('source_url', ''),
+            title=data.get('title', '')
+        )
+
+    @classmethod
+    def load(cls, output_dir: Path) -> Optional['RewriteResult']:
+        """出力ディレクトリの rewrite_result.json を読み込む（ない場合は None）"""
+        try:
+            return cls.from_json((output_dir / cls.FILENAME).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+
+# --- 回帰コーパス --- #
+SCRIPT_DIR = Path(__file__).parent.resolve()
+CORPUS_FILE = SCRIPT_DIR / "regression" / "parse_corpus.json"
+
+# ストリーミング時の分割サイズ（マーカーがチャンク境界をまたぐケースを含めて確認する）
+_CHUNK_SIZES = (1, 7, 64, 1000)
+
+
+def check_corpus(corpus_file: Path = CORPUS_FILE) -> bool:
+    """回帰コーパスの期待値と一致するか確認（一括・分割入力の両方）"""
+    with open(corpus_file, 'r', encoding='utf-8') as f:
+        cases = json.load(f)
+
+    ok = True
+    for case in cases:
+        response = (SCRIPT_DIR / case['response_file']).read_text(encoding='utf-8')
+        expected = (case['linkedin_content'], case['x_format'], case['x_posts'])
+
+        results = {"whole": parse_response(response)}
+        for size in _CHUNK_SIZES:
+            parser = ResponseParser()
+            for i in range(0, len(response), size):
+                parser.feed(response[i:i + size])
+            results[f"chunk={size}"] = parser.result()
+
+        mismatches = [name for name, result in results.items() if result != expected]
+        if mismatches:
+            ok = False
+            print(f"❌ {case['response_file']}: {', '.join(mismatches)}")
+        else:
+            print(f"✅ {case['response_file']}")
+
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if check_corpus() else 1)
@@ -0,0 +1,82 @@
+"""
+スクリーンショットの撮影
+
+撮影方針に従って撮影を間引き、途中経過（デバッグ用）の撮影はバックグラウンドの
+タスクで行って処理の流れを止めない。エラー時の撮影は直後にページを閉じることが多いため、
+その場で完了を待つ。JPEG を指定した場合は拡張子を .jpg に置き換えて保存する。
+
+    screenshots = ScreenshotRecorder("all", image_format="jpeg", quality=70)
+    screenshots.capture(page, output_dir / "debug_01_initial.png")
+    ...
+    await screenshots.error(page, output_dir / "error_exception.png")
+    await screenshots.flush(page)  # ページを閉じる・遷移する前に撮影完了を待つ
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Optional
+
+from playwright.async_api import Page
+
+
+# off: 撮影しない / on-error: エラー時のみ / all: 途中経過も撮影
+SCREENSHOT_POLICIES = ("off", "on-error", "all")
+
+_EXTENSIONS = {
+    "png": ".png",
+    "jpeg": ".jpg",
+}
+
+
+class ScreenshotRecorder:
+    """撮影方針に従ってスクリーンショットを保存
+
+    Args:
+        policy: "off" / "on-error" / "all"
+        image_format: "png" または "jpeg"
+        quality: JPEGの品質（1-100）
+        max_pending: バックグラウンドで同時に撮影する上限（超えた途中経過の撮影は省略）
+    """
+
+    def __init__(self, policy: str = "on-error", image_format: str = "png", quality: int = 70, max_pending: int = 4):
+        self.policy = policy if policy in SCREENSHOT_POLICIES else "on-error"
+        self.image_format = image_format.lower() if image_format.lower() in _EXTENSIONS else "png"
+        self.quality = quality
+        self.max_pending = max_pending
+        self._pending: dict[asyncio.Task, Page] = {}
+
+    def capture(self, page: Page, path: Path) -> None:
+        """途中経過を撮影（policy = all のときのみ。完了を待たずに戻る）"""
+        if self.policy != "all" or len(self._pending) >= self.max_pending:
+            return
+        task = asyncio.create_task(self._capture(page, path))
+        self._pending[task] = page
+        task.add_done_callback(self._pending.pop)
+
+    async def error(self, page: Page, path: Path) -> Optional[Path]:
+        """エラー時の画面を撮影（policy = off 以外。保存が終わるまで待つ）"""
+        if self.policy == "off":
+            return None
+        return await self._capture(page, path)
+
+    async def flush(self, page: Optional[Page] = None) -> None:
+        """撮影中のスクリーンショットの完了を待つ（page を指定した場合はそのページ分のみ）"""
+        tasks = [task for task, owner in self._pending.items() if page is None or owner is page]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _options(self) -> dict:
+        if self.image_format == "jpeg":
+            return {"type": "jpeg", "quality": self.quality}
+        return {"type": "png"}
+
+    async def _capture(self, page: Page, path: Path) -> Optional[Path]:
+        path = path.with_suffix(_EXTENSIONS[self.image_format])
+        try:
+            data = await page.screenshot(**self._options())
+            # ファイル書き込みもイベントループを止めないようスレッドで行う
+            await asyncio.get_running_loop().run_in_executor(None, path.write_bytes, data)
+            return path
+        except Exception as e:
+            print(f"   ⚠️ スクリーンショット保存エラー（{path.name}）: {e}")
+            return None
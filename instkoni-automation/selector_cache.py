@@ -0,0 +1,102 @@
+"""
+セレクタキャッシュ
+
+サイト・役割ごと（例: genspark.response, linkedin.editor, x.schedule_button）に
+前回一致したセレクタをJSONファイルへ記録し、次回以降はそのセレクタを最初に試す。
+一致しなかった場合のみ候補リスト全体を順に確認する。
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from playwright.async_api import Locator, Page
+
+from wait_strategies import wait_for_any_visible, wait_for_visible
+
+
+class SelectorCache:
+    """一致したセレクタを記憶するキャッシュ
+
+    Args:
+        path: キャッシュファイル（JSON）のパス
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._hits: dict[str, str] = self._load()
+
+    def hit(self, key: str) -> Optional[str]:
+        """前回一致したセレクタを返す"""
+        return self._hits.get(key)
+
+    def ordered(self, key: str, selectors: list[str]) -> list[str]:
+        """前回一致したセレクタを先頭にした候補リストを返す"""
+        hit = self._hits.get(key)
+        if hit in selectors:
+            return [hit] + [s for s in selectors if s != hit]
+        return list(selectors)
+
+    def remember(self, key: str, selector: str) -> None:
+        """一致したセレクタを記録（変化があった場合のみ書き込む）"""
+        if self._hits.get(key) == selector:
+            return
+        self._hits[key] = selector
+        self._save(key, selector)
+
+    async def find_visible(
+        self,
+        page: Page,
+        key: str,
+        selectors: list[str],
+        timeout_ms: int = 3000
+    ) -> Optional[Locator]:
+        """候補の中から表示されている要素を取得
+
+        前回一致したセレクタを先に timeout_ms まで待機し、見つからなければ
+        残りの候補のいずれかが表示されるまで timeout_ms まで待機する。
+        表示された後は候補リストの順に確認し、最初に表示されている候補を採用する
+        （末尾の汎用的な候補が先に表示されても、優先度の高い候補を記録する）。
+        """
+        hit = self._hits.get(key)
+        if hit in selectors:
+            locator = page.locator(f"{hit} >> visible=true").first
+            if await wait_for_visible(locator, timeout_ms):
+                return locator
+
+        rest = [s for s in selectors if s != hit]
+        if not await wait_for_any_visible(page, rest, timeout_ms):
+            return None
+
+        for selector in rest:
+            locator = page.locator(f"{selector} >> visible=true").first
+            try:
+                if await locator.is_visible():
+                    self.remember(key, selector)
+                    return locator
+            except Exception:
+                continue
+
+        return None
+
+    def _load(self) -> dict[str, str]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, key: str, selector: str) -> None:
+        # 別プロセス・別インスタンスの記録を消さないよう、ファイルの最新内容にマージして書き込む
+        data = self._load()
+        data[key] = selector
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self._hits.update(data)
+        except OSError as e:
+            print(f"   ⚠️ セレクタキャッシュ保存エラー: {e}")
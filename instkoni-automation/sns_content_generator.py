@@ -10,18 +10,43 @@ import asyncio
 import configparser
 import json
 import os
-import re
 import sys
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Optional
-from dataclasses import dataclass
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from dataclasses import asdict, dataclass
+from urllib.parse import urljoin
 
-import requests
+import httpx
 from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright, Page, BrowserContext
 import aiofiles
 
+from article_state import DRAFTED, POST_FAILED, POSTED, ArticleStateStore, content_hash
+from browser_session import BrowserSession, open_session
+from checkpoint import Checkpoint
+from dom_watch import DomChangeWatcher
+from image_variants import ImageVariantCache
+from infographic_index import InfographicIndex
+from response_cache import ResponseCache
+from resource_blocker import BlockRule, ResourceBlocker, rules_from_section
+from response_parser import RewriteResult
+from screenshots import SCREENSHOT_POLICIES, ScreenshotRecorder
+from selector_cache import SelectorCache
+from tracing import Tracer, current_tracer, span
+from wait_strategies import (
+    wait_for_any_visible,
+    wait_for_button_enabled,
+    wait_for_hidden,
+    wait_for_modal_closed,
+    wait_for_modal_open,
+    wait_for_network_idle,
+    wait_for_text_growth,
+    wait_for_upload_thumbnails,
+    wait_for_visible,
+)
+
 
 # --- パス設定 --- #
 SCRIPT_DIR = Path(__file__).parent.resolve()
@@ -39,12 +64,21 @@ class Config:
     response_timeout_minutes: int
     stability_threshold: int
     check_interval_seconds: int
+    max_concurrent_tabs: int
+    completion_detection: str
+    quiet_seconds: int
+    response_cache_enabled: bool
+    response_cache_ttl_hours: int
 
     # パス設定
     browser_data_dir: Path
     output_dir: Path
     infographic_dir: Path
     prompt_file: Path
+    selector_cache_file: Path
+    infographic_index_file: Path
+    state_db_file: Path
+    response_cache_dir: Path
 
     # SNS設定
     linkedin_url: str
@@ -52,9 +86,35 @@ class Config:
     linkedin_delay_days: int
     x_first_post_delay_days: int
     x_interval_hours: int
+    linkedin_timeout_seconds: int
+    x_timeout_seconds: int
+
+    # アップロード画像の前処理
+    image_preprocess: bool
+    image_format: str
+    image_quality: int
+    x_image_max_edge: int
+    linkedin_image_max_edge: int
+    image_cache_dir: Path
+
+    # ブラウザ設定
+    headless: bool
+    browser_channel: str
+    user_agent: str
+    viewport_width: int
+    viewport_height: int
+    use_browser_daemon: bool
+
+    # リソースブロック
+    block_resources: bool
+    block_rules: dict[str, BlockRule]
 
     # デバッグ
     debug_mode: bool
+    chrome_trace: bool
+    screenshot_policy: str
+    screenshot_format: str
+    screenshot_quality: int
 
     @classmethod
     def load(cls, config_path: Path) -> 'Config':
@@ -69,16 +129,45 @@ class Config:
             response_timeout_minutes=parser.getint('GENSPARK', 'response_timeout_minutes'),
             stability_threshold=parser.getint('GENSPARK', 'stability_threshold'),
             check_interval_seconds=parser.getint('GENSPARK', 'check_interval_seconds'),
+            max_concurrent_tabs=parser.getint('GENSPARK', 'max_concurrent_tabs', fallback=2),
+            completion_detection=parser.get('GENSPARK', 'completion_detection', fallback='observer'),
+            quiet_seconds=parser.getint('GENSPARK', 'quiet_seconds', fallback=10),
+            response_cache_enabled=parser.getboolean('GENSPARK', 'response_cache_enabled', fallback=True),
+            response_cache_ttl_hours=parser.getint('GENSPARK', 'response_cache_ttl_hours', fallback=168),
             browser_data_dir=SCRIPT_DIR / parser.get('PATHS', 'browser_data_dir'),
             output_dir=SCRIPT_DIR / parser.get('PATHS', 'output_dir'),
             infographic_dir=SCRIPT_DIR / parser.get('PATHS', 'infographic_dir'),
             prompt_file=SCRIPT_DIR / parser.get('PATHS', 'prompt_file'),
+            selector_cache_file=SCRIPT_DIR / parser.get('PATHS', 'selector_cache_file', fallback='selector_cache.json'),
+            infographic_index_file=SCRIPT_DIR / parser.get('PATHS', 'infographic_index_file', fallback='infographic_index.json'),
+            state_db_file=SCRIPT_DIR / parser.get('PATHS', 'state_db_file', fallback='sync_state.db'),
+            response_cache_dir=SCRIPT_DIR / parser.get('PATHS', 'response_cache_dir', fallback='cache/genspark'),
             linkedin_url=parser.get('SNS', 'linkedin_url'),
             x_url=parser.get('SNS', 'x_url'),
             linkedin_delay_days=parser.getint('SNS', 'linkedin_delay_days'),
             x_first_post_delay_days=parser.getint('SNS', 'x_first_post_delay_days'),
             x_interval_hours=parser.getint('SNS', 'x_interval_hours'),
+            linkedin_timeout_seconds=parser.getint('SNS', 'linkedin_timeout_seconds', fallback=300),
+            x_timeout_seconds=parser.getint('SNS', 'x_timeout_seconds', fallback=600),
+            image_preprocess=parser.getboolean('IMAGES', 'preprocess', fallback=True),
+            image_format=parser.get('IMAGES', 'format', fallback='jpeg'),
+            image_quality=parser.getint('IMAGES', 'quality', fallback=85),
+            x_image_max_edge=parser.getint('IMAGES', 'x_max_edge', fallback=1600),
+            linkedin_image_max_edge=parser.getint('IMAGES', 'linkedin_max_edge', fallback=1920),
+            image_cache_dir=SCRIPT_DIR / parser.get('IMAGES', 'cache_dir', fallback='cache/images'),
+            headless=parser.getboolean('BROWSER', 'headless', fallback=False),
+            browser_channel=parser.get('BROWSER', 'channel', fallback=''),
+            user_agent=parser.get('BROWSER', 'user_agent', fallback=''),
+            viewport_width=parser.getint('BROWSER', 'viewport_width', fallback=1280),
+            viewport_height=parser.getint('BROWSER', 'viewport_height', fallback=900),
+            use_browser_daemon=parser.getboolean('BROWSER', 'use_daemon', fallback=True),
+            block_resources=parser.getboolean('BLOCKING', 'enabled', fallback=True),
+            block_rules=rules_from_section(parser['BLOCKING'] if parser.has_section('BLOCKING') else {}),
             debug_mode=parser.getboolean('DEBUG', 'debug_mode'),
+            chrome_trace=parser.getboolean('DEBUG', 'chrome_trace', fallback=False),
+            screenshot_policy=parser.get('DEBUG', 'screenshot_policy', fallback='on-error'),
+            screenshot_format=parser.get('DEBUG', 'screenshot_format', fallback='jpeg'),
+            screenshot_quality=parser.getint('DEBUG', 'screenshot_quality', fallback=70),
         )
 
 
@@ -92,62 +181,127 @@ class Article:
 
 
 class NoteArticleFetcher:
-    """note.com記事取得クラス"""
+    """note.com記事取得クラス
 
-    def __init__(self, config: Config):
+    keep-alive の非同期HTTPクライアントを使い回し、イベントループを止めずに取得する。
+    使用後は aclose() でコネクションを解放すること。
+    """
+
+    # 同一ホストへ同時に張るコネクション数の上限
+    MAX_CONNECTIONS = 8
+
+    def __init__(self, config: Config, state: Optional[ArticleStateStore] = None):
         self.config = config
+        self.state = state
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
         }
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """コネクションプール付きのHTTPクライアントを取得（初回のみ生成）"""
+        if self._client is None:
+            try:
+                import h2  # noqa: F401  HTTP/2は h2 がインストールされている場合のみ有効
+                http2 = True
+            except ImportError:
+                http2 = False
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                timeout=30,
+                http2=http2,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.MAX_CONNECTIONS,
+                    max_keepalive_connections=self.MAX_CONNECTIONS
+                )
+            )
+        return self._client
+
+    async def _get_text(self, url: str) -> str:
+        """GETしてレスポンス本文を返す
+
+        状態ストアがある場合は条件付きGETを行い、304 Not Modified なら前回の本文を返す。
+        """
+        headers = self.state.conditional_headers(url) if self.state else {}
+        response = await self._get_client().get(url, headers=headers)
+
+        if response.status_code == 304 and self.state:
+            cached = self.state.cached_body(url)
+            if cached is not None:
+                return cached
+
+        response.raise_for_status()
+        if self.state:
+            self.state.store_response(
+                url,
+                response.text,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified')
+            )
+        return response.text
+
+    async def aclose(self) -> None:
+        """HTTPクライアントを閉じる"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @staticmethod
+    def note_key(url: str) -> str:
+        """記事URL（.../n/{key}）からノートキーを取り出す"""
+        return url.split('?', 1)[0].rstrip('/').rsplit('/', 1)[-1]
+
+    async def get_latest_article_url(self) -> Optional[str]:
+        """最新記事のURLを取得
+
+        コンテンツAPIを優先し、取得できない場合のみプロフィールページのHTMLから探す。
+        """
+        # パターン1: API経由で取得（公開日でソート）
+        api_url = f"{self.config.note_base_url}/api/v2/creators/{self.config.note_username}/contents?kind=note&page=1"
+        print(f"📡 記事一覧APIを取得中: {api_url}")
+        try:
+            data = json.loads(await self._get_text(api_url))
+            contents = data.get('data', {}).get('contents', [])
+            if contents:
+                # publishAtで降順ソートして最新記事を取得
+                sorted_contents = sorted(
+                    contents,
+                    key=lambda x: x.get('publishAt', ''),
+                    reverse=True
+                )
+                latest_note = sorted_contents[0]
+                note_key = latest_note.get('key')
+                note_title = latest_note.get('name', '')[:50]
+                publish_at = latest_note.get('publishAt', 'N/A')
+                print(f"   📝 最新記事: {note_title}...")
+                print(f"   📅 公開日: {publish_at}")
+                if note_key:
+                    return f"{self.config.note_base_url}/{self.config.note_username}/n/{note_key}"
+        except Exception as e:
+            print(f"   ⚠️ 記事一覧API取得エラー: {e}")
 
-    def get_latest_article_url(self) -> Optional[str]:
-        """最新記事のURLを取得"""
         profile_url = f"{self.config.note_base_url}/{self.config.note_username}"
         print(f"📡 プロフィールページを取得中: {profile_url}")
 
         try:
-            response = requests.get(profile_url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(await self._get_text(profile_url), 'html.parser')
 
             # 記事リンクを探す（note.comの構造に基づく）
-            # パターン1: data-note-url属性
+            # パターン2: data-note-url属性
             article_links = soup.select('a[data-note-url]')
             if article_links:
                 url = article_links[0].get('data-note-url')
                 if url:
                     return url if url.startswith('http') else f"{self.config.note_base_url}{url}"
 
-            # パターン2: href属性で /n/ を含むリンク
+            # パターン3: href属性で /n/ を含むリンク
             article_links = soup.select('a[href*="/n/"]')
             for link in article_links:
                 href = link.get('href', '')
                 if '/n/' in href and self.config.note_username in href:
                     return href if href.startswith('http') else f"{self.config.note_base_url}{href}"
 
-            # パターン3: API経由で取得（公開日でソート）
-            api_url = f"{self.config.note_base_url}/api/v2/creators/{self.config.note_username}/contents?kind=note&page=1"
-            api_response = requests.get(api_url, headers=self.headers, timeout=30)
-            if api_response.status_code == 200:
-                data = api_response.json()
-                contents = data.get('data', {}).get('contents', [])
-                if contents:
-                    # publishAtで降順ソートして最新記事を取得
-                    sorted_contents = sorted(
-                        contents,
-                        key=lambda x: x.get('publishAt', ''),
-                        reverse=True
-                    )
-                    latest_note = sorted_contents[0]
-                    note_key = latest_note.get('key')
-                    note_title = latest_note.get('name', '')[:50]
-                    publish_at = latest_note.get('publishAt', 'N/A')
-                    print(f"   📝 最新記事: {note_title}...")
-                    print(f"   📅 公開日: {publish_at}")
-                    if note_key:
-                        return f"{self.config.note_base_url}/{self.config.note_username}/n/{note_key}"
-
             print("⚠️ 記事URLが見つかりませんでした")
             return None
 
@@ -155,15 +309,111 @@ class NoteArticleFetcher:
             print(f"❌ プロフィールページ取得エラー: {e}")
             return None
 
-    def fetch_article(self, url: str) -> Optional[Article]:
-        """記事本文を取得"""
+    async def list_article_urls(self, limit: Optional[int] = None, since: Optional[date] = None) -> list[str]:
+        """クリエイターの記事URLを公開日の新しい順に列挙（バッチ処理用）
+
+        Args:
+            limit: 取得する最大件数（None の場合は無制限）
+            since: この日付以降に公開された記事のみ対象
+        """
+        print(f"📡 記事一覧を取得中: {self.config.note_username}")
+
+        notes = []
+        page_num = 1
+        try:
+            while True:
+                api_url = f"{self.config.note_base_url}/api/v2/creators/{self.config.note_username}/contents?kind=note&page={page_num}"
+                data = json.loads(await self._get_text(api_url)).get('data', {})
+                contents = data.get('contents', [])
+                if not contents:
+                    break
+
+                reached_since = False
+                for note in contents:
+                    publish_at = note.get('publishAt') or ''
+                    if since and publish_at:
+                        try:
+                            if datetime.fromisoformat(publish_at).date() < since:
+                                reached_since = True
+                                continue
+                        except ValueError:
+                            pass
+                    notes.append(note)
+
+                # 新しい順に並んでいるため、since より古い記事が出たら以降のページは不要
+                if reached_since or data.get('isLastPage', True):
+                    break
+                if limit and len(notes) >= limit:
+                    break
+                page_num += 1
+
+        except Exception as e:
+            print(f"❌ 記事一覧取得エラー: {e}")
+
+        notes.sort(key=lambda x: x.get('publishAt', ''), reverse=True)
+        if limit:
+            notes = notes[:limit]
+
+        urls = []
+        for note in notes:
+            note_key = note.get('key')
+            if note_key:
+                urls.append(f"{self.config.note_base_url}/{self.config.note_username}/n/{note_key}")
+                print(f"   📝 {note.get('publishAt', 'N/A')[:10]} {note.get('name', '')[:50]}")
+
+        print(f"   ✅ 対象記事: {len(urls)}件")
+        return urls
+
+    async def fetch_article(self, url: str) -> Optional[Article]:
+        """記事本文を取得（ノートAPIを優先し、失敗時はHTMLから抽出）"""
         print(f"📄 記事を取得中: {url}")
 
+        article = await self._fetch_article_from_api(url)
+        if article:
+            return article
+
+        return await self._fetch_article_from_html(url)
+
+    async def _fetch_article_from_api(self, url: str) -> Optional[Article]:
+        """ノートAPI（/api/v3/notes/{key}）から記事を取得"""
+        note_key = self.note_key(url)
+        if not note_key:
+            return None
+
+        api_url = f"{self.config.note_base_url}/api/v3/notes/{note_key}"
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
+            note = json.loads(await self._get_text(api_url)).get('data') or {}
+
+            title = note.get('name') or ''
+            body_html = note.get('body') or ''
+            if not body_html:
+                return None
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # 本文は記事部分のHTML断片のみなので、ページ全体を解析するより軽い
+            content = BeautifulSoup(body_html, 'html.parser').get_text(separator='\n', strip=True)
+            if not content:
+                return None
+
+            published_at = note.get('publish_at') or note.get('publishAt')
+
+            print(f"   ✅ タイトル: {title[:50]}...（API）")
+            print(f"   ✅ 本文: {len(content)}文字")
+
+            return Article(
+                title=title,
+                url=url,
+                content=content,
+                published_at=published_at
+            )
+
+        except Exception as e:
+            print(f"   ⚠️ ノートAPI取得エラー（HTMLから取得します）: {e}")
+            return None
+
+    async def _fetch_article_from_html(self, url: str) -> Optional[Article]:
+        """記事ページのHTMLから本文を抽出"""
+        try:
+            soup = BeautifulSoup(await self._get_text(url), 'html.parser')
 
             # タイトル取得
             title = ""
@@ -212,80 +462,311 @@ class NoteArticleFetcher:
             print(f"❌ 記事取得エラー: {e}")
             return None
 
+    async def fetch_articles(self, urls: list[str]) -> list[Article]:
+        """複数記事を並列に取得（取得できなかった記事は除外し、順序は urls に従う）"""
+        results = await asyncio.gather(*(self.fetch_article(url) for url in urls))
+        return [article for article in results if article]
+
 
 class InfographicFinder:
-    """最新インフォグラフィック検索クラス"""
+    """インフォグラフィック検索クラス
+
+    フォルダ・画像の一覧は InfographicIndex のマニフェストから取得し、
+    変更のあったディレクトリだけを再走査する。
+    """
 
     def __init__(self, config: Config):
         self.config = config
+        self.index = InfographicIndex(config.infographic_dir, config.infographic_index_file)
+        self._refreshed = False
+
+    def _ensure_index(self) -> bool:
+        """索引を最新化（1回の実行につき1度だけ）"""
+        if not self.config.infographic_dir.exists():
+            print(f"⚠️ インフォグラフィックディレクトリが存在しません: {self.config.infographic_dir}")
+            return False
+        if not self._refreshed:
+            self.index.refresh()
+            self._refreshed = True
+        return True
 
     def find_latest_images(self) -> list[Path]:
         """最新のインフォグラフィック画像を特定"""
-        infographic_dir = self.config.infographic_dir
-
-        if not infographic_dir.exists():
-            print(f"⚠️ インフォグラフィックディレクトリが存在しません: {infographic_dir}")
+        if not self._ensure_index():
             return []
 
-        # タイムスタンプ付きフォルダを探す (YYYYMMDDHHMMSS_*)
-        folders = []
-        for item in infographic_dir.iterdir():
-            if item.is_dir() and re.match(r'^\d{14}_', item.name):
-                folders.append(item)
+        # タイムスタンプ付きフォルダ (YYYYMMDDHHMMSS_*) のうち最新のもの
+        latest_folder = self.index.latest_folder()
 
-        if not folders:
-            # フォルダがない場合、直接画像を探す
-            images = list(infographic_dir.glob('*.png')) + list(infographic_dir.glob('*.jpg'))
+        if not latest_folder:
+            # フォルダがない場合、直接配置の画像（更新日時の新しい順）
+            images = self.index.loose_images()
             if images:
-                # 更新日時でソート
-                images.sort(key=lambda x: x.stat().st_mtime, reverse=True)
                 print(f"   📸 直接配置の画像: {len(images)}枚")
                 return images[:5]
             return []
 
-        # 最新フォルダを取得
-        folders.sort(key=lambda x: x.name, reverse=True)
-        latest_folder = folders[0]
-        print(f"   📁 最新フォルダ: {latest_folder.name}")
-
-        # フォルダ内の画像を取得
-        images = list(latest_folder.glob('*.png')) + list(latest_folder.glob('*.jpg'))
-        images.sort(key=lambda x: x.name)
+        print(f"   📁 最新フォルダ: {latest_folder}")
 
+        images = self.index.folder_images(latest_folder)
         print(f"   📸 画像: {len(images)}枚")
         return images
 
+    def find_images_for_article(self, article: Article) -> list[Path]:
+        """記事タイトル・公開日に対応するフォルダの画像を取得（見つからなければ最新フォルダ）"""
+        if not self._ensure_index():
+            return []
+
+        folder = self.index.find_folder(article.title, article.published_at)
+        if not folder:
+            print(f"   ⚠️ 記事に対応するフォルダが見つかりません。最新フォルダを使用します: {article.title[:50]}")
+            return self.find_latest_images()
+
+        images = self.index.folder_images(folder)
+        print(f"   📁 {article.title[:30]} → {folder}（{len(images)}枚）")
+        return images
+
+
+# アシスタントメッセージ本文を取得するスクリプト
+# （_wait_for_response_polling と同じセレクタ候補から最長のテキストを採用する）
+RESPONSE_TEXT_JS = '''
+() => {
+    const selectors = [
+        '[class*="message"][class*="assistant"]',
+        '[class*="ai-message"]',
+        '[class*="bot-message"]',
+        '[class*="response"]',
+        '[class*="answer"]',
+        '[class*="chat-message"]:last-child',
+        '[class*="prose"]',
+        '.markdown-body',
+        '[data-role="assistant"]',
+        'article',
+        '[class*="content"]',
+    ];
+    let best = '';
+    for (const selector of selectors) {
+        for (const el of document.querySelectorAll(selector)) {
+            if (el.offsetParent === null) continue;
+            const text = el.innerText || '';
+            if (text.length > best.length && text.length > 100) {
+                best = text;
+            }
+        }
+    }
+    if (best.length < 100) {
+        const body = document.body ? document.body.innerText : '';
+        if (body.includes('=== LINKEDIN ===')) {
+            best = body;
+        }
+    }
+    return best;
+}
+'''
+
+# 生成中に表示される停止ボタン
+STOP_BUTTON_SELECTORS = [
+    'button[aria-label*="Stop"]',
+    'button[aria-label*="stop"]',
+    'button[aria-label*="停止"]',
+    '[class*="stop-button"]',
+    '[class*="stopButton"]',
+]
+
+# レスポンスの生成状態（文字数・停止ボタンの有無）を返すスクリプト
+RESPONSE_PROBE_JS = '''
+() => {
+    const text = (%s)();
+    const stopButton = document.querySelector(%s);
+    return {
+        length: text.length,
+        generating: !!(stopButton && stopButton.offsetParent !== null),
+    };
+}
+''' % (RESPONSE_TEXT_JS.strip(), json.dumps(", ".join(STOP_BUTTON_SELECTORS)))
+
+
+class GensparkTabPool:
+    """Gensparkチャットタブのプール
+
+    K個のチャットタブを事前に開いて待機させ、空いたタブにプロンプトを割り当てる。
+    使用後のタブはバックグラウンドで新規チャット画面に戻してからプールに返却する。
+    """
+
+    def __init__(self, context: BrowserContext, config: Config, size: int):
+        self.context = context
+        self.config = config
+        self.size = max(1, size)
+        self.blocker = ResourceBlocker(config.block_rules, config.block_resources)
+        self._idle: asyncio.Queue[Page] = asyncio.Queue()
+        self._recycle_tasks: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """タブを開いてチャット画面を並列に読み込む"""
+        print(f"🗂️ Genspark タブを{self.size}個準備中...")
+        pages = await asyncio.gather(*(self._open_tab() for _ in range(self.size)))
+        for page in pages:
+            self._idle.put_nowait(page)
+        print(f"   ✅ タブ準備完了（{self.size}個）")
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Page]:
+        """空いているタブを取得（全タブ使用中の場合は空くまで待機）"""
+        with span("tabpool.acquire"):
+            page = await self._idle.get()
+        try:
+            yield page
+        finally:
+            task = asyncio.create_task(self._recycle(page))
+            self._recycle_tasks.add(task)
+            task.add_done_callback(self._recycle_tasks.discard)
+
+    async def close(self) -> None:
+        """全タブを閉じる"""
+        for task in list(self._recycle_tasks):
+            task.cancel()
+        await asyncio.gather(*self._recycle_tasks, return_exceptions=True)
+        while not self._idle.empty():
+            page = self._idle.get_nowait()
+            try:
+                await page.close()
+            except:
+                pass
+
+    async def _open_tab(self) -> Page:
+        """新しいタブでチャット画面を開く"""
+        page = await self.context.new_page()
+        await self.blocker.attach(page, "genspark")
+        await self._load_chat(page)
+        return page
+
+    async def _load_chat(self, page: Page) -> None:
+        """チャット画面を読み込み、入力欄が表示されるまで待機"""
+        await page.goto(self.config.genspark_chat_url, wait_until="domcontentloaded", timeout=120000)
+        try:
+            await page.wait_for_selector('textarea', timeout=30000)
+        except:
+            pass
+
+    async def _recycle(self, page: Page) -> None:
+        """使用済みタブを新規チャット画面に戻してプールへ返却（失敗時はタブを作り直す）"""
+        try:
+            if page.is_closed():
+                raise RuntimeError("タブが閉じられています")
+            await self._load_chat(page)
+        except asyncio.CancelledError:
+            await page.close()
+            raise
+        except Exception as e:
+            print(f"   ⚠️ タブを再作成します: {e}")
+            try:
+                await page.close()
+            except:
+                pass
+            try:
+                page = await self._open_tab()
+            except Exception as e:
+                print(f"   ❌ タブの再作成に失敗しました: {e}")
+                return
+        self._idle.put_nowait(page)
+
 
 class GensparkRewriter:
     """Genspark AIリライタークラス"""
 
     def __init__(self, config: Config):
         self.config = config
+        self.selectors = SelectorCache(config.selector_cache_file)
+        self.cache = ResponseCache(config.response_cache_dir, config.response_cache_ttl_hours)
+        self.screenshots = ScreenshotRecorder(config.screenshot_policy, config.screenshot_format, config.screenshot_quality)
+        self.blocker = ResourceBlocker(config.block_rules, config.block_resources)
 
-    async def rewrite(self, context: BrowserContext, article: Article, infographic_images: list[Path]) -> Optional[str]:
-        """Genspark AIで記事をリライト"""
-        page = await context.new_page()
-        output_dir = self._get_output_dir()
+    async def rewrite(
+        self,
+        context: BrowserContext,
+        article: Article,
+        infographic_images: list[Path],
+        output_dir: Optional[Path] = None,
+        pool: Optional['GensparkTabPool'] = None
+    ) -> Optional[str]:
+        """Genspark AIで記事をリライト
+
+        同じプロンプトのレスポンスがキャッシュにあれば、ページを開かずにそれを返す。
+
+        Args:
+            output_dir: プロンプト・レスポンス・スクリーンショットの保存先（None の場合は新規作成）
+            pool: 指定した場合、新規タブを開かずにプールの待機中タブを使用
+        """
+        output_dir = output_dir or self._get_output_dir()
 
+        # プロンプトを準備
         try:
-            # プロンプトを準備
-            prompt = await self._prepare_prompt(article, infographic_images)
+            with span("genspark.prompt_prepare"):
+                prompt = await self._prepare_prompt(article, infographic_images)
+        except Exception as e:
+            print(f"❌ プロンプト準備エラー: {e}")
+            return None
 
-            # プロンプトを保存（デバッグ用）
-            async with aiofiles.open(output_dir / "prompt.txt", 'w', encoding='utf-8') as f:
-                await f.write(prompt)
-            print(f"   📝 プロンプト保存: {output_dir / 'prompt.txt'}")
-            print(f"   📝 プロンプト文字数: {len(prompt)}文字")
+        # プロンプトを保存（デバッグ用）
+        async with aiofiles.open(output_dir / "prompt.txt", 'w', encoding='utf-8') as f:
+            await f.write(prompt)
+        print(f"   📝 プロンプト保存: {output_dir / 'prompt.txt'}")
+        print(f"   📝 プロンプト文字数: {len(prompt)}文字")
+
+        if self.config.response_cache_enabled:
+            with span("genspark.cache_lookup") as attrs:
+                cached = self.cache.get(prompt)
+                attrs["hit"] = bool(cached)
+            if cached:
+                print(f"   ♻️ キャッシュ済みレスポンスを使用: {self.cache.key(prompt)[:12]}")
+                await self._save_response(output_dir, cached)
+                return cached
+
+        if pool:
+            async with pool.acquire() as page:
+                response = await self._rewrite_on_page(page, prompt, output_dir, warm=True)
+        else:
+            page = await context.new_page()
+            await self.blocker.attach(page, "genspark")
+            try:
+                response = await self._rewrite_on_page(page, prompt, output_dir, warm=False)
+            finally:
+                await page.close()
 
-            print("📍 Genspark AIにアクセス中...")
-            await page.goto(self.config.genspark_chat_url, wait_until="domcontentloaded", timeout=120000)
+        if response:
+            await self._save_response(output_dir, response)
+            self.cache.put(prompt, response)
+        return response
 
-            # ページが完全にロードされるまで待機
-            print("   ⏳ ページ読み込み待機中...")
-            await page.wait_for_timeout(5000)
+    async def _save_response(self, output_dir: Path, response: str) -> None:
+        """レスポンスを保存"""
+        async with aiofiles.open(output_dir / "raw_response.txt", 'w', encoding='utf-8') as f:
+            await f.write(response)
+
+    async def _rewrite_on_page(
+        self,
+        page: Page,
+        prompt: str,
+        output_dir: Path,
+        warm: bool
+    ) -> Optional[str]:
+        """指定タブでプロンプト送信からレスポンス取得までを実行
+
+        Args:
+            warm: True の場合、タブはチャット画面を読み込み済みのためページ遷移を省略
+        """
+        try:
+            if not warm:
+                print("📍 Genspark AIにアクセス中...")
+                with span("genspark.page_load"):
+                    await page.goto(self.config.genspark_chat_url, wait_until="domcontentloaded", timeout=120000)
+
+                    # ページの読み込みが落ち着くまで待機（常時通信がある場合は5秒で打ち切り）
+                    print("   ⏳ ページ読み込み待機中...")
+                    await wait_for_network_idle(page, 5000)
 
             # スクリーンショット保存
-            await page.screenshot(path=str(output_dir / "debug_01_initial.png"))
+            self.screenshots.capture(page, output_dir / "debug_01_initial.png")
 
             # デバッグモード
             if self.config.debug_mode:
@@ -295,50 +776,51 @@ class GensparkRewriter:
 
             # 入力欄が表示されるまで待機
             print("   ⏳ 入力欄を待機中...")
-            try:
-                await page.wait_for_selector('textarea', timeout=30000)
-            except:
-                print("   ⚠️ textarea が見つかりません、続行します")
+            with span("genspark.input_ready"):
+                try:
+                    await page.wait_for_selector('textarea', timeout=30000)
+                except:
+                    print("   ⚠️ textarea が見つかりません、続行します")
 
             # Claude Opus 4.5モデルを選択
-            await self._select_model(page)
-            await page.wait_for_timeout(2000)
-            await page.screenshot(path=str(output_dir / "debug_02_model_selected.png"))
+            with span("genspark.model_select"):
+                await self._select_model(page)
+            self.screenshots.capture(page, output_dir / "debug_02_model_selected.png")
 
             # プロンプトを入力
             print("✍️ プロンプトを入力中...")
-            await self._input_prompt(page, prompt)
-            await page.wait_for_timeout(1000)
-            await page.screenshot(path=str(output_dir / "debug_03_prompt_entered.png"))
+            with span("genspark.prompt_input", chars=len(prompt)):
+                await self._input_prompt(page, prompt)
+            self.screenshots.capture(page, output_dir / "debug_03_prompt_entered.png")
 
             # 送信
             print("🚀 送信中...")
-            await self._submit(page)
-            await page.wait_for_timeout(5000)
-            await page.screenshot(path=str(output_dir / "debug_04_submitted.png"))
+            with span("genspark.submit"):
+                await self._submit(page)
+                # 送信が受け付けられ、生成が始まる（停止ボタンが表示される）まで待機
+                if not await wait_for_any_visible(page, STOP_BUTTON_SELECTORS, 5000):
+                    print("   ⚠️ 生成開始を確認できません（続行）")
+            self.screenshots.capture(page, output_dir / "debug_04_submitted.png")
 
             # レスポンス待機
-            response = await self._wait_for_response(page)
+            with span("genspark.response_wait") as attrs:
+                response = await self._wait_for_response(page)
+                attrs["chars"] = len(response) if response else 0
 
             if response:
-                await page.screenshot(path=str(output_dir / "debug_05_response.png"))
-                # レスポンスを保存
-                async with aiofiles.open(output_dir / "raw_response.txt", 'w', encoding='utf-8') as f:
-                    await f.write(response)
+                self.screenshots.capture(page, output_dir / "debug_05_response.png")
                 return response
             else:
-                await page.screenshot(path=str(output_dir / "error_no_response.png"))
+                await self.screenshots.error(page, output_dir / "error_no_response.png")
                 return None
 
         except Exception as e:
             print(f"❌ Genspark処理エラー: {e}")
-            try:
-                await page.screenshot(path=str(output_dir / "error_exception.png"))
-            except:
-                pass
+            await self.screenshots.error(page, output_dir / "error_exception.png")
             return None
         finally:
-            await page.close()
+            # タブを閉じる・プールへ返却する前に撮影を終える
+            await self.screenshots.flush(page)
 
     def _get_output_dir(self) -> Path:
         """出力ディレクトリを取得"""
@@ -382,15 +864,13 @@ class GensparkRewriter:
                 '[class*="dropdown"]',
             ]
 
-            for selector in model_selectors:
+            btn = await self.selectors.find_visible(page, 'genspark.model_button', model_selectors, timeout_ms=2000)
+            if btn:
                 try:
-                    btn = page.locator(selector).first
-                    if await btn.is_visible():
-                        await btn.click()
-                        await page.wait_for_timeout(1000)
-                        break
+                    # 開いたメニューの選択肢は次の find_visible で表示を待つ
+                    await btn.click()
                 except:
-                    continue
+                    pass
 
             # Claude Opus 4.5を選択
             opus_selectors = [
@@ -400,15 +880,13 @@ class GensparkRewriter:
                 '[data-model*="opus"]',
             ]
 
-            for selector in opus_selectors:
-                try:
-                    option = page.locator(selector).first
-                    if await option.is_visible():
-                        await option.click()
-                        print("   ✅ Claude Opus 4.5を選択")
-                        return
-                except:
-                    continue
+            option = await self.selectors.find_visible(page, 'genspark.model_option', opus_selectors, timeout_ms=2000)
+            if option:
+                await option.click()
+                # メニューが閉じるまで待機
+                await wait_for_hidden(option, 2000)
+                print("   ✅ Claude Opus 4.5を選択")
+                return
 
             print("   ⚠️ モデル選択できず、デフォルトモデルを使用")
 
@@ -428,7 +906,7 @@ class GensparkRewriter:
             'input[type="text"]',
         ]
 
-        for selector in input_selectors:
+        for selector in self.selectors.ordered('genspark.input', input_selectors):
             try:
                 elements = page.locator(selector)
                 count = await elements.count()
@@ -436,8 +914,10 @@ class GensparkRewriter:
                     element = elements.nth(i)
                     if await element.is_visible():
                         await element.click()
-                        await page.wait_for_timeout(500)
                         await element.fill(prompt)
+                        # 入力内容が反映されるまで待機
+                        await wait_for_text_growth(element, 0, 5000)
+                        self.selectors.remember('genspark.input', selector)
                         print(f"   📝 プロンプト入力完了（{len(prompt)}文字）")
                         print(f"   📝 使用セレクタ: {selector}")
                         return
@@ -485,7 +965,7 @@ class GensparkRewriter:
             'button:has(svg)',
         ]
 
-        for selector in submit_selectors:
+        for selector in self.selectors.ordered('genspark.submit', submit_selectors):
             try:
                 elements = page.locator(selector)
                 count = await elements.count()
@@ -496,6 +976,7 @@ class GensparkRewriter:
                         box = await btn.bounding_box()
                         if box and box['y'] > 200:  # 下部にあるボタン
                             await btn.click()
+                            self.selectors.remember('genspark.submit', selector)
                             print(f"   ✅ 送信完了（セレクタ: {selector}）")
                             return
             except:
@@ -521,6 +1002,79 @@ class GensparkRewriter:
         print("   ⌨️ Enterキーで送信")
 
     async def _wait_for_response(self, page: Page) -> Optional[str]:
+        """レスポンスを待機
+
+        completion_detection = observer の場合はDOM変化イベントで完了を検出し、
+        Observerを設置できなかった場合はポーリングにフォールバックする。
+        """
+        if self.config.completion_detection == "observer":
+            try:
+                return await self._wait_for_response_events(page)
+            except Exception as e:
+                print(f"   ⚠️ イベント検出を使用できません、ポーリングに切り替えます: {e}")
+
+        return await self._wait_for_response_polling(page)
+
+    async def _wait_for_response_events(self, page: Page) -> Optional[str]:
+        """レスポンスを待機（MutationObserverによるイベント駆動）
+
+        アシスタントメッセージの文字数と停止ボタンの表示状態をページ内で監視し、
+        停止ボタンが消えた時点、または quiet_seconds の間テキストが伸びなかった時点で完了とみなす。
+        """
+        print(f"⏳ レスポンスを待機中（イベント検出, 最大{self.config.response_timeout_minutes}分）...")
+
+        loop = asyncio.get_running_loop()
+        timeout = self.config.response_timeout_minutes * 60
+        quiet_seconds = self.config.quiet_seconds
+        start_time = loop.time()
+        was_generating = False
+        initial_length: Optional[int] = None
+        last_logged_length = 0
+
+        watcher = DomChangeWatcher(page, RESPONSE_PROBE_JS)
+        await watcher.start()
+
+        try:
+            while loop.time() - start_time < timeout:
+                remaining = timeout - (loop.time() - start_time)
+                changed = await watcher.wait_for_change(timeout=min(quiet_seconds, remaining))
+
+                state = watcher.state or {}
+                length = state.get('length', 0)
+                generating = state.get('generating', False)
+                elapsed = int(loop.time() - start_time)
+
+                if initial_length is None and watcher.state is not None:
+                    initial_length = length
+                # 送信直後の画面（入力済みプロンプトの表示など）を完了と誤判定しないよう、
+                # テキストが伸び始めるまでは完了判定しない
+                started = was_generating or (initial_length is not None and length > initial_length)
+
+                if changed:
+                    was_generating = was_generating or generating
+                    if length - last_logged_length >= 500:
+                        last_logged_length = length
+                        print(f"⏳ {elapsed}秒経過... (生成中: {length}文字)")
+
+                    # 停止ボタンが消えた = 生成完了
+                    if was_generating and not generating and length > 100:
+                        print(f"✅ レスポンス完了（停止ボタン消失, {elapsed}秒、{length}文字）")
+                        return await page.evaluate(RESPONSE_TEXT_JS)
+                    continue
+
+                # quiet_seconds の間変化なし
+                if started and length > 100 and not generating:
+                    print(f"✅ レスポンス完了（{quiet_seconds}秒間変化なし, {elapsed}秒、{length}文字）")
+                    return await page.evaluate(RESPONSE_TEXT_JS)
+
+            print("⚠️ タイムアウト")
+            text = await page.evaluate(RESPONSE_TEXT_JS)
+            return text if text else None
+
+        finally:
+            await watcher.stop()
+
+    async def _wait_for_response_polling(self, page: Page) -> Optional[str]:
         """レスポンスを待機（stability-based）"""
         print(f"⏳ レスポンスを待機中（最大{self.config.response_timeout_minutes}分）...")
 
@@ -553,9 +1107,11 @@ class GensparkRewriter:
 
             try:
                 current_content = ""
+                matched_selector = None
+                cached_selector = self.selectors.hit('genspark.response')
 
-                # 各セレクタで要素を探す
-                for selector in response_selectors:
+                # 各セレクタで要素を探す（前回一致したセレクタから）
+                for selector in self.selectors.ordered('genspark.response', response_selectors):
                     try:
                         elements = page.locator(selector)
                         count = await elements.count()
@@ -568,9 +1124,17 @@ class GensparkRewriter:
                                     # 長いテキストを持つ要素を採用
                                     if len(text) > len(current_content) and len(text) > 100:
                                         current_content = text
+                                        matched_selector = selector
                     except:
                         continue
 
+                    # 前回一致したセレクタでレスポンスが取れた場合、残りの候補は確認しない
+                    if selector == cached_selector and matched_selector == cached_selector:
+                        break
+
+                if matched_selector:
+                    self.selectors.remember('genspark.response', matched_selector)
+
                 # ページ全体からテキストを取得（フォールバック）
                 if not current_content or len(current_content) < 100:
                     try:
@@ -598,6 +1162,8 @@ class GensparkRewriter:
             except Exception as e:
                 print(f"   ⚠️ チェックエラー: {e}")
 
+            # ポーリング方式では一定間隔での再確認そのものが検出方法のため、固定間隔の待機を残す
+            # （待機せずに完了を検出するには completion_detection = observer を使う）
             await page.wait_for_timeout(check_interval)
 
         print("⚠️ タイムアウト")
@@ -610,28 +1176,53 @@ class OutputManager:
     def __init__(self, config: Config):
         self.config = config
 
-    def get_output_dir(self) -> Path:
-        """タイムスタンプ付き出力ディレクトリを作成"""
+    def get_output_dir(self, suffix: str = "") -> Path:
+        """タイムスタンプ付き出力ディレクトリを作成
+
+        Args:
+            suffix: ディレクトリ名に付与する識別子（バッチ処理で同一秒の衝突を避けるため）
+        """
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        output_dir = self.config.output_dir / timestamp
+        dir_name = f"{timestamp}_{suffix}" if suffix else timestamp
+        output_dir = self.config.output_dir / dir_name
         output_dir.mkdir(parents=True, exist_ok=True)
         return output_dir
 
-    async def save_all(self, output_dir: Path, article: Article, response: str, infographic_images: list[Path]) -> None:
-        """全ての出力を保存"""
+    async def save_all(
+        self,
+        output_dir: Path,
+        article: Article,
+        response: str,
+        infographic_images: list[Path]
+    ) -> RewriteResult:
+        """全ての出力を保存
+
+        Returns:
+            RewriteResult: パース済みのリライト結果（rewrite_result.json にも保存）
+        """
         # 元記事を保存
         await self._save_original_article(output_dir, article)
 
-        # レスポンスをパース
-        linkedin_content, x_format, x_posts = self._parse_response(response)
+        # レスポンスをパース（以降の処理はこの結果を使い回す）
+        with span("output.parse", chars=len(response)):
+            result = RewriteResult.from_response(
+                response,
+                source_url=article.url,
+                images=infographic_images,
+                title=article.title
+            )
+        async with aiofiles.open(output_dir / RewriteResult.FILENAME, 'w', encoding='utf-8') as f:
+            await f.write(result.to_json())
+        print(f"   ✅ {RewriteResult.FILENAME}")
 
         # LinkedIn下書きを保存
-        await self._save_linkedin_draft(output_dir, article, linkedin_content, infographic_images)
+        await self._save_linkedin_draft(output_dir, article, result.linkedin_content, infographic_images)
 
         # X下書きを保存
-        await self._save_x_draft(output_dir, article, x_format, x_posts, infographic_images)
+        await self._save_x_draft(output_dir, article, result.x_format, result.x_posts, infographic_images)
 
         print(f"   📁 出力ディレクトリ: {output_dir}")
+        return result
 
     async def _save_original_article(self, output_dir: Path, article: Article) -> None:
         """元記事を保存"""
@@ -639,6 +1230,7 @@ class OutputManager:
         content = f"""# {article.title}
 
 URL: {article.url}
+公開日時: {article.published_at or 'N/A'}
 取得日時: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 
 ---
@@ -649,128 +1241,6 @@ URL: {article.url}
             await f.write(content)
         print(f"   ✅ original_article.md")
 
-    def _parse_response(self, response: str) -> tuple[str, str, list[str]]:
-        """レスポンスをLinkedInとXに分割
-
-        Returns:
-            tuple: (linkedin_content, x_format, x_posts)
-            - linkedin_content: LinkedIn投稿文
-            - x_format: "single" または "thread"
-            - x_posts: X投稿のリスト（単一の場合は1要素、スレッドの場合は複数）
-        """
-        linkedin_content = ""
-        x_format = "single"
-        x_posts = []
-
-        # === LinkedIn部分を抽出 ===
-        linkedin_matches = list(re.finditer(
-            r'--LINKEDIN_START--\s*(.*?)\s*--LINKEDIN_END--',
-            response,
-            re.DOTALL
-        ))
-        if linkedin_matches:
-            linkedin_content = linkedin_matches[-1].group(1).strip()
-            if '(ここにLinkedIn投稿文を生成)' in linkedin_content:
-                linkedin_content = ""
-
-        # フォールバック: 旧形式のマーカー
-        if not linkedin_content:
-            linkedin_matches = list(re.finditer(
-                r'=== LINKEDIN ===\s*(.*?)(?:=== X_THREAD ===|--X_START--|$)',
-                response,
-                re.DOTALL
-            ))
-            if linkedin_matches:
-                linkedin_content = linkedin_matches[-1].group(1).strip()
-
-        # フォールバック: 絵文字で始まる構造化コンテンツを探す
-        if not linkedin_content or len(linkedin_content) < 100:
-            linkedin_match = re.search(
-                r'([🚀📌✅🔗💡🎯][^\n]*\n[\s\S]{200,}?)(?:--|===|$)',
-                response,
-                re.DOTALL
-            )
-            if linkedin_match:
-                linkedin_content = linkedin_match.group(1).strip()
-
-        # === X形式を判定 ===
-        format_matches = list(re.finditer(
-            r'--X_FORMAT--\s*(.*?)\s*--X_FORMAT_END--',
-            response,
-            re.DOTALL
-        ))
-        if format_matches:
-            format_str = format_matches[-1].group(1).strip().lower()
-            if 'thread' in format_str:
-                x_format = "thread"
-            else:
-                x_format = "single"
-
-        # === X投稿を抽出 ===
-        x_matches = list(re.finditer(
-            r'--X_START--\s*(.*?)\s*--X_END--',
-            response,
-            re.DOTALL
-        ))
-        if x_matches:
-            x_content = x_matches[-1].group(1).strip()
-            # テンプレートのプレースホルダーを除外
-            if '(単一ポストの場合' in x_content or '(ここにX投稿文を生成)' in x_content:
-                x_content = ""
-
-            if x_content:
-                # スレッド形式: --- で分割
-                if '---' in x_content:
-                    posts = [p.strip() for p in x_content.split('---') if p.strip()]
-                    # 例文や説明を除外
-                    x_posts = [p for p in posts if not p.startswith('例（') and len(p) > 20]
-                elif x_format == "thread":
-                    # ---区切りがないが、thread形式が指定されている場合
-                    # ハッシュタグで終わる行で分割（各ツイートはハッシュタグで終わる）
-                    # パターン: テキスト + ハッシュタグ + 改行
-                    hashtag_pattern = r'(.*?#\w+(?:\s+#\w+)*)\s*\n'
-                    hashtag_matches = re.findall(hashtag_pattern, x_content + '\n', re.DOTALL)
-                    if hashtag_matches and len(hashtag_matches) > 1:
-                        x_posts = [p.strip() for p in hashtag_matches if p.strip() and len(p.strip()) > 20]
-                    else:
-                        # ハッシュタグ分割できない場合、段落で分割
-                        paragraphs = re.split(r'\n\s*\n', x_content)
-                        paragraphs = [p.strip() for p in paragraphs if p.strip() and len(p.strip()) > 20]
-                        if len(paragraphs) > 1:
-                            x_posts = paragraphs
-                        else:
-                            x_posts = [x_content]
-                            x_format = "single"
-                else:
-                    # 単一ポスト
-                    x_posts = [x_content]
-
-                # 形式を自動判定（フォーマットマーカーがない場合）
-                if len(x_posts) > 1:
-                    x_format = "thread"
-
-        # フォールバック: 旧形式のマーカー（JSON形式）
-        if not x_posts:
-            x_thread_matches = list(re.finditer(
-                r'=== X_THREAD ===\s*([\s\S]*?)(?:Notionに保存|Claude|$)',
-                response,
-                re.DOTALL
-            ))
-            if x_thread_matches:
-                x_json = x_thread_matches[-1].group(1).strip()
-                try:
-                    json_match = re.search(r'\{[\s\S]*?"thread"[\s\S]*?\}', x_json)
-                    if json_match:
-                        data = json.loads(json_match.group())
-                        threads = data.get('thread', [])
-                        x_posts = [t.get('text', '') for t in threads if t.get('text')]
-                        if len(x_posts) > 1:
-                            x_format = "thread"
-                except:
-                    pass
-
-        return linkedin_content, x_format, x_posts
-
     async def _save_linkedin_draft(self, output_dir: Path, article: Article, content: str, images: list[Path]) -> None:
         """LinkedIn下書きを保存"""
         filepath = output_dir / "linkedin_draft.md"
@@ -858,6 +1328,15 @@ class SNSPoster:
 
     def __init__(self, config: Config):
         self.config = config
+        self.selectors = SelectorCache(config.selector_cache_file)
+        self.image_variants = ImageVariantCache(
+            config.image_cache_dir,
+            image_format=config.image_format,
+            quality=config.image_quality,
+            max_edges={"x": config.x_image_max_edge, "linkedin": config.linkedin_image_max_edge}
+        )
+        self.screenshots = ScreenshotRecorder(config.screenshot_policy, config.screenshot_format, config.screenshot_quality)
+        self.blocker = ResourceBlocker(config.block_rules, config.block_resources)
 
     async def post_to_sns(
         self,
@@ -865,44 +1344,100 @@ class SNSPoster:
         linkedin_content: str,
         x_posts: list[str],
         article_url: str,
-        infographic_images: list[Path]
+        infographic_images: list[Path],
+        output_dir: Optional[Path] = None,
+        checkpoint: Optional[Checkpoint] = None
     ) -> dict:
-        """LinkedInとXに予約下書きを投稿"""
-        results = {
-            "linkedin": {"success": False, "message": ""},
-            "x": {"success": False, "message": "", "posts": []}
+        """LinkedInとXに予約下書きを投稿
+
+        両プラットフォームは状態を共有しないため、別々のタブで並列に投稿する。
+
+        Args:
+            output_dir: エラー時のスクリーンショットの保存先（None の場合は撮影しない）
+            checkpoint: 指定した場合、投稿済みのプラットフォーム・ツイートを飛ばし、投稿結果を記録する
+        """
+        linkedin_done = checkpoint is not None and checkpoint.done("linkedin")
+        x_done = checkpoint is not None and checkpoint.done("x")
+
+        # プラットフォームごとの上限サイズに縮小・再圧縮した画像を用意
+        images = {"linkedin": infographic_images, "x": infographic_images}
+        if self.config.image_preprocess and not (linkedin_done and x_done):
+            with span("sns.image_prepare", images=len(infographic_images)):
+                images = await self.image_variants.prepare(infographic_images, ["linkedin", "x"])
+
+        print("\n📘 LinkedIn / 📱 X に予約下書きを並列投稿中...")
+
+        async def completed(name: str, stage: str) -> dict:
+            print(f"   ⏭️ {name}は投稿済みのためスキップ")
+            return checkpoint.artifact(stage)
+
+        # 各プラットフォームは途中経過をこの辞書に書き込む（タイムアウト時も投稿済みのツイートを残す）
+        linkedin_partial = {"success": False, "message": ""}
+        x_partial = {"success": False, "message": "", "posts": []}
+
+        linkedin_result, x_result = await asyncio.gather(
+            completed("LinkedIn", "linkedin") if linkedin_done else self._run_platform(
+                "LinkedIn",
+                self._post_to_linkedin(context, linkedin_content, article_url, images["linkedin"], output_dir, linkedin_partial),
+                self.config.linkedin_timeout_seconds,
+                linkedin_partial
+            ),
+            completed("X", "x") if x_done else self._run_platform(
+                "X",
+                self._post_to_x(context, x_posts, article_url, images["x"], output_dir, checkpoint, x_partial),
+                self.config.x_timeout_seconds,
+                x_partial
+            ),
+        )
+
+        if checkpoint:
+            if linkedin_result.get("success") and not linkedin_done:
+                checkpoint.complete("linkedin", linkedin_result)
+            if x_result.get("success") and not x_done:
+                checkpoint.complete("x", x_result)
+
+        return {
+            "linkedin": linkedin_result,
+            "x": x_result
         }
 
-        # LinkedIn投稿
-        print("\n📘 LinkedInに予約下書きを投稿中...")
-        try:
-            linkedin_result = await self._post_to_linkedin(context, linkedin_content, article_url, infographic_images)
-            results["linkedin"] = linkedin_result
-        except Exception as e:
-            results["linkedin"]["message"] = f"エラー: {e}"
-            print(f"   ❌ LinkedIn投稿エラー: {e}")
+    async def _run_platform(self, name: str, coro, timeout_seconds: int, partial_result: dict) -> dict:
+        """1プラットフォーム分の投稿をタイムアウト付きで実行
 
-        # X投稿
-        print("\n📱 Xに予約下書きを投稿中...")
+        Args:
+            partial_result: 投稿処理が途中経過を書き込む結果。タイムアウト・エラー時はこれに理由を追記して返す
+        """
         try:
-            x_result = await self._post_to_x(context, x_posts, article_url, infographic_images)
-            results["x"] = x_result
+            with span(f"sns.{name.lower()}"):
+                return await asyncio.wait_for(coro, timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            partial_result["success"] = False
+            partial_result["message"] = f"タイムアウト（{timeout_seconds}秒）"
+            print(f"   ❌ {name}投稿タイムアウト（{timeout_seconds}秒）")
         except Exception as e:
-            results["x"]["message"] = f"エラー: {e}"
-            print(f"   ❌ X投稿エラー: {e}")
-
-        return results
+            partial_result["success"] = False
+            partial_result["message"] = f"エラー: {e}"
+            print(f"   ❌ {name}投稿エラー: {e}")
+        return partial_result
 
     async def _post_to_linkedin(
         self,
         context: BrowserContext,
         content: str,
         article_url: str,
-        images: list[Path]
+        images: list[Path],
+        output_dir: Optional[Path] = None,
+        result: Optional[dict] = None
     ) -> dict:
-        """LinkedInに予約下書きを投稿"""
+        """LinkedInに予約下書きを投稿
+
+        Args:
+            result: 途中経過を書き込む結果（省略時は新規作成）
+        """
         page = await context.new_page()
-        result = {"success": False, "message": ""}
+        await self.blocker.attach(page, "linkedin")
+        if result is None:
+            result = {"success": False, "message": ""}
 
         try:
             # 投稿内容にURLを追加
@@ -915,16 +1450,8 @@ class SNSPoster:
             # LinkedInにアクセス
             print(f"   🌐 LinkedInにアクセス中...")
             await page.goto(self.config.linkedin_url, wait_until="domcontentloaded", timeout=60000)
-            await page.wait_for_timeout(3000)
 
-            # ログイン確認
-            if "login" in page.url.lower() or "signin" in page.url.lower():
-                print("   ⚠️ LinkedInにログインしていません。手動でログインしてください。")
-                result["message"] = "ログインが必要です"
-                return result
-
-            # 投稿作成ボタンをクリック
-            print("   ✍️ 投稿作成画面を開く...")
+            # 投稿作成ボタンの表示を待機（ログイン画面へリダイレクトされた場合は表示されない）
             create_post_selectors = [
                 'button:has-text("Start a post")',
                 'button:has-text("投稿を開始")',
@@ -933,25 +1460,31 @@ class SNSPoster:
                 '[aria-label*="投稿を作成"]',
                 '.share-box-feed-entry__top-bar',
             ]
+            btn = await self.selectors.find_visible(page, 'linkedin.create_post', create_post_selectors, timeout_ms=15000)
+
+            # ログイン確認
+            if "login" in page.url.lower() or "signin" in page.url.lower():
+                print("   ⚠️ LinkedInにログインしていません。手動でログインしてください。")
+                result["message"] = "ログインが必要です"
+                return result
 
+            # 投稿作成ボタンをクリック
+            print("   ✍️ 投稿作成画面を開く...")
             clicked = False
-            for selector in create_post_selectors:
+            if btn:
                 try:
-                    btn = page.locator(selector).first
-                    if await btn.is_visible(timeout=3000):
-                        await btn.click()
-                        clicked = True
-                        print(f"   ✅ 投稿ボタンクリック（{selector}）")
-                        break
+                    await btn.click()
+                    clicked = True
+                    print("   ✅ 投稿ボタンクリック")
                 except:
-                    continue
+                    pass
 
             if not clicked:
                 print("   ⚠️ 投稿ボタンが見つかりません")
                 result["message"] = "投稿ボタンが見つかりません"
                 return result
 
-            await page.wait_for_timeout(2000)
+            await wait_for_modal_open(page)
 
             # 投稿エディタに入力
             print("   📝 投稿内容を入力中...")
@@ -964,18 +1497,15 @@ class SNSPoster:
             ]
 
             input_success = False
-            for selector in editor_selectors:
+            editor = await self.selectors.find_visible(page, 'linkedin.editor', editor_selectors, timeout_ms=5000)
+            if editor:
                 try:
-                    editor = page.locator(selector).first
-                    if await editor.is_visible(timeout=5000):
-                        await editor.click()
-                        await page.wait_for_timeout(500)
-                        await editor.fill(full_content)
-                        input_success = True
-                        print(f"   ✅ 内容入力完了（{len(full_content)}文字）")
-                        break
+                    await editor.click()
+                    await editor.fill(full_content)
+                    input_success = True
+                    print(f"   ✅ 内容入力完了（{len(full_content)}文字）")
                 except:
-                    continue
+                    pass
 
             if not input_success:
                 # JavaScript fallback
@@ -1002,8 +1532,6 @@ class SNSPoster:
                 result["message"] = "投稿エディタが見つかりません"
                 return result
 
-            await page.wait_for_timeout(1000)
-
             # 画像を添付（最初の1枚のみ）
             if images:
                 await self._attach_image_linkedin(page, images[0])
@@ -1023,6 +1551,8 @@ class SNSPoster:
         except Exception as e:
             result["message"] = f"エラー: {e}"
             print(f"   ❌ エラー: {e}")
+            if output_dir:
+                await self.screenshots.error(page, output_dir / "error_linkedin.png")
         finally:
             await page.close()
 
@@ -1041,21 +1571,19 @@ class SNSPoster:
                 '[class*="media-upload"]',
             ]
 
-            for selector in media_selectors:
-                try:
-                    btn = page.locator(selector).first
-                    if await btn.is_visible(timeout=2000):
-                        await btn.click()
-                        await page.wait_for_timeout(1000)
+            btn = await self.selectors.find_visible(page, 'linkedin.media_button', media_selectors, timeout_ms=2000)
+            if btn:
+                await btn.click()
 
-                        # ファイル入力
-                        file_input = page.locator('input[type="file"]').first
-                        await file_input.set_input_files(str(image_path))
-                        await page.wait_for_timeout(2000)
-                        print(f"   ✅ 画像添付完了")
-                        return
-                except:
-                    continue
+                # ファイル入力
+                file_input = page.locator('input[type="file"]').first
+                await file_input.wait_for(state="attached", timeout=10000)
+                await file_input.set_input_files(str(image_path))
+                if await wait_for_upload_thumbnails(page, 1):
+                    print(f"   ✅ 画像添付完了")
+                else:
+                    print(f"   ⚠️ 画像プレビューを確認できませんでした")
+                return
 
             print("   ⚠️ 画像添付ボタンが見つかりません")
         except Exception as e:
@@ -1073,25 +1601,22 @@ class SNSPoster:
                 '[class*="clock"]',
             ]
 
-            for selector in schedule_selectors:
+            btn = await self.selectors.find_visible(page, 'linkedin.schedule_button', schedule_selectors, timeout_ms=2000)
+            if btn:
                 try:
-                    btn = page.locator(selector).first
-                    if await btn.is_visible(timeout=2000):
-                        await btn.click()
-                        await page.wait_for_timeout(1000)
-                        break
+                    await btn.click()
                 except:
-                    continue
+                    pass
 
             # 日時を設定（LinkedInのUIに依存）
             # 日付入力
             date_input = page.locator('input[type="date"], input[name*="date"]').first
-            if await date_input.is_visible(timeout=2000):
+            if await wait_for_visible(date_input, 2000):
                 await date_input.fill(schedule_time.strftime("%Y-%m-%d"))
 
             # 時間入力
             time_input = page.locator('input[type="time"], input[name*="time"]').first
-            if await time_input.is_visible(timeout=2000):
+            if await wait_for_visible(time_input, 2000):
                 await time_input.fill(schedule_time.strftime("%H:%M"))
 
             print(f"   ✅ 予約時刻設定: {schedule_time.strftime('%Y-%m-%d %H:%M')}")
@@ -1111,16 +1636,12 @@ class SNSPoster:
                 '[class*="draft"]',
             ]
 
-            for selector in save_selectors:
-                try:
-                    btn = page.locator(selector).first
-                    if await btn.is_visible(timeout=2000):
-                        await btn.click()
-                        await page.wait_for_timeout(2000)
-                        print("   ✅ 下書き保存完了")
-                        return
-                except:
-                    continue
+            btn = await self.selectors.find_visible(page, 'linkedin.save_button', save_selectors, timeout_ms=2000)
+            if btn:
+                await btn.click()
+                await wait_for_modal_closed(page)
+                print("   ✅ 下書き保存完了")
+                return
 
             # 閉じるボタンを押して下書き保存を促す
             close_selectors = [
@@ -1129,20 +1650,16 @@ class SNSPoster:
                 'button:has-text("Close")',
             ]
 
-            for selector in close_selectors:
-                try:
-                    btn = page.locator(selector).first
-                    if await btn.is_visible(timeout=2000):
-                        await btn.click()
-                        await page.wait_for_timeout(1000)
-                        # 下書き保存確認ダイアログ
-                        save_btn = page.locator('button:has-text("Save"), button:has-text("保存")').first
-                        if await save_btn.is_visible(timeout=2000):
-                            await save_btn.click()
-                        print("   ✅ 下書き保存完了（閉じるボタン経由）")
-                        return
-                except:
-                    continue
+            btn = await self.selectors.find_visible(page, 'linkedin.close_button', close_selectors, timeout_ms=2000)
+            if btn:
+                await btn.click()
+                # 下書き保存確認ダイアログ
+                save_btn = page.locator('button:has-text("Save"), button:has-text("保存")').first
+                if await wait_for_visible(save_btn, 2000):
+                    await save_btn.click()
+                    await wait_for_modal_closed(page)
+                print("   ✅ 下書き保存完了（閉じるボタン経由）")
+                return
 
             print("   ⚠️ 保存ボタンが見つかりません（手動保存が必要）")
 
@@ -1154,17 +1671,32 @@ class SNSPoster:
         context: BrowserContext,
         posts: list[str],
         article_url: str,
-        images: list[Path]
+        images: list[Path],
+        output_dir: Optional[Path] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        result: Optional[dict] = None
     ) -> dict:
-        """Xに予約下書きを投稿（スレッド形式）"""
+        """Xに予約下書きを投稿（スレッド形式）
+
+        checkpoint を指定した場合、投稿済みのツイートは飛ばし、予約時刻は初回実行時の時刻を引き継ぐ。
+
+        Args:
+            result: 途中経過（ツイートごとの結果）を書き込む結果（省略時は新規作成）
+        """
         page = await context.new_page()
-        result = {"success": False, "message": "", "posts": []}
+        await self.blocker.attach(page, "x")
+        if result is None:
+            result = {"success": False, "message": "", "posts": []}
 
         try:
             # Xにアクセス
             print(f"   🌐 Xにアクセス中...")
             await page.goto(self.config.x_url, wait_until="domcontentloaded", timeout=60000)
-            await page.wait_for_timeout(3000)
+            # タイムライン（ログイン済み）またはログインフォームの表示を待機
+            await wait_for_visible(
+                page.locator('[data-testid="primaryColumn"], [data-testid="loginButton"], input[autocomplete="username"]').first,
+                15000
+            )
 
             # ログイン確認
             if "login" in page.url.lower():
@@ -1174,6 +1706,11 @@ class SNSPoster:
 
             # 各ポストの予約時刻を計算
             base_time = datetime.now() + timedelta(days=self.config.x_first_post_delay_days)
+            if checkpoint:
+                if checkpoint.get("x_schedule_base"):
+                    base_time = datetime.fromisoformat(checkpoint.get("x_schedule_base"))
+                else:
+                    checkpoint.set("x_schedule_base", base_time.isoformat(timespec="seconds"))
             schedule_times = []
             for i in range(len(posts)):
                 post_time = base_time + timedelta(hours=i * self.config.x_interval_hours)
@@ -1187,16 +1724,26 @@ class SNSPoster:
 
             # 各ツイートを投稿（下書き保存）
             for i, (post_text, schedule_time) in enumerate(zip(posts_with_url, schedule_times)):
+                posted = checkpoint.x_post(i) if checkpoint else None
+                if posted:
+                    print(f"\n   ⏭️ ツイート{i+1}は投稿済みのためスキップ")
+                    result["posts"].append(posted)
+                    continue
+
                 print(f"\n   📝 ツイート {i+1}/{len(posts_with_url)} を作成中...")
-                post_result = await self._create_x_post(page, post_text, schedule_time, images[0] if i == 0 and images else None)
+                with span("sns.x.tweet", index=i + 1) as attrs:
+                    post_result = await self._create_x_post(page, post_text, schedule_time, images[0] if i == 0 and images else None)
+                    attrs["success"] = post_result["success"]
                 result["posts"].append(post_result)
 
                 if not post_result["success"]:
                     print(f"   ⚠️ ツイート{i+1}の投稿に失敗")
                 else:
                     print(f"   ✅ ツイート{i+1}の下書き保存完了")
+                    if checkpoint:
+                        checkpoint.complete_x_post(i, post_result)
 
-                await page.wait_for_timeout(2000)
+                await wait_for_modal_closed(page)
 
             # 全ポスト成功したかチェック
             success_count = sum(1 for p in result["posts"] if p["success"])
@@ -1207,6 +1754,8 @@ class SNSPoster:
         except Exception as e:
             result["message"] = f"エラー: {e}"
             print(f"   ❌ エラー: {e}")
+            if output_dir:
+                await self.screenshots.error(page, output_dir / "error_x.png")
         finally:
             await page.close()
 
@@ -1233,21 +1782,17 @@ class SNSPoster:
             ]
 
             clicked = False
-            for selector in compose_selectors:
+            btn = await self.selectors.find_visible(page, 'x.compose_button', compose_selectors)
+            if btn:
                 try:
-                    btn = page.locator(selector).first
-                    if await btn.is_visible(timeout=3000):
-                        await btn.click()
-                        clicked = True
-                        break
+                    await btn.click()
+                    clicked = True
                 except:
-                    continue
+                    pass
 
             if not clicked:
                 # フォールバック: 直接URLへ
-                await page.goto("https://x.com/compose/post", wait_until="domcontentloaded")
-
-            await page.wait_for_timeout(2000)
+                await page.goto(urljoin(self.config.x_url, "/compose/post"), wait_until="domcontentloaded")
 
             # テキスト入力
             editor_selectors = [
@@ -1258,25 +1803,20 @@ class SNSPoster:
             ]
 
             input_success = False
-            for selector in editor_selectors:
+            editor = await self.selectors.find_visible(page, 'x.editor', editor_selectors, timeout_ms=5000)
+            if editor:
                 try:
-                    editor = page.locator(selector).first
-                    if await editor.is_visible(timeout=5000):
-                        await editor.click()
-                        await page.wait_for_timeout(500)
-                        # 1文字ずつタイプ（日本語対応）
-                        await editor.fill(text)
-                        input_success = True
-                        break
+                    await editor.click()
+                    # 1文字ずつタイプ（日本語対応）
+                    await editor.fill(text)
+                    input_success = True
                 except:
-                    continue
+                    pass
 
             if not input_success:
                 result["message"] = "テキストエリアが見つかりません"
                 return result
 
-            await page.wait_for_timeout(1000)
-
             # 画像添付
             if image:
                 await self._attach_image_x(page, image)
@@ -1303,17 +1843,17 @@ class SNSPoster:
             file_input = page.locator('input[type="file"][accept*="image"]').first
             if await file_input.count() > 0:
                 await file_input.set_input_files(str(image_path))
-                await page.wait_for_timeout(2000)
+                await wait_for_upload_thumbnails(page, 1)
                 print("      ✅ 画像添付完了")
             else:
                 # 画像ボタンをクリック
                 media_btn = page.locator('[data-testid="fileInput"], [aria-label*="メディア"], [aria-label*="Media"]').first
-                if await media_btn.is_visible(timeout=2000):
+                if await wait_for_visible(media_btn, 2000):
                     await media_btn.click()
-                    await page.wait_for_timeout(1000)
                     file_input = page.locator('input[type="file"]').first
+                    await file_input.wait_for(state="attached", timeout=10000)
                     await file_input.set_input_files(str(image_path))
-                    await page.wait_for_timeout(2000)
+                    await wait_for_upload_thumbnails(page, 1)
                     print("      ✅ 画像添付完了")
         except Exception as e:
             print(f"      ⚠️ 画像添付スキップ: {e}")
@@ -1329,20 +1869,17 @@ class SNSPoster:
                 'button:has(svg[viewBox*="calendar"])',
             ]
 
-            for selector in schedule_selectors:
+            btn = await self.selectors.find_visible(page, 'x.schedule_option', schedule_selectors, timeout_ms=2000)
+            if btn:
                 try:
-                    btn = page.locator(selector).first
-                    if await btn.is_visible(timeout=2000):
-                        await btn.click()
-                        await page.wait_for_timeout(1000)
-                        break
+                    await btn.click()
                 except:
-                    continue
+                    pass
 
-            # 日付選択
+            # 日付選択（予約ダイアログの表示を待ってから入力）
             # 年
             year_input = page.locator('select[name*="year"], [data-testid*="year"]').first
-            if await year_input.is_visible(timeout=2000):
+            if await wait_for_visible(year_input, 5000):
                 await year_input.select_option(str(schedule_time.year))
 
             # 月
@@ -1388,27 +1925,24 @@ class SNSPoster:
                 '[data-testid="scheduledConfirmationPrimaryAction"]',
             ]
 
-            for selector in schedule_btn_selectors:
-                try:
-                    btn = page.locator(selector).first
-                    if await btn.is_visible(timeout=2000):
-                        await btn.click()
-                        await page.wait_for_timeout(2000)
-                        print("      ✅ 予約投稿確定")
-                        return
-                except:
-                    continue
+            btn = await self.selectors.find_visible(page, 'x.schedule_button', schedule_btn_selectors, timeout_ms=2000)
+            if btn:
+                await wait_for_button_enabled(btn, 5000)
+                await btn.click()
+                await wait_for_modal_closed(page)
+                print("      ✅ 予約投稿確定")
+                return
 
             # フォールバック: 閉じて下書き保存
             close_btn = page.locator('button[aria-label*="Close"], button[aria-label*="閉じる"]').first
-            if await close_btn.is_visible(timeout=2000):
+            if await wait_for_visible(close_btn, 2000):
                 await close_btn.click()
-                await page.wait_for_timeout(1000)
 
                 # 下書き保存確認
                 save_btn = page.locator('button:has-text("Save"), button:has-text("保存")').first
-                if await save_btn.is_visible(timeout=2000):
+                if await wait_for_visible(save_btn, 2000):
                     await save_btn.click()
+                    await wait_for_modal_closed(page)
                     print("      ✅ 下書き保存完了")
 
         except Exception as e:
@@ -1420,17 +1954,19 @@ class SNSContentGenerator:
 
     def __init__(self, config: Config):
         self.config = config
-        self.fetcher = NoteArticleFetcher(config)
+        self.state = ArticleStateStore(config.state_db_file)
+        self.fetcher = NoteArticleFetcher(config, state=self.state)
         self.infographic_finder = InfographicFinder(config)
         self.rewriter = GensparkRewriter(config)
         self.output_manager = OutputManager(config)
         self.sns_poster = SNSPoster(config)
 
-    async def run(self, post_to_sns: bool = False) -> None:
+    async def run(self, post_to_sns: bool = False, force: bool = False) -> None:
         """メイン処理を実行
 
         Args:
             post_to_sns: True の場合、LinkedIn/Xに予約下書きを投稿
+            force: True の場合、処理済みの記事も再処理
         """
         print("=" * 50)
         print("🚀 SNS Content Generator")
@@ -1441,73 +1977,370 @@ class SNSContentGenerator:
         print(f"📤 SNS投稿: {'ON' if post_to_sns else 'OFF'}")
         print("=" * 50 + "\n")
 
-        # 1. 最新記事URLを取得
-        print("📡 Step 1: 最新記事を取得")
-        article_url = self.fetcher.get_latest_article_url()
-        if not article_url:
-            print("❌ 記事URLが取得できませんでした")
-            return
+        # 各段階の処理時間を記録し、出力ディレクトリに run_metrics.json を書き出す
+        with Tracer().activate():
+            # 1. 最新記事URLを取得 → 2. 記事本文を取得（同じコネクションを使い回す）
+            print("📡 Step 1: 最新記事を取得")
+            try:
+                with span("fetch.profile"):
+                    article_url = await self.fetcher.get_latest_article_url()
+                if not article_url:
+                    print("❌ 記事URLが取得できませんでした")
+                    return
+                with span("fetch.article", url=article_url):
+                    article = await self.fetcher.fetch_article(article_url)
+            finally:
+                await self.fetcher.aclose()
 
-        # 2. 記事本文を取得
-        article = self.fetcher.fetch_article(article_url)
-        if not article:
-            print("❌ 記事本文が取得できませんでした")
-            return
+            if not article:
+                print("❌ 記事本文が取得できませんでした")
+                return
 
-        # 3. インフォグラフィック画像を検索
-        print("\n📸 Step 2: インフォグラフィック画像を検索")
-        infographic_images = self.infographic_finder.find_latest_images()
-
-        # 4. Genspark AIでリライト
-        print("\n🤖 Step 3: Genspark AIでリライト")
-        async with async_playwright() as p:
-            context = await p.chromium.launch_persistent_context(
-                str(self.config.browser_data_dir),
-                headless=False,
-                viewport={"width": 1280, "height": 900},
-                args=['--disable-blink-features=AutomationControlled']
-            )
+            # 処理済みで本文にも変更がなければ、ブラウザを起動せずに終了
+            if not self._filter_unprocessed([article], force, post_to_sns):
+                print("\n✅ 新しい記事はありません")
+                return
+
+            # 3. インフォグラフィック画像を検索
+            print("\n📸 Step 2: インフォグラフィック画像を検索")
+            with span("infographic.search"):
+                infographic_images = self.infographic_finder.find_images_for_article(article)
+
+            # 4. Genspark AIでリライト
+            print("\n🤖 Step 3: Genspark AIでリライト")
+            async with async_playwright() as p:
+                with span("browser.launch"):
+                    session = await self._open_session(p)
+
+                try:
+                    output_dir = self._output_dir_for(article, force=force)
+                    await self._process_article(session.context, article, infographic_images, output_dir, post_to_sns)
+                finally:
+                    await session.close()
+
+        print("\n" + "=" * 50)
+        print("✅ 処理完了")
+        print("=" * 50)
 
+    async def run_batch(
+        self,
+        last: Optional[int] = None,
+        since: Optional[date] = None,
+        post_to_sns: bool = False,
+        force: bool = False
+    ) -> None:
+        """複数記事を1つのブラウザセッションでまとめて処理
+
+        Args:
+            last: 新しい順に処理する記事数
+            since: この日付以降に公開された記事を処理
+            post_to_sns: True の場合、LinkedIn/Xに予約下書きを投稿
+            force: True の場合、処理済みの記事も再処理
+        """
+        print("=" * 50)
+        print("🚀 SNS Content Generator（バッチモード）")
+        print("=" * 50)
+        print(f"📌 note.comユーザー: {self.config.note_username}")
+        print(f"📁 出力先: {self.config.output_dir}")
+        if last:
+            print(f"🔢 対象: 最新{last}件")
+        if since:
+            print(f"📅 対象: {since}以降に公開")
+        print(f"🗂️ 同時タブ数: {self.config.max_concurrent_tabs}")
+        print(f"📤 SNS投稿: {'ON' if post_to_sns else 'OFF'}")
+        print("=" * 50 + "\n")
+
+        # 各段階の処理時間を記録（記事ごとの run_metrics.json に書き出す）
+        tracer = Tracer()
+        with tracer.activate():
+            # 1. 対象記事を列挙
+            print("📡 Step 1: 対象記事を取得")
             try:
-                response = await self.rewriter.rewrite(context, article, infographic_images)
+                with span("fetch.list"):
+                    article_urls = await self.fetcher.list_article_urls(limit=last, since=since)
+            except BaseException:
+                await self.fetcher.aclose()
+                raise
 
-                if not response:
-                    print("❌ リライトレスポンスが取得できませんでした")
+            async def fetch_all() -> list[Article]:
+                try:
+                    with span("fetch.articles", count=len(article_urls)):
+                        articles = await self.fetcher.fetch_articles(article_urls)
+                    return self._filter_unprocessed(articles, force, post_to_sns)
+                finally:
+                    await self.fetcher.aclose()
+
+            fetch_task = asyncio.ensure_future(fetch_all())
+
+            # 未処理の記事がなければ、本文の変更確認が終わるまでブラウザを起動しない
+            has_new = force or any(
+                not self.state.is_processed(NoteArticleFetcher.note_key(url), post_to_sns=post_to_sns) for url in article_urls
+            )
+            if not has_new:
+                articles = await fetch_task
+                if not articles:
+                    print("\n✅ 新しい記事はありません")
                     return
 
-                # 5. 出力を保存
-                print("\n💾 Step 4: 出力を保存")
-                output_dir = self.output_manager.get_output_dir()
-                await self.output_manager.save_all(output_dir, article, response, infographic_images)
-
-                # 6. SNSに予約下書きを投稿（オプション）
-                if post_to_sns:
-                    print("\n📤 Step 5: SNSに予約下書きを投稿")
-
-                    # レスポンスをパースしてLinkedIn/Xコンテンツを取得
-                    linkedin_content, x_format, x_posts = self.output_manager._parse_response(response)
-
-                    if linkedin_content or x_posts:
-                        sns_results = await self.sns_poster.post_to_sns(
-                            context=context,
-                            linkedin_content=linkedin_content,
-                            x_posts=x_posts,
-                            article_url=article.url,
-                            infographic_images=infographic_images
-                        )
-
-                        # 結果を保存
-                        await self._save_sns_results(output_dir, sns_results)
-                    else:
-                        print("   ⚠️ 投稿するコンテンツがありません")
+            post_lock = asyncio.Lock()
 
-            finally:
-                await context.close()
+            async def process_one(article: Article) -> bool:
+                note_key = NoteArticleFetcher.note_key(article.url)
+                output_dir = self._output_dir_for(article, suffix=note_key, force=force)
+                # 記事ごとの run_metrics.json に共通の取得・起動処理も含める
+                with tracer.child().activate():
+                    return await self._process_article(
+                        context, article, images_by_url[article.url], output_dir, post_to_sns,
+                        post_lock=post_lock, pool=pool
+                    )
+
+            async with async_playwright() as p:
+                # 記事本文の取得をブラウザの起動と並行して行う
+                try:
+                    with span("browser.launch") as attrs:
+                        session = await self._open_session(p)
+                        attrs["attached"] = session.attached
+                    context = session.context
+                except BaseException:
+                    fetch_task.cancel()
+                    await asyncio.gather(fetch_task, return_exceptions=True)
+                    raise
+
+                try:
+                    articles = await fetch_task
+                except BaseException:
+                    await session.close()
+                    raise
+
+                if not articles:
+                    print("\n✅ 新しい記事はありません")
+                    await session.close()
+                    return
+
+                # 2. 記事ごとにインフォグラフィック画像を検索
+                print("\n📸 Step 2: インフォグラフィック画像を検索")
+                with span("infographic.search", count=len(articles)):
+                    images_by_url = {
+                        article.url: self.infographic_finder.find_images_for_article(article)
+                        for article in articles
+                    }
+
+                # 3. 1つのブラウザコンテキスト内で、待機中のGensparkタブに記事を割り当てて並列処理
+                print(f"\n🤖 Step 3: {len(articles)}件をGenspark AIでリライト")
+                pool = GensparkTabPool(context, self.config, min(len(articles), self.config.max_concurrent_tabs))
+
+                try:
+                    with span("tabpool.start", size=pool.size):
+                        await pool.start()
+                    results = await asyncio.gather(
+                        *(process_one(article) for article in articles),
+                        return_exceptions=True
+                    )
+                finally:
+                    await pool.close()
+                    await session.close()
+
+        success_count = 0
+        print("\n" + "=" * 50)
+        print("📊 バッチ処理結果")
+        for article, result in zip(articles, results):
+            if result is True:
+                success_count += 1
+                print(f"   ✅ {article.title[:50]}")
+            else:
+                reason = f"（{result}）" if isinstance(result, Exception) else ""
+                print(f"   ❌ {article.title[:50]}{reason}")
+        print(f"✅ 処理完了: {success_count}/{len(articles)}件")
+        print("=" * 50)
+
+    async def resume(self, output_dir: Path, post_to_sns: bool = False) -> None:
+        """中断した処理を出力ディレクトリの checkpoint.json から再開
+
+        記事の取得・画像の選択はやり直さず、最初の未完了の段階から実行する。
+        初回実行時に --post-sns を指定していた場合は、指定がなくても投稿まで行う。
+        """
+        checkpoint = Checkpoint(output_dir)
+        if not checkpoint.done("article"):
+            print(f"❌ チェックポイントが見つかりません: {checkpoint.path}")
+            return
+
+        post_to_sns = post_to_sns or checkpoint.get("post_to_sns", False)
+        article = Article(**checkpoint.artifact("article"))
+        if checkpoint.done("images"):
+            infographic_images = [Path(path) for path in checkpoint.artifact("images")]
+        else:
+            infographic_images = self.infographic_finder.find_images_for_article(article)
+
+        stages = ["response", "drafts"] + (["linkedin", "x"] if post_to_sns else [])
+        remaining = checkpoint.remaining(stages)
+
+        print("=" * 50)
+        print("🚀 SNS Content Generator（再開）")
+        print("=" * 50)
+        print(f"📄 記事: {article.title[:50]}")
+        print(f"📁 出力先: {output_dir}")
+        print(f"📤 SNS投稿: {'ON' if post_to_sns else 'OFF'}")
+        print(f"⏩ 未完了の段階: {', '.join(remaining) if remaining else 'なし'}")
+        print("=" * 50 + "\n")
+
+        if not remaining:
+            print("✅ すべての段階が完了済みです")
+            return
+
+        # Gensparkへの送信・SNS投稿が残っている場合のみブラウザを起動する
+        needs_browser = any(stage in ("response", "linkedin", "x") for stage in remaining)
+        with Tracer().activate():
+            if not needs_browser:
+                await self._process_article(None, article, infographic_images, output_dir, post_to_sns)
+            else:
+                async with async_playwright() as p:
+                    with span("browser.launch"):
+                        session = await self._open_session(p)
+                    try:
+                        await self._process_article(session.context, article, infographic_images, output_dir, post_to_sns)
+                    finally:
+                        await session.close()
 
         print("\n" + "=" * 50)
         print("✅ 処理完了")
         print("=" * 50)
 
+    def _filter_unprocessed(self, articles: list[Article], force: bool, post_to_sns: bool = False) -> list[Article]:
+        """処理済みで本文に変更のない記事を除外（SNS投稿に失敗した記事は再処理する）"""
+        if force:
+            return articles
+
+        pending = []
+        for article in articles:
+            note_key = NoteArticleFetcher.note_key(article.url)
+            if self.state.is_processed(note_key, content_hash(article.content), post_to_sns):
+                print(f"   ⏭️ 処理済みのためスキップ: {article.title[:50]}")
+            else:
+                pending.append(article)
+        return pending
+
+    def _output_dir_for(self, article: Article, suffix: str = "", force: bool = False) -> Path:
+        """記事の出力ディレクトリ
+
+        前回完了しなかった記事は同じディレクトリを使い、チェックポイントから再開する（force の場合は新規作成）。
+        """
+        note_key = NoteArticleFetcher.note_key(article.url)
+        previous = None if force else self.state.retry_output_dir(note_key, content_hash(article.content))
+        if previous:
+            print(f"   ⏩ 前回の出力ディレクトリから再開: {previous.name}")
+            return previous
+        return self.output_manager.get_output_dir(suffix=suffix)
+
+    async def _open_session(self, p) -> BrowserSession:
+        """セッション永続化したブラウザに接続（ブラウザデーモンが起動していなければローカルで起動）
+
+        デバッグモードは Playwright Inspector を使うため、headless の設定に関わらず画面を表示したブラウザを起動する。
+        """
+        return await open_session(
+            p,
+            self.config.browser_data_dir,
+            use_daemon=self.config.use_browser_daemon and not self.config.debug_mode,
+            headless=self.config.headless and not self.config.debug_mode,
+            viewport={"width": self.config.viewport_width, "height": self.config.viewport_height},
+            channel=self.config.browser_channel,
+            user_agent=self.config.user_agent
+        )
+
+    async def _process_article(
+        self,
+        context: Optional[BrowserContext],
+        article: Article,
+        infographic_images: list[Path],
+        output_dir: Path,
+        post_to_sns: bool,
+        post_lock: Optional[asyncio.Lock] = None,
+        pool: Optional[GensparkTabPool] = None
+    ) -> bool:
+        """1記事分のリライト → 保存 → 投稿を実行
+
+        各段階の完了を出力ディレクトリの checkpoint.json に記録し、完了済みの段階は実行しない（--resume 用）。
+
+        Args:
+            context: ブラウザコンテキスト（リライト・投稿が完了済みの場合のみ None を指定できる）
+            post_lock: 同一アカウントへの同時投稿を避けるためのロック（バッチ処理用）
+            pool: Gensparkタブプール（バッチ処理用）
+        """
+        checkpoint = Checkpoint(output_dir)
+        if not checkpoint.done("article"):
+            checkpoint.set("post_to_sns", post_to_sns)
+            checkpoint.complete("article", asdict(article))
+        if not checkpoint.done("images"):
+            checkpoint.complete("images", [str(path) for path in infographic_images])
+
+        try:
+            if checkpoint.done("response"):
+                print("   ⏭️ Gensparkのレスポンスは取得済み")
+                response = (output_dir / checkpoint.artifact("response")).read_text(encoding='utf-8')
+            else:
+                with span("genspark.rewrite"):
+                    response = await self.rewriter.rewrite(context, article, infographic_images, output_dir, pool=pool)
+
+                if not response:
+                    print(f"❌ リライトレスポンスが取得できませんでした: {article.title[:50]}")
+                    return False
+                checkpoint.complete("response", "raw_response.txt")
+
+            # 5. 出力を保存
+            result = RewriteResult.load(output_dir) if checkpoint.done("drafts") else None
+            if result:
+                print("\n💾 Step 4: 出力は保存済み")
+            else:
+                print("\n💾 Step 4: 出力を保存")
+                with span("output.save"):
+                    result = await self.output_manager.save_all(output_dir, article, response, infographic_images)
+                checkpoint.complete("drafts", RewriteResult.FILENAME)
+
+            # 6. SNSに予約下書きを投稿（オプション）
+            status = DRAFTED
+            if post_to_sns:
+                status = POST_FAILED
+                print("\n📤 Step 5: SNSに予約下書きを投稿")
+
+                # 保存時にパースした結果をそのまま使用
+                if result.linkedin_content or result.x_posts:
+                    with span("sns.post"):
+                        async with post_lock or asyncio.Lock():
+                            sns_results = await self.sns_poster.post_to_sns(
+                                context=context,
+                                linkedin_content=result.linkedin_content,
+                                x_posts=result.x_posts,
+                                article_url=result.source_url,
+                                infographic_images=result.image_paths,
+                                output_dir=output_dir,
+                                checkpoint=checkpoint
+                            )
+
+                    # 結果を保存
+                    await self._save_sns_results(output_dir, sns_results)
+                    if sns_results["linkedin"].get("success") and sns_results["x"].get("success"):
+                        status = POSTED
+                else:
+                    print("   ⚠️ 投稿するコンテンツがありません")
+
+            # 投稿に失敗した記事は次回の実行で再処理する（投稿済みのプラットフォームはチェックポイントで飛ばす）
+            self.state.mark_processed(
+                NoteArticleFetcher.note_key(article.url),
+                article.url,
+                article.title,
+                content_hash(article.content),
+                published_at=article.published_at,
+                output_dir=output_dir,
+                status=status
+            )
+            if status == POST_FAILED:
+                print(f"   ⚠️ SNS投稿が完了しなかったため、次回の実行で再試行します: {article.title[:50]}")
+                return False
+            return True
+        finally:
+            tracer = current_tracer()
+            if tracer:
+                tracer.write(output_dir, chrome_trace=self.config.chrome_trace)
+
     async def _save_sns_results(self, output_dir: Path, results: dict) -> None:
         """SNS投稿結果を保存"""
         filepath = output_dir / "sns_posting_results.json"
@@ -1516,6 +2349,16 @@ class SNSContentGenerator:
         print(f"   📄 投稿結果保存: {filepath.name}")
 
 
+def get_option_value(option: str) -> Optional[str]:
+    """コマンドライン引数から `--option VALUE` / `--option=VALUE` の値を取得"""
+    for i, arg in enumerate(sys.argv):
+        if arg == option and i + 1 < len(sys.argv):
+            return sys.argv[i + 1]
+        if arg.startswith(f"{option}="):
+            return arg.split("=", 1)[1]
+    return None
+
+
 async def main():
     """エントリポイント
 
@@ -1523,10 +2366,37 @@ async def main():
         python sns_content_generator.py              # 基本実行（下書き生成のみ）
         python sns_content_generator.py --post-sns   # 下書き生成 + SNS予約投稿
         python sns_content_generator.py --debug      # デバッグモード
+        python sns_content_generator.py --last 10    # 最新10件をバッチ処理
+        python sns_content_generator.py --since 2026-01-20  # 指定日以降の記事をバッチ処理
+        python sns_content_generator.py --force      # 処理済みの記事も再処理
+        python sns_content_generator.py --force --no-cache  # Gensparkに再送信して作り直す
+        python sns_content_generator.py --screenshots all   # 途中経過のスクリーンショットも保存
+        python sns_content_generator.py --headless --post-sns  # 画面を表示せずに実行（サーバー向け）
+        python sns_content_generator.py --resume outputs/2026-01-20_10-00-00  # 中断した処理を再開
     """
     # コマンドライン引数
     debug_mode = "--debug" in sys.argv
     post_to_sns = "--post-sns" in sys.argv
+    force = "--force" in sys.argv
+    no_cache = "--no-cache" in sys.argv
+    chrome_trace = "--trace" in sys.argv
+    headless = "--headless" in sys.argv
+    no_daemon = "--no-daemon" in sys.argv
+    screenshot_policy = get_option_value("--screenshots")
+    resume_dir = get_option_value("--resume")
+
+    try:
+        last_value = get_option_value("--last")
+        last = int(last_value) if last_value else None
+        since_value = get_option_value("--since")
+        since = date.fromisoformat(since_value) if since_value else None
+    except ValueError as e:
+        print(f"❌ 引数が不正です: {e}")
+        sys.exit(1)
+
+    if screenshot_policy and screenshot_policy not in SCREENSHOT_POLICIES:
+        print(f"❌ --screenshots には {' / '.join(SCREENSHOT_POLICIES)} のいずれかを指定してください")
+        sys.exit(1)
 
     # ヘルプ表示
     if "--help" in sys.argv or "-h" in sys.argv:
@@ -1537,6 +2407,15 @@ async def main():
         print("Options:")
         print("  --post-sns    LinkedIn/Xに予約下書きを投稿")
         print("  --debug       デバッグモード（Playwright Inspector使用）")
+        print("  --last N      最新N件の記事をまとめて処理（バッチモード）")
+        print("  --since DATE  DATE（YYYY-MM-DD）以降の記事をまとめて処理（バッチモード）")
+        print("  --force       処理済みの記事も再処理")
+        print("  --no-cache    Gensparkレスポンスキャッシュを使わずに再送信")
+        print("  --trace       run_metrics.json に加えて trace.json（Chromeトレース形式）を出力")
+        print("  --screenshots POLICY  スクリーンショットの撮影方針（off / on-error / all）")
+        print("  --headless    ブラウザを表示せずに実行（ログイン済みのプロファイルを使用）")
+        print("  --no-daemon   ブラウザデーモンに接続せず、毎回ブラウザを起動")
+        print("  --resume DIR  出力ディレクトリ DIR の checkpoint.json から中断した処理を再開")
         print("  --help, -h    このヘルプを表示")
         print()
         print("Note:")
@@ -1555,10 +2434,28 @@ async def main():
     # デバッグモードをコマンドラインで上書き
     if debug_mode:
         config.debug_mode = True
+    if no_cache:
+        config.response_cache_enabled = False
+    if chrome_trace:
+        config.chrome_trace = True
+    if screenshot_policy:
+        config.screenshot_policy = screenshot_policy
+    if headless:
+        config.headless = True
+    if no_daemon:
+        config.use_browser_daemon = False
 
     # 実行
     generator = SNSContentGenerator(config)
-    await generator.run(post_to_sns=post_to_sns)
+    if resume_dir:
+        output_dir = Path(resume_dir)
+        if not output_dir.is_absolute() and not output_dir.exists():
+            output_dir = SCRIPT_DIR / output_dir
+        await generator.resume(output_dir, post_to_sns=post_to_sns)
+    elif last or since:
+        await generator.run_batch(last=last, since=since, post_to_sns=post_to_sns, force=force)
+    else:
+        await generator.run(post_to_sns=post_to_sns, force=force)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+"""article_state.ArticleStateStore のテスト"""
+
+import sqlite3
+
+from article_state import DRAFTED, POST_FAILED, POSTED, ArticleStateStore, content_hash
+
+
+def test_conditional_get_headers_persist(tmp_path):
+    """ETag / Last-Modified と本文が再接続後も残る"""
+    path = tmp_path / "state.db"
+    store = ArticleStateStore(path)
+    store.store_response("https://note.com/api/a", "body", '"etag-1"', "Mon, 20 Jan 2026 00:00:00 GMT")
+    store.close()
+
+    store = ArticleStateStore(path)
+    assert store.conditional_headers("https://note.com/api/a") == {
+        "If-None-Match": '"etag-1"',
+        "If-Modified-Since": "Mon, 20 Jan 2026 00:00:00 GMT",
+    }
+    assert store.cached_body("https://note.com/api/a") == "body"
+    assert store.conditional_headers("https://note.com/api/other") == {}
+    store.close()
+
+
+def test_response_without_validators_is_not_stored(tmp_path):
+    """検証用ヘッダーのないレスポンスは記録しない"""
+    store = ArticleStateStore(tmp_path / "state.db")
+    store.store_response("https://note.com/api/a", "body", None, None)
+    assert store.cached_body("https://note.com/api/a") is None
+    store.close()
+
+
+def test_processed_filtering_by_hash_and_status(tmp_path):
+    """本文の変更・投稿失敗・下書きのみの記事は未処理として扱う"""
+    store = ArticleStateStore(tmp_path / "state.db")
+    text_hash = content_hash("本文")
+    assert not store.is_processed("n1", text_hash)
+
+    store.mark_processed("n1", "https://note.com/x/n/n1", "タイトル", text_hash, status=POSTED)
+    assert store.is_processed("n1", text_hash)
+    assert store.is_processed("n1", text_hash, post_to_sns=True)
+    assert not store.is_processed("n1", content_hash("変更後の本文"))
+
+    store.mark_processed("n2", "https://note.com/x/n/n2", "タイトル", text_hash, status=DRAFTED)
+    assert store.is_processed("n2", text_hash)
+    assert not store.is_processed("n2", text_hash, post_to_sns=True)
+
+    store.mark_processed("n3", "https://note.com/x/n/n3", "タイトル", text_hash, status=POST_FAILED)
+    assert not store.is_processed("n3", text_hash)
+    store.close()
+
+
+def test_retry_output_dir_only_for_unfinished_articles(tmp_path):
+    """完了しなかった記事だけ前回の出力ディレクトリを返す"""
+    store = ArticleStateStore(tmp_path / "state.db")
+    output_dir = tmp_path / "outputs" / "2026-01-20_10-00-00"
+    output_dir.mkdir(parents=True)
+    text_hash = content_hash("本文")
+
+    store.mark_processed("n1", "https://note.com/x/n/n1", "タイトル", text_hash, output_dir=output_dir, status=POST_FAILED)
+    assert store.retry_output_dir("n1", text_hash) == output_dir
+    assert store.retry_output_dir("n1", content_hash("変更後の本文")) is None
+
+    store.mark_processed("n1", "https://note.com/x/n/n1", "タイトル", text_hash, output_dir=output_dir, status=POSTED)
+    assert store.retry_output_dir("n1", text_hash) is None
+    store.close()
+
+
+def test_legacy_database_is_migrated(tmp_path):
+    """status 列のない既存のデータベースは記録済みの記事を完了扱いにする"""
+    path = tmp_path / "state.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute(
+        'CREATE TABLE processed_articles (note_key TEXT PRIMARY KEY, url TEXT NOT NULL, title TEXT, '
+        'content_hash TEXT NOT NULL, published_at TEXT, output_dir TEXT, processed_at TEXT NOT NULL)'
+    )
+    conn.execute(
+        'INSERT INTO processed_articles VALUES (?, ?, ?, ?, ?, ?, ?)',
+        ("n1", "https://note.com/x/n/n1", "タイトル", content_hash("本文"), None, None, "2026-01-20T10:00:00")
+    )
+    conn.commit()
+    conn.close()
+
+    store = ArticleStateStore(path)
+    assert store.is_processed("n1", content_hash("本文"), post_to_sns=True)
+    store.close()
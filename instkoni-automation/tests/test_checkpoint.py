@@ -0,0 +1,57 @@
+"""checkpoint と --resume で使う成果物の読み込みのテスト"""
+
+from checkpoint import Checkpoint
+from response_parser import RewriteResult
+
+
+STAGES = ["response", "drafts", "linkedin", "x"]
+
+
+def test_completed_stages_are_skipped_after_reload(tmp_path):
+    """記録した段階は再読み込み後も完了扱いになり、最初の未完了の段階から再開する"""
+    checkpoint = Checkpoint(tmp_path)
+    checkpoint.set("post_to_sns", True)
+    checkpoint.complete("article", {"title": "タイトル", "url": "https://note.com/x/n/n1", "content": "本文"})
+    checkpoint.complete("response", "raw_response.txt")
+    checkpoint.complete("drafts", RewriteResult.FILENAME)
+
+    resumed = Checkpoint(tmp_path)
+    assert resumed.get("post_to_sns") is True
+    assert resumed.artifact("article")["title"] == "タイトル"
+    assert resumed.remaining(STAGES) == ["linkedin", "x"]
+    assert resumed.artifact("linkedin") is None
+    assert not (tmp_path / (Checkpoint.FILENAME + ".tmp")).exists()
+
+
+def test_posted_tweets_are_recorded_individually(tmp_path):
+    """投稿済みのツイートだけが記録され、未投稿のツイートは None になる"""
+    checkpoint = Checkpoint(tmp_path)
+    checkpoint.complete_x_post(0, {"success": True, "message": "予約完了"})
+
+    resumed = Checkpoint(tmp_path)
+    assert resumed.x_post(0) == {"success": True, "message": "予約完了"}
+    assert resumed.x_post(1) is None
+    assert "x" in resumed.remaining(STAGES)
+
+
+def test_missing_or_broken_journal_starts_empty(tmp_path):
+    """checkpoint.json がない・壊れている場合はすべて未完了として扱う"""
+    assert Checkpoint(tmp_path).remaining(STAGES) == STAGES
+    (tmp_path / Checkpoint.FILENAME).write_text("{broken", encoding="utf-8")
+    assert Checkpoint(tmp_path).remaining(STAGES) == STAGES
+
+
+def test_rewrite_result_round_trip(tmp_path):
+    """保存済みの rewrite_result.json から同じ下書きを読み込める"""
+    result = RewriteResult(
+        linkedin_content="LinkedIn本文",
+        x_format="thread",
+        x_posts=["1/2 最初", "2/2 次"],
+        images=[str(tmp_path / "image.png")],
+        source_url="https://note.com/x/n/n1",
+        title="タイトル"
+    )
+    (tmp_path / RewriteResult.FILENAME).write_text(result.to_json(), encoding="utf-8")
+
+    assert RewriteResult.load(tmp_path) == result
+    assert RewriteResult.load(tmp_path / "missing") is None
@@ -0,0 +1,104 @@
+"""infographic_index.InfographicIndex のテスト"""
+
+import os
+import struct
+import zlib
+
+from infographic_index import InfographicIndex, read_image_size
+
+
+def _write_png(path, width, height):
+    """IHDR だけを持つ最小限のPNG"""
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    chunk = struct.pack('>I', len(ihdr)) + b'IHDR' + ihdr + struct.pack('>I', zlib.crc32(b'IHDR' + ihdr))
+    path.write_bytes(b'\x89PNG\r\n\x1a\n' + chunk)
+
+
+def _make_tree(root):
+    (root / "20260120100000_20260120_ＡＩ活用術").mkdir(parents=True)
+    (root / "20260121093000_別の記事").mkdir()
+    (root / "20260121180000_さらに別の記事").mkdir()
+    (root / "notes").mkdir()
+    _write_png(root / "20260120100000_20260120_ＡＩ活用術" / "01.png", 1200, 630)
+
+
+def test_find_folder_by_title_and_date(tmp_path):
+    """タイトル一致を優先し、なければ公開日の最新フォルダを返す"""
+    root = tmp_path / "infographic"
+    _make_tree(root)
+    index = InfographicIndex(root, tmp_path / "index.json")
+    index.refresh()
+
+    # 全角・記号の違いは無視して照合する
+    assert index.find_folder("AI活用術!") == "20260120100000_20260120_ＡＩ活用術"
+    assert index.find_folder("未登録の記事", "2026-01-21T09:00:00+09:00") == "20260121180000_さらに別の記事"
+    assert index.find_folder("未登録の記事", "2026-02-01T09:00:00+09:00") is None
+    assert index.find_folder("") is None
+    assert index.latest_folder() == "20260121180000_さらに別の記事"
+
+
+def test_images_and_manifest_reload(tmp_path):
+    """画像のメタ情報を記録し、保存したマニフェストから復元する"""
+    root = tmp_path / "infographic"
+    _make_tree(root)
+    index = InfographicIndex(root, tmp_path / "index.json")
+    index.refresh()
+
+    folder = "20260120100000_20260120_ＡＩ活用術"
+    images = index.folder_images(folder)
+    assert images == [root / folder / "01.png"]
+    info = index.image_info(images[0])
+    assert (info['width'], info['height']) == (1200, 630)
+
+    reloaded = InfographicIndex(root, tmp_path / "index.json")
+    reloaded.refresh()
+    assert reloaded.find_folder("AI活用術") == folder
+    assert reloaded.image_info(images[0])['sha256'] == info['sha256']
+
+
+def test_refresh_picks_up_new_folder(tmp_path):
+    """ルートの更新日時が変わったら追加されたフォルダを索引に加える"""
+    root = tmp_path / "infographic"
+    _make_tree(root)
+    index = InfographicIndex(root, tmp_path / "index.json")
+    index.refresh()
+    assert index.find_folder("新しい記事") is None
+
+    (root / "20260125080000_新しい記事").mkdir()
+    # 更新日時の分解能が粗いファイルシステムでも変更を検出させる
+    stat = root.stat()
+    os.utime(root, (stat.st_atime, stat.st_mtime + 10))
+    index.refresh()
+    assert index.find_folder("新しい記事") == "20260125080000_新しい記事"
+
+
+def test_read_image_size_rejects_non_images(tmp_path):
+    path = tmp_path / "broken.png"
+    path.write_bytes(b"not an image")
+    assert read_image_size(path) is None
+
+
+def test_jpeg_suffix_and_overwritten_image(tmp_path):
+    """.jpeg も索引し、同名で上書きされた画像はフォルダの更新日時が同じでも読み直す"""
+    root = tmp_path / "infographic"
+    _make_tree(root)
+    folder = root / "20260121093000_別の記事"
+    _write_png(folder / "cover.jpeg", 800, 600)
+    index = InfographicIndex(root, tmp_path / "index.json")
+    index.refresh()
+
+    image = folder / "cover.jpeg"
+    assert index.folder_images(folder.name) == [image]
+    before = index.image_info(image)
+
+    folder_stat = folder.stat()
+    _write_png(image, 1600, 900)
+    stat = image.stat()
+    os.utime(image, (stat.st_atime, stat.st_mtime + 10))
+    os.utime(folder, (folder_stat.st_atime, folder_stat.st_mtime))
+
+    reloaded = InfographicIndex(root, tmp_path / "index.json")
+    reloaded.refresh()
+    after = reloaded.image_info(image)
+    assert (after['width'], after['height']) == (1600, 900)
+    assert after['sha256'] != before['sha256']
@@ -0,0 +1,41 @@
+"""manus_archive.extract_zip のテスト"""
+
+import zipfile
+
+from manus_archive import extract_zip
+
+
+def test_extracts_files_flat(tmp_path):
+    """サブフォルダ内のファイルも出力フォルダ直下に書き出す"""
+    zip_path = tmp_path / "outputs.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("report/", "")
+        archive.writestr("report/推敲版.md", "# 推敲版")
+        archive.writestr("fact_check.md", "ok")
+
+    output = tmp_path / "out"
+    output.mkdir()
+    extracted = extract_zip(zip_path, output)
+
+    assert sorted(path.name for path in extracted) == ["fact_check.md", "推敲版.md"]
+    assert (output / "推敲版.md").read_text(encoding="utf-8") == "# 推敲版"
+
+
+def test_rejects_zip_slip_entries(tmp_path, capsys):
+    """絶対パスや .. を含むエントリは書き出さない"""
+    zip_path = tmp_path / "outputs.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("../escape.md", "x")
+        archive.writestr("report/../../escape2.md", "x")
+        archive.writestr("..\\escape3.md", "x")
+        archive.writestr("/etc/passwd_copy", "x")
+        archive.writestr("C:/Windows/escape4.md", "x")
+        archive.writestr("safe.md", "ok")
+
+    output = tmp_path / "out"
+    output.mkdir()
+    extracted = extract_zip(zip_path, output)
+
+    assert extracted == [output / "safe.md"]
+    assert sorted(path.name for path in tmp_path.rglob("*") if path.is_file()) == ["outputs.zip", "safe.md"]
+    assert capsys.readouterr().out.count("出力フォルダ外") == 5
@@ -0,0 +1,102 @@
+"""manus_queue.ManusQueueState のテスト"""
+
+from pathlib import Path
+
+from manus_queue import DONE, FAILED, RUNNING, ManusQueueState, submission_hash
+
+
+DRAFT = Path("drafts/article_01.md")
+
+
+def test_pending_until_done_and_persisted(tmp_path):
+    """完了した下書きは再実行時に飛ばし、状態はファイルから復元される"""
+    path = tmp_path / "queue_state.json"
+    digest = submission_hash("プロンプト", "本文")
+    state = ManusQueueState(path)
+    assert state.is_pending(DRAFT, digest)
+
+    state.start(DRAFT, digest)
+    state.update(DRAFT, digest, RUNNING, task_url="https://manus.im/app/task1")
+    assert state.is_pending(DRAFT, digest)
+    state.update(DRAFT, digest, DONE, output_folder="outputs/article_01")
+
+    reloaded = ManusQueueState(path)
+    assert not reloaded.is_pending(DRAFT, digest)
+    entry = reloaded.entry(DRAFT)
+    assert entry["attempts"] == 1
+    assert entry["task_url"] == "https://manus.im/app/task1"
+    assert reloaded.summary() == {DONE: 1}
+
+
+def test_changed_content_resets_entry(tmp_path):
+    """内容が変わった下書きは再処理し、前回のタスクURLを引き継がない"""
+    state = ManusQueueState(tmp_path / "queue_state.json")
+    old = submission_hash("プロンプト", "本文")
+    new = submission_hash("プロンプト", "修正した本文")
+    state.start(DRAFT, old)
+    state.update(DRAFT, old, DONE, task_url="https://manus.im/app/task1")
+
+    assert state.is_pending(DRAFT, new)
+    state.start(DRAFT, new)
+    entry = state.entry(DRAFT)
+    assert entry["attempts"] == 1
+    assert entry["task_url"] is None
+    assert state.task_url(new) is None
+
+
+def test_failed_only_retried_on_request(tmp_path):
+    """失敗した下書きは retry_failed の場合だけ再処理し、再試行回数を数える"""
+    state = ManusQueueState(tmp_path / "queue_state.json")
+    digest = submission_hash("プロンプト", "本文")
+    state.start(DRAFT, digest)
+    state.update(DRAFT, digest, FAILED, error="timeout")
+
+    assert not state.is_pending(DRAFT, digest)
+    assert state.is_pending(DRAFT, digest, retry_failed=True)
+    state.start(DRAFT, digest)
+    assert state.entry(DRAFT)["attempts"] == 2
+
+
+def test_task_url_reused_across_drafts(tmp_path):
+    """同じ内容を送信済みのタスクは別名の下書きでも再利用し、失敗したタスクは除く"""
+    state = ManusQueueState(tmp_path / "queue_state.json")
+    digest = submission_hash("プロンプト", "本文")
+    state.update(DRAFT, digest, RUNNING, task_url="https://manus.im/app/task1")
+    assert state.task_url(digest) == "https://manus.im/app/task1"
+
+    state.update(DRAFT, digest, FAILED)
+    assert state.task_url(digest) is None
+
+
+def test_broken_state_file(tmp_path):
+    path = tmp_path / "queue_state.json"
+    path.write_text("{broken", encoding="utf-8")
+    assert ManusQueueState(path).summary() == {}
+
+
+def test_timeout_after_submission_stays_resumable(tmp_path):
+    """送信済みのタスクがタイムアウトした場合は RUNNING のまま残し、同じタスクから再開する"""
+    path = tmp_path / "queue_state.json"
+    digest = submission_hash("プロンプト", "本文")
+    state = ManusQueueState(path)
+    state.start(DRAFT, digest)
+    state.update(DRAFT, digest, RUNNING, task_url="https://manus.im/app/task1")
+
+    assert state.interrupt(DRAFT, digest, "成果物を取得できませんでした")
+
+    reloaded = ManusQueueState(path)
+    assert reloaded.entry(DRAFT)["status"] == RUNNING
+    assert reloaded.is_pending(DRAFT, digest)
+    assert reloaded.task_url(digest) == "https://manus.im/app/task1"
+
+
+def test_failure_before_submission_is_failed(tmp_path):
+    """タスクURLを記録する前に失敗した場合は FAILED にする"""
+    state = ManusQueueState(tmp_path / "queue_state.json")
+    digest = submission_hash("プロンプト", "本文")
+    state.start(DRAFT, digest)
+
+    assert not state.interrupt(DRAFT, digest, "入力欄が見つかりません")
+    assert state.entry(DRAFT)["status"] == FAILED
+    assert not state.is_pending(DRAFT, digest)
+    assert state.task_url(digest) is None
@@ -0,0 +1,38 @@
+"""response_cache.ResponseCache のテスト"""
+
+import os
+import time
+
+from response_cache import ResponseCache
+
+
+def test_hit_and_hash_miss(tmp_path):
+    """同じプロンプトはキャッシュを返し、内容が違えば返さない"""
+    cache = ResponseCache(tmp_path / "cache", ttl_hours=1)
+    cache.put("プロンプトA", "レスポンスA")
+
+    assert cache.get("プロンプトA") == "レスポンスA"
+    assert cache.get("プロンプトB") is None
+    assert (tmp_path / "cache" / ResponseCache.key("プロンプトA") / "raw_response.txt").exists()
+
+
+def test_expired_entry_is_ignored(tmp_path):
+    """有効期間を過ぎたキャッシュは返さない"""
+    cache = ResponseCache(tmp_path / "cache", ttl_hours=1)
+    cache.put("プロンプト", "レスポンス")
+    path = tmp_path / "cache" / ResponseCache.key("プロンプト") / "raw_response.txt"
+
+    old = time.time() - 2 * 3600
+    os.utime(path, (old, old))
+    assert cache.get("プロンプト") is None
+
+
+def test_zero_ttl_never_expires(tmp_path):
+    """有効期間 0 の場合は古いキャッシュも返す"""
+    cache = ResponseCache(tmp_path / "cache", ttl_hours=0)
+    cache.put("プロンプト", "レスポンス")
+    path = tmp_path / "cache" / ResponseCache.key("プロンプト") / "raw_response.txt"
+
+    old = time.time() - 365 * 24 * 3600
+    os.utime(path, (old, old))
+    assert cache.get("プロンプト") == "レスポンス"
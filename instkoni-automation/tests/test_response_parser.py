@@ -0,0 +1,23 @@
+"""response_parser の回帰テスト"""
+
+from response_parser import CORPUS_FILE, ResponseParser, check_corpus, parse_response
+
+
+def test_corpus_matches_expected():
+    """回帰コーパスの全レスポンスが一括・分割入力のどちらでも期待値と一致する"""
+    assert CORPUS_FILE.exists()
+    assert check_corpus()
+
+
+def test_feed_matches_parse_response():
+    """マーカーがチャンク境界をまたいでも一括パースと同じ結果になる"""
+    response = (
+        "前置き\n"
+        "--LINKEDIN_START--\nLinkedIn本文\n--LINKEDIN_END--\n"
+        "--X_START--\n1/2 最初のポスト\n\n2/2 次のポスト\n--X_END--\n"
+    )
+    parser = ResponseParser()
+    for i in range(0, len(response), 3):
+        parser.feed(response[i:i + 3])
+    assert parser.result() == parse_response(response)
+    assert parser.result()[0] == "LinkedIn本文"
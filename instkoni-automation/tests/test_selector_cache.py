@@ -0,0 +1,61 @@
+"""selector_cache.SelectorCache のテスト"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from selector_cache import SelectorCache
+
+
+class FakeLocator:
+    """表示されるまでの遅延（秒）を指定できる Locator の代わり"""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    @property
+    def first(self):
+        return self
+
+    async def wait_for(self, state="visible", timeout=None):
+        if self.delay is None:
+            await asyncio.sleep(timeout / 1000)
+            raise TimeoutError("not visible")
+        await asyncio.sleep(self.delay)
+
+    async def is_visible(self):
+        return self.delay is not None
+
+
+class FakePage:
+    def __init__(self, delays):
+        self.delays = delays
+
+    def locator(self, selector):
+        return FakeLocator(self.delays.get(selector.split(" >> ")[0]))
+
+
+def test_find_visible_prefers_list_order(tmp_path):
+    """汎用的な候補が先に表示されても、リストで先の候補を採用・記録する"""
+    cache = SelectorCache(tmp_path / "selectors.json")
+    page = FakePage({
+        'button:has-text("Schedule")': 0.05,
+        '[class*="schedule"]': 0,
+    })
+    selectors = ['button:has-text("Schedule")', '[class*="schedule"]', 'button:has-text("Missing")']
+
+    locator = asyncio.run(cache.find_visible(page, "x.schedule_button", selectors, timeout_ms=200))
+
+    assert locator is not None
+    assert cache.hit("x.schedule_button") == 'button:has-text("Schedule")'
+    assert SelectorCache(tmp_path / "selectors.json").hit("x.schedule_button") == 'button:has-text("Schedule")'
+
+
+def test_find_visible_none_when_nothing_shown(tmp_path):
+    cache = SelectorCache(tmp_path / "selectors.json")
+    page = FakePage({})
+
+    assert asyncio.run(cache.find_visible(page, "x.schedule_button", ['[class*="schedule"]'], timeout_ms=50)) is None
+    assert cache.hit("x.schedule_button") is None
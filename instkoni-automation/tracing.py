@@ -0,0 +1,185 @@
+"""
+実行時間の計測
+
+処理の各段階をスパンとして記録し、出力ディレクトリに run_metrics.json
+（必要に応じて Chrome トレース形式の trace.json）を書き出す。
+現在のトレーサーと親スパンは contextvars で受け渡すため、
+asyncio.gather で並列に動くタスクごとに独立した親子関係になる。
+
+    tracer = Tracer()
+    with tracer.activate():
+        with span("fetch.article", url=url):
+            ...
+    tracer.write(output_dir)
+
+トレーサーが有効でない場所で span() を使っても何も記録しない。
+"""
+
+import asyncio
+import contextvars
+import itertools
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+
+METRICS_FILENAME = "run_metrics.json"
+TRACE_FILENAME = "trace.json"
+
+_current_tracer: contextvars.ContextVar[Optional['Tracer']] = contextvars.ContextVar('tracer', default=None)
+_current_span: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar('span', default=None)
+
+_span_ids = itertools.count(1)
+
+
+class Tracer:
+    """スパンの記録先
+
+    Args:
+        parent: 指定した場合、書き出し時に親トレーサーのスパンも含める
+            （バッチ処理で、記事ごとの記録に共通の取得・起動処理を含めるため）
+    """
+
+    def __init__(self, parent: Optional['Tracer'] = None):
+        self.parent = parent
+        self.started_at = parent.started_at if parent else datetime.now()
+        self._origin = parent._origin if parent else time.perf_counter()
+        self.spans: list[dict] = []
+        self._tracks: dict[str, int] = parent._tracks if parent else {}
+
+    def child(self) -> 'Tracer':
+        """このトレーサーを親とする子トレーサーを作成"""
+        return Tracer(parent=self)
+
+    @contextmanager
+    def activate(self) -> Iterator['Tracer']:
+        """現在のコンテキストでこのトレーサーを有効にする"""
+        token = _current_tracer.set(self)
+        span_token = _current_span.set(None)
+        try:
+            yield self
+        finally:
+            _current_span.reset(span_token)
+            _current_tracer.reset(token)
+
+    def _record(self, record: dict) -> None:
+        self.spans.append(record)
+
+    def _track(self) -> int:
+        """asyncioタスクごとのトラック番号（Chromeトレースのスレッド列）"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        name = task.get_name() if task else "main"
+        return self._tracks.setdefault(name, len(self._tracks) + 1)
+
+    def all_spans(self) -> list[dict]:
+        """親トレーサーの分も含めた全スパン（開始時刻順）"""
+        spans = list(self.spans)
+        if self.parent:
+            spans = self.parent.all_spans() + spans
+        return sorted(spans, key=lambda s: s['start_ms'])
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """スパン名ごとの回数・合計・最大時間（ミリ秒）"""
+        summary: dict[str, dict[str, float]] = {}
+        for record in self.all_spans():
+            entry = summary.setdefault(record['name'], {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            entry['count'] += 1
+            entry['total_ms'] = round(entry['total_ms'] + record['duration_ms'], 1)
+            entry['max_ms'] = max(entry['max_ms'], record['duration_ms'])
+        return summary
+
+    def write(self, output_dir: Path, chrome_trace: bool = False) -> None:
+        """run_metrics.json（と trace.json）を書き出す"""
+        spans = self.all_spans()
+        total_ms = max((s['start_ms'] + s['duration_ms'] for s in spans), default=0.0)
+        metrics = {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'total_ms': round(total_ms, 1),
+            'summary': self.summary(),
+            'spans': spans,
+        }
+        _write_json(output_dir / METRICS_FILENAME, metrics)
+        print(f"   ⏱️ {METRICS_FILENAME}（合計 {total_ms / 1000:.1f}秒）")
+
+        if chrome_trace:
+            events = [
+                {
+                    'name': s['name'],
+                    'ph': 'X',
+                    'ts': round(s['start_ms'] * 1000),
+                    'dur': round(s['duration_ms'] * 1000),
+                    'pid': 1,
+                    'tid': s['track'],
+                    'args': s['attrs'],
+                }
+                for s in spans
+            ]
+            _write_json(output_dir / TRACE_FILENAME, {'traceEvents': events, 'displayTimeUnit': 'ms'})
+            print(f"   ⏱️ {TRACE_FILENAME}（chrome://tracing / Perfetto で表示）")
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[dict]:
+    """処理時間をスパンとして記録
+
+    Yields:
+        dict: スパンの属性（処理中に結果などを追加できる）
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield attrs
+        return
+
+    span_id = next(_span_ids)
+    parent_id = _current_span.get()
+    token = _current_span.set(span_id)
+    start = time.perf_counter()
+    error = None
+    try:
+        yield attrs
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        end = time.perf_counter()
+        _current_span.reset(token)
+        record = {
+            'id': span_id,
+            'parent': parent_id,
+            'name': name,
+            'start_ms': round((start - tracer._origin) * 1000, 1),
+            'duration_ms': round((end - start) * 1000, 1),
+            'track': tracer._track(),
+            'attrs': {k: _jsonable(v) for k, v in attrs.items()},
+        }
+        if error:
+            record['error'] = error
+        tracer._record(record)
+
+
+def current_tracer() -> Optional[Tracer]:
+    """現在有効なトレーサー"""
+    return _current_tracer.get()
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def _write_json(path: Path, data: dict) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"   ⚠️ 計測結果の保存エラー: {e}")
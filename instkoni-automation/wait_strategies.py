@@ -0,0 +1,166 @@
+"""
+待機ストラテジー
+
+固定時間の wait_for_timeout の代わりに、画面の状態が整った時点で次へ進むための待機ヘルパー。
+Playwrightの自動待機とネットワークアイドルを利用する。
+いずれの関数も例外を投げず、条件を満たしたかどうかを返す（タイムアウト時は False）。
+"""
+
+import asyncio
+from typing import Optional
+
+from playwright.async_api import Locator, Page
+
+
+# アップロード済み画像のプレビュー（LinkedIn・Xともに blob: URLで表示される）
+UPLOAD_THUMBNAIL_SELECTOR = 'img[src^="blob:"], img[src^="data:image"]'
+
+# アップロード中に表示される進捗表示
+UPLOAD_PROGRESS_SELECTOR = '[role="progressbar"], progress, [class*="upload-progress"]'
+
+# モーダルダイアログ
+MODAL_SELECTOR = '[role="dialog"], [aria-modal="true"]'
+
+
+async def wait_for_visible(locator: Locator, timeout_ms: int = 10000) -> bool:
+    """要素が表示されるまで待機"""
+    try:
+        await locator.wait_for(state="visible", timeout=timeout_ms)
+        return True
+    except Exception:
+        return False
+
+
+async def wait_for_hidden(locator: Locator, timeout_ms: int = 10000) -> bool:
+    """要素が非表示（または削除）になるまで待機"""
+    try:
+        await locator.wait_for(state="hidden", timeout=timeout_ms)
+        return True
+    except Exception:
+        return False
+
+
+async def wait_for_any_visible(page: Page, selectors: list[str], timeout_ms: int = 10000) -> Optional[str]:
+    """候補セレクタのいずれかが表示されるまで待機
+
+    Returns:
+        Optional[str]: 最初に表示されたセレクタ（タイムアウト時は None）
+    """
+    if not selectors:
+        return None
+
+    tasks = {
+        asyncio.ensure_future(
+            page.locator(f"{selector} >> visible=true").first.wait_for(state="visible", timeout=timeout_ms)
+        ): selector
+        for selector in selectors
+    }
+    pending = set(tasks)
+    found = None
+    try:
+        while pending and found is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is None:
+                    found = tasks[task]
+                    break
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return found
+
+
+async def wait_for_button_enabled(locator: Locator, timeout_ms: int = 10000) -> bool:
+    """ボタンが表示され、かつ有効（disabled / aria-disabled でない）になるまで待機"""
+    if not await wait_for_visible(locator, timeout_ms):
+        return False
+    try:
+        handle = await locator.element_handle(timeout=timeout_ms)
+        await locator.page.wait_for_function(
+            '(el) => !el.disabled && el.getAttribute("aria-disabled") !== "true"',
+            arg=handle,
+            timeout=timeout_ms
+        )
+        return True
+    except Exception:
+        return False
+
+
+async def wait_for_modal_open(page: Page, timeout_ms: int = 10000) -> bool:
+    """モーダルダイアログが開くまで待機"""
+    return await wait_for_visible(page.locator(f"{MODAL_SELECTOR} >> visible=true").first, timeout_ms)
+
+
+async def wait_for_modal_closed(page: Page, timeout_ms: int = 10000) -> bool:
+    """表示中のモーダルダイアログがすべて閉じるまで待機"""
+    try:
+        await page.wait_for_function(
+            '''(selector) => {
+                for (const el of document.querySelectorAll(selector)) {
+                    if (el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden') {
+                        return false;
+                    }
+                }
+                return true;
+            }''',
+            arg=MODAL_SELECTOR,
+            timeout=timeout_ms
+        )
+        return True
+    except Exception:
+        return False
+
+
+async def wait_for_upload_thumbnails(
+    page: Page,
+    expected_count: int,
+    timeout_ms: int = 60000,
+    thumbnail_selector: str = UPLOAD_THUMBNAIL_SELECTOR
+) -> bool:
+    """アップロードした画像のプレビューが expected_count 枚描画され、進捗表示が消えるまで待機"""
+    try:
+        await page.wait_for_function(
+            '''([thumbSelector, progressSelector, expected]) => {
+                const rendered = Array.from(document.querySelectorAll(thumbSelector))
+                    .filter((img) => img.complete && img.naturalWidth > 0);
+                if (rendered.length < expected) {
+                    return false;
+                }
+                for (const el of document.querySelectorAll(progressSelector)) {
+                    if (el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden') {
+                        return false;
+                    }
+                }
+                return true;
+            }''',
+            arg=[thumbnail_selector, UPLOAD_PROGRESS_SELECTOR, expected_count],
+            timeout=timeout_ms,
+            polling=500
+        )
+        return True
+    except Exception:
+        return False
+
+
+async def wait_for_text_growth(locator: Locator, min_length: int, timeout_ms: int = 10000) -> bool:
+    """要素のテキストが min_length 文字を超えるまで待機（貼り付け・入力の反映確認用）"""
+    try:
+        handle = await locator.element_handle(timeout=timeout_ms)
+        await locator.page.wait_for_function(
+            '([el, minLength]) => (el.innerText || el.value || "").length > minLength',
+            arg=[handle, min_length],
+            timeout=timeout_ms
+        )
+        return True
+    except Exception:
+        return False
+
+
+async def wait_for_network_idle(page: Page, timeout_ms: int = 10000) -> bool:
+    """ネットワークが落ち着くまで待機（常時通信のあるページではタイムアウトで戻る）"""
+    try:
+        await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+        return True
+    except Exception:
+        return False